@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Token List Benchmark for get_analyzed_tokens
+Compares the previous per-token wallet lookup (1 + N queries) against the
+token page plus one windowed wallet query
+
+Builds a throwaway database with 10,000 analyzed tokens, each with two
+analysis runs of 10 ranked wallets, checks that both implementations return
+the same lists, and times the dashboard call (limit=100) and a full listing
+(limit=10,000). The runs share no wallets: for a wallet found by several runs
+the previous DISTINCT query ranked it by an arbitrary run's timestamp, so the
+two only agree on disjoint runs.
+Run from the backend directory: python analyzed_tokens_benchmark.py
+"""
+
+import os
+import random
+import tempfile
+import time
+from typing import Dict, List
+
+import analyzed_tokens_db as db
+from db_pool import close_pool
+
+TOKENS = 10_000
+WALLETS_PER_RUN = 10
+LIMITS = (100, 10_000)
+ROUNDS = 5
+
+
+def populate(seed: int = 0):
+    """Fill the (temporary) database with tokens, runs and ranked wallets"""
+    rng = random.Random(seed)
+    with db.get_db_connection() as conn:
+        for token_index in range(TOKENS):
+            timestamp = f"2024-01-01 00:00:{token_index:05d}"
+            token_id = conn.execute(
+                """
+                INSERT INTO analyzed_tokens (token_address, token_name, token_symbol, acronym, analysis_timestamp)
+                VALUES (?, ?, ?, ?, ?)
+            """,
+                (f"mint{token_index}", f"Token {token_index}", "TKN", "TK", timestamp),
+            ).lastrowid
+
+            wallets = [f"wallet{rng.getrandbits(64):016x}" for _ in range(WALLETS_PER_RUN * 2)]
+            runs = (("2024-01-01", wallets[:WALLETS_PER_RUN]), ("2024-02-01", wallets[WALLETS_PER_RUN:]))
+            for run_timestamp, run_wallets in runs:
+                run_id = conn.execute(
+                    "INSERT INTO analysis_runs (token_id, analysis_timestamp, wallets_found) VALUES (?, ?, ?)",
+                    (token_id, run_timestamp, len(run_wallets)),
+                ).lastrowid
+                conn.executemany(
+                    """
+                    INSERT INTO early_buyer_wallets (token_id, analysis_run_id, wallet_address, position)
+                    VALUES (?, ?, ?, ?)
+                """,
+                    [(token_id, run_id, wallet, position) for position, wallet in enumerate(run_wallets, 1)],
+                )
+
+
+def legacy_get_analyzed_tokens(limit: int) -> List[Dict]:
+    """The previous implementation: one wallet query per token"""
+    with db.get_db_reader() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            """
+            SELECT
+                id, token_address, token_name, token_symbol, acronym,
+                analysis_timestamp, first_buy_timestamp, wallets_found, credits_used, last_analysis_credits,
+                is_deleted, deleted_at
+            FROM analyzed_tokens
+            WHERE is_deleted = 0 OR is_deleted IS NULL
+            ORDER BY analysis_timestamp DESC
+            LIMIT ?
+        """,
+            (limit,),
+        )
+
+        tokens = []
+        for row in cursor.fetchall():
+            token_dict = dict(row)
+            cursor.execute(
+                """
+                SELECT DISTINCT ebw.wallet_address
+                FROM early_buyer_wallets ebw
+                JOIN analysis_runs ar ON ebw.analysis_run_id = ar.id
+                WHERE ebw.token_id = ?
+                ORDER BY ar.analysis_timestamp DESC
+                LIMIT 10
+            """,
+                (token_dict["id"],),
+            )
+            token_dict["wallet_addresses"] = [row[0] for row in cursor.fetchall()]
+            tokens.append(token_dict)
+
+        return tokens
+
+
+def measure(name: str, call) -> float:
+    """Print and return the mean time of a call in milliseconds"""
+    call()  # warm the page cache
+    started = time.perf_counter()
+    for _ in range(ROUNDS):
+        call()
+    elapsed = (time.perf_counter() - started) / ROUNDS * 1000
+    print(f"  {name:<18} {elapsed:9.2f} ms")
+    return elapsed
+
+
+def main():
+    fd, db_path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    original_path = db.DATABASE_FILE
+    db.DATABASE_FILE = db_path
+    try:
+        db.init_database()
+        populate()
+
+        print("=" * 80)
+        print(f"get_analyzed_tokens benchmark ({TOKENS:,} tokens, 2 runs x {WALLETS_PER_RUN} wallets each)")
+        print("=" * 80)
+
+        for limit in LIMITS:
+            legacy = legacy_get_analyzed_tokens(limit)
+            windowed = db.get_analyzed_tokens(limit=limit)
+            # The legacy query leaves the order within one run to SQLite, so compare wallet sets
+            assert [t["id"] for t in legacy] == [t["id"] for t in windowed]
+            assert all(set(a["wallet_addresses"]) == set(b["wallet_addresses"]) for a, b in zip(legacy, windowed))
+
+            print(f"\nlimit={limit:,} ({limit + 1:,} queries before, 2 after)")
+            before = measure("1 + N queries", lambda: legacy_get_analyzed_tokens(limit))
+            after = measure("windowed query", lambda: db.get_analyzed_tokens(limit=limit))
+            print(f"  speedup            {before / after:9.1f}x")
+    finally:
+        db.DATABASE_FILE = original_path
+        close_pool(db_path)
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(db_path + suffix):
+                os.unlink(db_path + suffix)
+
+
+if __name__ == "__main__":
+    main()
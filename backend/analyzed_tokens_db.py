@@ -20,16 +20,21 @@ The database files are protected by .gitignore.
 import json
 import os
 import sqlite3
-from contextlib import contextmanager
 from datetime import datetime
 from typing import Dict, List, Optional
 
+from db_migrations import apply_migrations
+from db_pool import get_pool
+
 # Use absolute path to ensure database is always in the backend directory
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 DATABASE_FILE = os.path.join(SCRIPT_DIR, "analyzed_tokens.db")
 ANALYSIS_RESULTS_DIR = os.path.join(SCRIPT_DIR, "analysis_results")
 AXIOM_EXPORTS_DIR = os.path.join(SCRIPT_DIR, "axiom_exports")
 
+# Wallet addresses attached to each token by get_analyzed_tokens
+TOKEN_LIST_WALLETS = 10
+
 
 def sanitize_filename(text: str, max_length: int = 50) -> str:
     """
@@ -267,266 +272,97 @@ def update_token_file_paths(token_id: int, analysis_path: str, axiom_path: str)
         return cursor.rowcount > 0
 
 
-@contextmanager
 def get_db_connection():
-    """Context manager for database connections"""
-    conn = sqlite3.connect(DATABASE_FILE)
-    conn.row_factory = sqlite3.Row  # Enable dict-like access
-    try:
-        yield conn
-        conn.commit()
-    except Exception as e:
-        conn.rollback()
-        raise e
-    finally:
-        conn.close()
-
-
-def init_database():
-    """Initialize database schema"""
-    with get_db_connection() as conn:
-        cursor = conn.cursor()
-
-        # Analyzed tokens table
-        cursor.execute(
-            """
-            CREATE TABLE IF NOT EXISTS analyzed_tokens (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                token_address TEXT UNIQUE NOT NULL,
-                token_name TEXT,
-                token_symbol TEXT,
-                acronym TEXT,
-                analysis_timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                first_buy_timestamp TIMESTAMP,
-                wallets_found INTEGER DEFAULT 0,
-                axiom_json TEXT,
-                webhook_id TEXT,
-                credits_used INTEGER DEFAULT 0,
-                last_analysis_credits INTEGER DEFAULT 0,
-                is_deleted BOOLEAN DEFAULT 0,
-                deleted_at TIMESTAMP,
-                analysis_file_path TEXT,
-                axiom_file_path TEXT
-            )
-        """
-        )
-
-        # Analysis runs table - tracks each time we analyze a token
-        cursor.execute(
-            """
-            CREATE TABLE IF NOT EXISTS analysis_runs (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                token_id INTEGER NOT NULL,
-                analysis_timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                wallets_found INTEGER DEFAULT 0,
-                credits_used INTEGER DEFAULT 0,
-                FOREIGN KEY (token_id) REFERENCES analyzed_tokens(id) ON DELETE CASCADE
-            )
-        """
-        )
-
-        # Early buyer wallets table
-        cursor.execute(
-            """
-            CREATE TABLE IF NOT EXISTS early_buyer_wallets (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                token_id INTEGER NOT NULL,
-                analysis_run_id INTEGER NOT NULL,
-                wallet_address TEXT NOT NULL,
-                position INTEGER NOT NULL,
-                first_buy_usd REAL,
-                total_usd REAL,
-                transaction_count INTEGER,
-                average_buy_usd REAL,
-                first_buy_timestamp TIMESTAMP,
-                axiom_name TEXT,
-                wallet_balance_usd REAL,
-                FOREIGN KEY (token_id) REFERENCES analyzed_tokens(id) ON DELETE CASCADE,
-                FOREIGN KEY (analysis_run_id) REFERENCES analysis_runs(id) ON DELETE CASCADE,
-                UNIQUE(analysis_run_id, wallet_address)
-            )
-        """
-        )
-
-        # Wallet activity events table
-        cursor.execute(
-            """
-            CREATE TABLE IF NOT EXISTS wallet_activity (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                wallet_id INTEGER NOT NULL,
-                transaction_signature TEXT UNIQUE,
-                timestamp TIMESTAMP,
-                activity_type TEXT,
-                description TEXT,
-                sol_amount REAL,
-                token_amount REAL,
-                recipient_address TEXT,
-                FOREIGN KEY (wallet_id) REFERENCES early_buyer_wallets(id) ON DELETE CASCADE
-            )
-        """
-        )
-
-        # Wallet tags table
-        cursor.execute(
-            """
-            CREATE TABLE IF NOT EXISTS wallet_tags (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                wallet_address TEXT NOT NULL,
-                tag TEXT NOT NULL,
-                is_kol BOOLEAN DEFAULT 0,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                UNIQUE(wallet_address, tag)
-            )
-        """
-        )
-
-        # Create indices for better query performance
-        cursor.execute(
-            """
-            CREATE INDEX IF NOT EXISTS idx_token_address
-            ON analyzed_tokens(token_address)
-        """
-        )
-
-        cursor.execute(
-            """
-            CREATE INDEX IF NOT EXISTS idx_wallet_address
-            ON early_buyer_wallets(wallet_address)
-        """
-        )
-
-        cursor.execute(
-            """
-            CREATE INDEX IF NOT EXISTS idx_activity_timestamp
-            ON wallet_activity(timestamp DESC)
-        """
-        )
-
-        cursor.execute(
-            """
-            CREATE INDEX IF NOT EXISTS idx_wallet_tags_address
-            ON wallet_tags(wallet_address)
-        """
-        )
-
-        # NEW: Critical performance indices
-        cursor.execute(
-            """
-            CREATE INDEX IF NOT EXISTS idx_is_deleted_timestamp
-            ON analyzed_tokens(is_deleted, analysis_timestamp DESC)
-        """
-        )
-
-        cursor.execute(
-            """
-            CREATE INDEX IF NOT EXISTS idx_token_analysis_run
-            ON early_buyer_wallets(token_id, analysis_run_id)
-        """
-        )
-
-        cursor.execute(
-            """
-            CREATE INDEX IF NOT EXISTS idx_analysis_runs_token_timestamp
-            ON analysis_runs(token_id, analysis_timestamp DESC)
-        """
-        )
-
-        cursor.execute(
-            """
-            CREATE INDEX IF NOT EXISTS idx_wallet_tags_tag
-            ON wallet_tags(tag)
-        """
-        )
-
-        # Run migrations to add new columns to existing tables
-        # Check if total_usd column exists in early_buyer_wallets, if not add it
-        cursor.execute("PRAGMA table_info(early_buyer_wallets)")
-        ebw_columns = [col[1] for col in cursor.fetchall()]
-
-        if "total_usd" not in ebw_columns:
-            print("[Database] Migrating: Adding total_usd column...")
-            cursor.execute("ALTER TABLE early_buyer_wallets ADD COLUMN total_usd REAL")
-
-        if "transaction_count" not in ebw_columns:
-            print("[Database] Migrating: Adding transaction_count column...")
-            cursor.execute("ALTER TABLE early_buyer_wallets ADD COLUMN transaction_count INTEGER")
-
-        if "average_buy_usd" not in ebw_columns:
-            print("[Database] Migrating: Adding average_buy_usd column...")
-            cursor.execute("ALTER TABLE early_buyer_wallets ADD COLUMN average_buy_usd REAL")
+    """
+    Context manager for the shared writer connection (commits on success, rolls back on error)
 
-        if "wallet_balance_usd" not in ebw_columns:
-            print("[Database] Migrating: Adding wallet_balance_usd column...")
-            cursor.execute("ALTER TABLE early_buyer_wallets ADD COLUMN wallet_balance_usd REAL")
+    Connections are pooled per database file (see db_pool): one writer, several
+    readers, all in WAL mode.
+    """
+    return get_pool(DATABASE_FILE).writer()
 
-        # Check if credits_used and last_analysis_credits columns exist in analyzed_tokens, if not add them
-        cursor.execute("PRAGMA table_info(analyzed_tokens)")
-        at_columns = [col[1] for col in cursor.fetchall()]
 
-        if "credits_used" not in at_columns:
-            print("[Database] Migrating: Adding credits_used column...")
-            cursor.execute("ALTER TABLE analyzed_tokens ADD COLUMN credits_used INTEGER DEFAULT 0")
+def get_db_reader():
+    """Context manager for a pooled read-only connection (never waits behind analysis writes)"""
+    return get_pool(DATABASE_FILE).reader()
 
-        if "last_analysis_credits" not in at_columns:
-            print("[Database] Migrating: Adding last_analysis_credits column...")
-            cursor.execute("ALTER TABLE analyzed_tokens ADD COLUMN last_analysis_credits INTEGER DEFAULT 0")
 
-        # Migration for analysis_run_id column in early_buyer_wallets
-        if "analysis_run_id" not in ebw_columns:
-            print("[Database] Migrating: Adding analysis_run_id column to early_buyer_wallets...")
-            print("[Database] Warning: Existing wallet records will be linked to a default analysis run")
+def init_database():
+    """Initialize database schema (applies pending db_migrations; one pragma read when up to date)"""
+    with get_db_connection() as conn:
+        apply_migrations(conn)
 
-            # Add the column (allowing NULL temporarily for migration)
-            cursor.execute("ALTER TABLE early_buyer_wallets ADD COLUMN analysis_run_id INTEGER")
 
-            # For each existing token, create an analysis_run entry
-            cursor.execute("SELECT DISTINCT token_id FROM early_buyer_wallets WHERE analysis_run_id IS NULL")
-            token_ids = cursor.fetchall()
+def refresh_wallet_rollup(conn: sqlite3.Connection, wallet_addresses: Optional[List[str]] = None):
+    """
+    Recompute wallet_rollup rows from early_buyer_wallets
 
-            for row in token_ids:
-                token_id = row[0]
-                # Get the token's analysis timestamp
-                cursor.execute(
-                    "SELECT analysis_timestamp, wallets_found, last_analysis_credits FROM analyzed_tokens WHERE id = ?",
-                    (token_id,),
-                )
-                token_data = cursor.fetchone()
+    Only active (not soft-deleted) tokens count, both for a wallet's tokens and
+    for its balance (the one recorded by the latest run of those tokens).
+    Call it inside the write transaction that changed which active tokens the
+    wallets belong to, so the rollup never disagrees with the wallet rows.
 
-                if token_data:
-                    analysis_timestamp, wallets_found, credits = token_data[0], token_data[1], token_data[2]
+    Args:
+        conn: Writer connection
+        wallet_addresses: Wallets to recompute (None rebuilds the whole table)
+    """
+    if wallet_addresses is None:
+        conn.execute("DELETE FROM wallet_rollup")
+        wallet_filter, params = "", ()
+    elif not wallet_addresses:
+        return
+    else:
+        wallet_filter = "AND ebw.wallet_address IN (SELECT value FROM json_each(?))"
+        params = (json.dumps(wallet_addresses),)
+        conn.execute("DELETE FROM wallet_rollup WHERE wallet_address IN (SELECT value FROM json_each(?))", params)
+
+    conn.execute(
+        f"""
+        INSERT INTO wallet_rollup (wallet_address, token_count, token_ids, wallet_balance_usd)
+        SELECT
+            ebw.wallet_address,
+            COUNT(DISTINCT ebw.token_id),
+            GROUP_CONCAT(DISTINCT ebw.token_id),
+            (
+                SELECT b.wallet_balance_usd
+                FROM early_buyer_wallets b
+                JOIN analysis_runs ar ON ar.id = b.analysis_run_id
+                JOIN analyzed_tokens bt ON bt.id = b.token_id
+                WHERE b.wallet_address = ebw.wallet_address AND b.wallet_balance_usd IS NOT NULL
+                  AND bt.deleted_at IS NULL
+                ORDER BY ar.analysis_timestamp DESC
+                LIMIT 1
+            )
+        FROM early_buyer_wallets ebw
+        JOIN analyzed_tokens t ON t.id = ebw.token_id
+        WHERE t.deleted_at IS NULL {wallet_filter}
+        GROUP BY ebw.wallet_address
+    """,
+        params,
+    )
 
-                    # Create an analysis run for this token
-                    cursor.execute(
-                        """
-                        INSERT INTO analysis_runs (token_id, analysis_timestamp, wallets_found, credits_used)
-                        VALUES (?, ?, ?, ?)
-                    """,
-                        (token_id, analysis_timestamp, wallets_found or 0, credits or 0),
-                    )
 
-                    analysis_run_id = cursor.lastrowid
+def get_token_wallet_addresses(conn: sqlite3.Connection, token_id: int) -> List[str]:
+    """Distinct early buyer wallets of a token, across all its runs (the rollup rows a token change touches)"""
+    rows = conn.execute("SELECT DISTINCT wallet_address FROM early_buyer_wallets WHERE token_id = ?", (token_id,))
+    return [row[0] for row in rows]
 
-                    # Link all existing wallets for this token to this analysis run
-                    cursor.execute(
-                        """
-                        UPDATE early_buyer_wallets
-                        SET analysis_run_id = ?
-                        WHERE token_id = ? AND analysis_run_id IS NULL
-                    """,
-                        (analysis_run_id, token_id),
-                    )
 
-            print("[Database] Migration complete: Existing wallets linked to analysis runs")
+def refresh_token_wallet_rollup(conn: sqlite3.Connection, token_id: int):
+    """Recompute the rollup rows of a token's wallets (after soft-deleting or restoring it)"""
+    refresh_wallet_rollup(conn, get_token_wallet_addresses(conn, token_id))
 
-        # Migration for is_kol column in wallet_tags
-        cursor.execute("PRAGMA table_info(wallet_tags)")
-        wt_columns = [col[1] for col in cursor.fetchall()]
 
-        if "is_kol" not in wt_columns:
-            print("[Database] Migrating: Adding is_kol column to wallet_tags...")
-            cursor.execute("ALTER TABLE wallet_tags ADD COLUMN is_kol BOOLEAN DEFAULT 0")
+def rebuild_wallet_rollup() -> int:
+    """
+    Rebuild wallet_rollup from scratch (repairs drift after manual edits to the database)
 
-        print("[Database] Schema initialized successfully")
+    Returns:
+        Number of wallets in the rebuilt rollup
+    """
+    with get_db_connection() as conn:
+        refresh_wallet_rollup(conn)
+        return conn.execute("SELECT COUNT(*) FROM wallet_rollup").fetchone()[0]
 
 
 def save_analyzed_token(
@@ -539,6 +375,8 @@ def save_analyzed_token(
     first_buy_timestamp: Optional[str] = None,
     credits_used: int = 0,
     max_wallets: int = 10,
+    fetch_cursor: Optional[Dict] = None,
+    covered_until: Optional[int] = None,
 ) -> int:
     """
     Save analyzed token and its early buyers.
@@ -552,10 +390,35 @@ def save_analyzed_token(
         axiom_json: Axiom wallet tracker export JSON
         first_buy_timestamp: Timestamp of first buy transaction
         credits_used: Helius API credits used for this analysis
+        fetch_cursor: Where this run's transaction fetch stopped (pagination_token,
+                      last_slot, last_block_time, transactions_fetched), if it fetched any
+        covered_until: Block time the buyers' totals only cover history up to, when the
+                       fetch stopped early before the analysis window closed
 
     Returns:
         token_id: Database ID of the saved token
     """
+    # Build every row before taking the write lock
+    fetch_cursor = fetch_cursor or {}
+    axiom_json_text = json.dumps(axiom_json)
+    wallet_rows = []
+    for index, bidder in enumerate(early_bidders[:max_wallets], start=1):
+        total_usd = bidder.get("total_usd", 0)
+        first_buy_usd = round(total_usd)
+        wallet_rows.append(
+            (
+                bidder["wallet_address"],
+                index,
+                first_buy_usd,
+                total_usd,
+                bidder.get("transaction_count", 1),
+                bidder.get("average_buy_usd", total_usd),
+                bidder.get("first_buy_time"),
+                f"({index}/{max_wallets})${first_buy_usd}|{acronym}",
+                bidder.get("wallet_balance_usd"),
+            )
+        )
+
     with get_db_connection() as conn:
         cursor = conn.cursor()
 
@@ -576,6 +439,7 @@ def save_analyzed_token(
                 axiom_json = excluded.axiom_json,
                 credits_used = analyzed_tokens.credits_used + excluded.credits_used,
                 last_analysis_credits = excluded.last_analysis_credits
+            RETURNING id
         """,
             (
                 token_address,
@@ -584,141 +448,125 @@ def save_analyzed_token(
                 acronym,
                 first_buy_timestamp,
                 len(early_bidders),
-                json.dumps(axiom_json),
+                axiom_json_text,
                 credits_used,
                 credits_used,
             ),
         )
-
-        # Get the token ID
-        cursor.execute("SELECT id FROM analyzed_tokens WHERE token_address = ?", (token_address,))
         token_id = cursor.fetchone()["id"]
 
         # Create a new analysis run entry for this analysis
         cursor.execute(
             """
-            INSERT INTO analysis_runs (token_id, wallets_found, credits_used)
-            VALUES (?, ?, ?)
+            INSERT INTO analysis_runs (
+                token_id, wallets_found, credits_used,
+                pagination_cursor, last_slot, last_block_time, transactions_fetched, covered_until
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
         """,
-            (token_id, len(early_bidders), credits_used),
+            (
+                token_id,
+                len(early_bidders),
+                credits_used,
+                fetch_cursor.get("pagination_token"),
+                fetch_cursor.get("last_slot"),
+                fetch_cursor.get("last_block_time"),
+                fetch_cursor.get("transactions_fetched"),
+                covered_until,
+            ),
         )
-
         analysis_run_id = cursor.lastrowid
-        print(f"[Database] Created analysis run #{analysis_run_id} for token {acronym}")
-
-        # Insert early buyer wallets linked to this analysis run
-        # Use INSERT OR IGNORE to skip wallets that already exist (UNIQUE constraint on token_id + wallet_address)
-        # This avoids wasteful DELETE operations since earliest buyers never change (immutable blockchain data)
-        inserted_count = 0
-        skipped_count = 0
-
-        for index, bidder in enumerate(early_bidders[:max_wallets], start=1):
-            total_usd = bidder.get("total_usd", 0)
-            first_buy_usd = round(total_usd)
-            transaction_count = bidder.get("transaction_count", 1)
-            average_buy_usd = bidder.get("average_buy_usd", total_usd)
-            wallet_balance_usd = bidder.get("wallet_balance_usd")
-            axiom_name = f"({index}/{max_wallets})${first_buy_usd}|{acronym}"
-
-            cursor.execute(
-                """
-                INSERT OR IGNORE INTO early_buyer_wallets (
-                    token_id, analysis_run_id, wallet_address, position, first_buy_usd,
-                    total_usd, transaction_count, average_buy_usd,
-                    first_buy_timestamp, axiom_name, wallet_balance_usd
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-                (
-                    token_id,
-                    analysis_run_id,
-                    bidder["wallet_address"],
-                    index,
-                    first_buy_usd,
-                    total_usd,
-                    transaction_count,
-                    average_buy_usd,
-                    bidder.get("first_buy_time"),
-                    axiom_name,
-                    wallet_balance_usd,
-                ),
-            )
-
-            # Track if this was a new insert or ignored duplicate
-            if cursor.rowcount > 0:
-                inserted_count += 1
-            else:
-                skipped_count += 1
 
-        if skipped_count > 0:
-            print(
-                f"[Database] Saved token {acronym}: {inserted_count} new wallets, {skipped_count} already existed (run #{analysis_run_id})"
-            )
-        else:
-            print(f"[Database] Saved token {acronym} with {inserted_count} wallets (run #{analysis_run_id})")
-        return token_id
+        # Insert early buyer wallets linked to this analysis run in one batch
+        # INSERT OR IGNORE skips duplicate wallets (UNIQUE constraint on analysis_run_id + wallet_address);
+        # executemany's rowcount is the number of rows actually inserted
+        cursor.executemany(
+            """
+            INSERT OR IGNORE INTO early_buyer_wallets (
+                token_id, analysis_run_id, wallet_address, position, first_buy_usd,
+                total_usd, transaction_count, average_buy_usd,
+                first_buy_timestamp, axiom_name, wallet_balance_usd
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+            [(token_id, analysis_run_id, *row) for row in wallet_rows],
+        )
+        inserted_count = cursor.rowcount if wallet_rows else 0
+        refresh_wallet_rollup(conn, [row[0] for row in wallet_rows])
+
+    skipped_count = len(wallet_rows) - inserted_count
+    print(f"[Database] Created analysis run #{analysis_run_id} for token {acronym}")
+    if skipped_count > 0:
+        print(
+            f"[Database] Saved token {acronym}: {inserted_count} new wallets, {skipped_count} already existed (run #{analysis_run_id})"
+        )
+    else:
+        print(f"[Database] Saved token {acronym} with {inserted_count} wallets (run #{analysis_run_id})")
+    return token_id
 
 
 def get_analyzed_tokens(limit: int = 50, include_deleted: bool = False) -> List[Dict]:
-    """Get list of analyzed tokens, most recent first"""
-    with get_db_connection() as conn:
-        cursor = conn.cursor()
+    """
+    Get list of analyzed tokens, most recent first
 
-        if include_deleted:
-            cursor.execute(
-                """
-                SELECT
-                    id, token_address, token_name, token_symbol, acronym,
-                    analysis_timestamp, first_buy_timestamp, wallets_found, credits_used, last_analysis_credits,
-                    is_deleted, deleted_at
-                FROM analyzed_tokens
-                ORDER BY analysis_timestamp DESC
-                LIMIT ?
-            """,
-                (limit,),
-            )
-        else:
-            cursor.execute(
-                """
+    Each token carries `wallet_addresses`: the top TOKEN_LIST_WALLETS wallets
+    of its latest analysis run, in ranking order. The wallets of the whole
+    page come from one windowed query instead of one query per token.
+    """
+    where = "" if include_deleted else "WHERE is_deleted = 0 OR is_deleted IS NULL"
+    with get_db_reader() as conn:
+        tokens = [
+            dict(row)
+            for row in conn.execute(
+                f"""
                 SELECT
                     id, token_address, token_name, token_symbol, acronym,
                     analysis_timestamp, first_buy_timestamp, wallets_found, credits_used, last_analysis_credits,
                     is_deleted, deleted_at
                 FROM analyzed_tokens
-                WHERE is_deleted = 0 OR is_deleted IS NULL
+                {where}
                 ORDER BY analysis_timestamp DESC
                 LIMIT ?
             """,
                 (limit,),
             )
+        ]
+        if not tokens:
+            return tokens
 
-        tokens = []
-        for row in cursor.fetchall():
-            token_dict = dict(row)
-
-            # Get wallet addresses for this token (from most recent analysis)
-            cursor.execute(
-                """
-                SELECT DISTINCT ebw.wallet_address
-                FROM early_buyer_wallets ebw
-                JOIN analysis_runs ar ON ebw.analysis_run_id = ar.id
-                WHERE ebw.token_id = ?
-                ORDER BY ar.analysis_timestamp DESC
-                LIMIT 10
-            """,
-                (token_dict["id"],),
+        wallet_rows = conn.execute(
+            """
+            WITH latest_runs AS (
+                SELECT id, token_id
+                FROM (
+                    SELECT
+                        id, token_id,
+                        ROW_NUMBER() OVER (PARTITION BY token_id ORDER BY analysis_timestamp DESC, id DESC) AS run_rank
+                    FROM analysis_runs
+                    WHERE token_id IN (SELECT value FROM json_each(?))
+                )
+                WHERE run_rank = 1
             )
+            SELECT lr.token_id, ebw.wallet_address
+            FROM latest_runs lr
+            JOIN early_buyer_wallets ebw ON ebw.analysis_run_id = lr.id
+            WHERE ebw.position <= ?
+            ORDER BY lr.token_id, ebw.position
+        """,
+            (json.dumps([token["id"] for token in tokens]), TOKEN_LIST_WALLETS),
+        ).fetchall()
 
-            wallet_addresses = [row[0] for row in cursor.fetchall()]
-            token_dict["wallet_addresses"] = wallet_addresses
-
-            tokens.append(token_dict)
+    # Rows arrive grouped by token, wallets in ranking order
+    wallets_by_token = {}
+    for token in tokens:
+        token["wallet_addresses"] = wallets_by_token[token["id"]] = []
+    for token_id, wallet_address in wallet_rows:
+        wallets_by_token[token_id].append(wallet_address)
 
-        return tokens
+    return tokens
 
 
 def get_token_details(token_id: int) -> Optional[Dict]:
     """Get detailed information about a specific analyzed token"""
-    with get_db_connection() as conn:
+    with get_db_reader() as conn:
         cursor = conn.cursor()
 
         # Get token info
@@ -760,13 +608,13 @@ def get_token_analysis_history(token_id: int) -> List[Dict]:
     Get all analysis runs for a token, most recent first.
     Each run includes its wallets.
     """
-    with get_db_connection() as conn:
+    with get_db_reader() as conn:
         cursor = conn.cursor()
 
         # Get all analysis runs for this token
         cursor.execute(
             """
-            SELECT id, analysis_timestamp, wallets_found, credits_used
+            SELECT id, analysis_timestamp, wallets_found, credits_used, covered_until
             FROM analysis_runs
             WHERE token_id = ?
             ORDER BY analysis_timestamp DESC
@@ -794,9 +642,40 @@ def get_token_analysis_history(token_id: int) -> List[Dict]:
         return runs
 
 
+def get_latest_fetch_cursor(token_address: str) -> Optional[Dict]:
+    """
+    Get where the most recent transaction fetch for a token stopped.
+
+    Runs that didn't fetch (e.g. re-scores) have no cursor and are skipped.
+
+    Returns:
+        Dict with token_id, analysis_run_id, pagination_token, last_slot,
+        last_block_time and transactions_fetched, or None if no run has a cursor
+    """
+    with get_db_reader() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            """
+            SELECT
+                at.id AS token_id, ar.id AS analysis_run_id, ar.pagination_cursor AS pagination_token,
+                ar.last_slot, ar.last_block_time, ar.transactions_fetched
+            FROM analysis_runs ar
+            JOIN analyzed_tokens at ON ar.token_id = at.id
+            WHERE at.token_address = ?
+              AND (at.is_deleted = 0 OR at.is_deleted IS NULL)
+              AND ar.transactions_fetched IS NOT NULL
+            ORDER BY ar.id DESC
+            LIMIT 1
+        """,
+            (token_address,),
+        )
+        row = cursor.fetchone()
+        return dict(row) if row else None
+
+
 def get_wallet_activity(wallet_id: int, limit: int = 50) -> List[Dict]:
     """Get activity history for a specific wallet"""
-    with get_db_connection() as conn:
+    with get_db_reader() as conn:
         cursor = conn.cursor()
         cursor.execute(
             """
@@ -870,7 +749,7 @@ def save_wallet_activity(
 
 def get_recent_activity(limit: int = 100) -> List[Dict]:
     """Get recent wallet activity across all tracked wallets"""
-    with get_db_connection() as conn:
+    with get_db_reader() as conn:
         cursor = conn.cursor()
         cursor.execute(
             """
@@ -916,7 +795,9 @@ def delete_analyzed_token(token_id: int) -> bool:
             return False
 
         # Delete token (CASCADE will delete wallets and activity)
+        wallet_addresses = get_token_wallet_addresses(conn, token_id)
         cursor.execute("DELETE FROM analyzed_tokens WHERE id = ?", (token_id,))
+        refresh_wallet_rollup(conn, wallet_addresses)
 
         print(f"[Database] Deleted token ID {token_id} and all associated data")
         return True
@@ -927,7 +808,7 @@ def search_tokens(query: str) -> List[Dict]:
     Search tokens by token address, token name, symbol, acronym, or wallet address.
     Returns list of tokens that match the search (case-insensitive).
     """
-    with get_db_connection() as conn:
+    with get_db_reader() as conn:
         cursor = conn.cursor()
 
         search_pattern = f"%{query}%"
@@ -972,58 +853,59 @@ def get_multi_token_wallets(min_tokens: int = 2) -> List[Dict]:
     Returns:
         List of dicts with wallet_address, token_count, and list of tokens
     """
-    with get_db_connection() as conn:
-        cursor = conn.cursor()
-
-        # Find wallets that appear in multiple tokens
-        # OPTIMIZED: Use CTE with window function instead of correlated subquery
-        cursor.execute(
+    with get_db_reader() as conn:
+        # Indexed range scan over the rollup, then one lookup for the tokens it references
+        rows = conn.execute(
             """
-            WITH latest_balances AS (
-                SELECT
-                    ebw.wallet_address,
-                    ebw.wallet_balance_usd,
-                    ar.analysis_timestamp,
-                    ROW_NUMBER() OVER (
-                        PARTITION BY ebw.wallet_address
-                        ORDER BY ar.analysis_timestamp DESC
-                    ) as rn
-                FROM early_buyer_wallets ebw
-                JOIN analysis_runs ar ON ebw.analysis_run_id = ar.id
-                WHERE ebw.wallet_balance_usd IS NOT NULL
-            )
-            SELECT
-                ebw.wallet_address,
-                COUNT(DISTINCT ebw.token_id) as token_count,
-                GROUP_CONCAT(DISTINCT at.token_name || ' (' || at.token_symbol || ')') as token_names,
-                GROUP_CONCAT(DISTINCT at.token_address) as token_addresses,
-                GROUP_CONCAT(DISTINCT ebw.token_id) as token_ids,
-                lb.wallet_balance_usd
-            FROM early_buyer_wallets ebw
-            JOIN analyzed_tokens at ON ebw.token_id = at.id
-            LEFT JOIN latest_balances lb ON lb.wallet_address = ebw.wallet_address AND lb.rn = 1
-            WHERE (at.is_deleted = 0 OR at.is_deleted IS NULL)
-            GROUP BY ebw.wallet_address
-            HAVING COUNT(DISTINCT ebw.token_id) >= ?
-            ORDER BY token_count DESC, ebw.wallet_address
+            SELECT wallet_address, token_count, token_ids, wallet_balance_usd
+            FROM wallet_rollup
+            WHERE token_count >= ?
+            ORDER BY token_count DESC, wallet_address
         """,
             (min_tokens,),
+        ).fetchall()
+        tokens = get_rollup_tokens(conn, rows)
+
+    wallets = []
+    for row in rows:
+        token_ids = sorted(int(x) for x in row["token_ids"].split(","))
+        wallets.append(
+            {
+                "wallet_address": row["wallet_address"],
+                "token_count": row["token_count"],
+                "token_names": [f"{tokens[i]['token_name']} ({tokens[i]['token_symbol']})" for i in token_ids],
+                "token_addresses": [tokens[i]["token_address"] for i in token_ids],
+                "token_ids": token_ids,
+                "wallet_balance_usd": row["wallet_balance_usd"],
+            }
         )
 
-        wallets = []
-        for row in cursor.fetchall():
-            wallets.append(
-                {
-                    "wallet_address": row[0],
-                    "token_count": row[1],
-                    "token_names": row[2].split(",") if row[2] else [],
-                    "token_addresses": row[3].split(",") if row[3] else [],
-                    "token_ids": [int(x) for x in row[4].split(",")] if row[4] else [],
-                    "wallet_balance_usd": row[5],
-                }
-            )
+    return wallets
 
-        return wallets
+
+def get_rollup_tokens(conn: sqlite3.Connection, rows: List[sqlite3.Row]) -> Dict[int, sqlite3.Row]:
+    """
+    Fetch the tokens referenced by wallet_rollup rows
+
+    Args:
+        conn: Database connection
+        rows: wallet_rollup rows (their comma-separated token_ids)
+
+    Returns:
+        Dict of token id -> row with token_name, token_symbol, token_address
+    """
+    token_ids = {int(x) for row in rows for x in row["token_ids"].split(",")}
+    if not token_ids:
+        return {}
+    tokens = conn.execute(
+        """
+        SELECT id, token_name, token_symbol, token_address
+        FROM analyzed_tokens
+        WHERE id IN (SELECT value FROM json_each(?))
+    """,
+        (json.dumps(sorted(token_ids)),),
+    )
+    return {token["id"]: token for token in tokens}
 
 
 def update_wallet_balance(wallet_address: str, balance_usd: float) -> bool:
@@ -1037,30 +919,26 @@ def update_wallet_balance(wallet_address: str, balance_usd: float) -> bool:
     Returns:
         True if at least one row was updated, False otherwise
     """
-    conn = get_db_connection()
-    cursor = conn.cursor()
-
     try:
-        # Update balance in early_buyer_wallets table
-        cursor.execute(
-            """
-            UPDATE early_buyer_wallets
-            SET wallet_balance_usd = ?
-            WHERE wallet_address = ?
-        """,
-            (balance_usd, wallet_address),
-        )
-
-        rows_updated = cursor.getrowcount()
-        conn.commit()
-        return rows_updated > 0
+        with get_db_connection() as conn:
+            # Update balance in early_buyer_wallets table
+            cursor = conn.execute(
+                """
+                UPDATE early_buyer_wallets
+                SET wallet_balance_usd = ?
+                WHERE wallet_address = ?
+            """,
+                (balance_usd, wallet_address),
+            )
+            conn.execute(
+                "UPDATE wallet_rollup SET wallet_balance_usd = ? WHERE wallet_address = ?",
+                (balance_usd, wallet_address),
+            )
+            return cursor.rowcount > 0
 
     except Exception as e:
         print(f"Error updating wallet balance for {wallet_address}: {e}")
-        conn.rollback()
         return False
-    finally:
-        conn.close()
 
 
 def add_wallet_tag(wallet_address: str, tag: str, is_kol: bool = False) -> bool:
@@ -1124,7 +1002,7 @@ def get_wallet_tags(wallet_address: str) -> List[Dict]:
     Returns:
         List of tag dictionaries with 'tag' and 'is_kol' fields
     """
-    with get_db_connection() as conn:
+    with get_db_reader() as conn:
         cursor = conn.cursor()
         cursor.execute(
             """
@@ -1153,7 +1031,7 @@ def get_multi_wallet_tags(wallet_addresses: List[str]) -> Dict[str, List[Dict]]:
     if not wallet_addresses:
         return {}
 
-    with get_db_connection() as conn:
+    with get_db_reader() as conn:
         cursor = conn.cursor()
 
         # Create placeholders for IN clause
@@ -1186,7 +1064,7 @@ def get_all_tags() -> List[str]:
     Returns:
         List of unique tag strings
     """
-    with get_db_connection() as conn:
+    with get_db_reader() as conn:
         cursor = conn.cursor()
         cursor.execute(
             """
@@ -1207,7 +1085,7 @@ def get_wallets_by_tag(tag: str) -> List[str]:
     Returns:
         List of wallet addresses
     """
-    with get_db_connection() as conn:
+    with get_db_reader() as conn:
         cursor = conn.cursor()
         cursor.execute(
             """
@@ -1227,7 +1105,7 @@ def get_all_tagged_wallets() -> List[Dict]:
     Returns:
         List of dictionaries with wallet_address and tags
     """
-    with get_db_connection() as conn:
+    with get_db_reader() as conn:
         cursor = conn.cursor()
         cursor.execute(
             """
@@ -1266,6 +1144,7 @@ def soft_delete_token(token_id: int) -> bool:
         success = cursor.rowcount > 0
 
         if success:
+            refresh_token_wallet_rollup(conn, token_id)
             # Move files to trash
             move_files_to_trash(token_id)
 
@@ -1295,6 +1174,7 @@ def restore_token(token_id: int) -> bool:
         success = cursor.rowcount > 0
 
         if success:
+            refresh_token_wallet_rollup(conn, token_id)
             # Restore files from trash
             restore_files_from_trash(token_id)
 
@@ -1318,7 +1198,9 @@ def permanent_delete_token(token_id: int) -> bool:
     with get_db_connection() as conn:
         cursor = conn.cursor()
         # Delete token (CASCADE will handle related records)
+        wallet_addresses = get_token_wallet_addresses(conn, token_id)
         cursor.execute("DELETE FROM analyzed_tokens WHERE id = ?", (token_id,))
+        refresh_wallet_rollup(conn, wallet_addresses)
         return cursor.rowcount > 0
 
 
@@ -1332,7 +1214,7 @@ def get_deleted_tokens(limit: int = 50) -> List[Dict]:
     Returns:
         List of deleted token dictionaries
     """
-    with get_db_connection() as conn:
+    with get_db_reader() as conn:
         cursor = conn.cursor()
         cursor.execute(
             """
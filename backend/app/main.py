@@ -123,7 +123,7 @@ def create_app() -> FastAPI:
         print("[OK] Response caching with ETags (30s TTL + 304 responses)")
         print("[OK] Request deduplication (prevents duplicate concurrent queries)")
         print("[OK] GZip compression (70-90% payload reduction)")
-        print("[OK] Async database queries with aiosqlite")
+        print("[OK] Pooled SQLite connections (WAL, 1 writer + 4 readers, sync and async)")
         print("[OK] Fast JSON serialization (orjson - 5-10x faster)")
         print("=" * 80)
         print("Performance Features:")
@@ -132,8 +132,20 @@ def create_app() -> FastAPI:
         print("  - Concurrent balance refresh: 10x faster than sequential")
         print("  - Heavy load: handles 100+ concurrent requests")
         print("  - WebSocket notifications: real-time analysis updates")
+        print("  - Shared Helius connection pool (HTTP/2 keep-alive)")
         print("=" * 80)
 
+    # Shutdown event
+    @app.on_event("shutdown")
+    async def shutdown_event():
+        from db_pool import close_pools
+        from helius_parse_pool import close_parse_pool
+        from helius_transport import close_transport
+
+        close_transport()
+        close_parse_pool()
+        close_pools()
+
     return app
 
 
@@ -18,6 +18,8 @@ from datetime import datetime
 from threading import Lock
 from typing import Dict, List, Optional
 
+from helius_transport import get_circuit_breaker_stats, get_rate_limiter_stats
+
 
 @dataclass
 class JobMetrics:
@@ -243,6 +245,96 @@ class MetricsCollector:
             safe_endpoint = endpoint.replace('"', '\\"')
             metrics.append(f'http_errors_total{{endpoint="{safe_endpoint}"}} {count}')
 
+        # Helius rate limiter stats (per masked API key)
+        limiter_stats = get_rate_limiter_stats()
+        metrics.append(f"\n# HELP helius_rate_limit_waiting Requests currently queued by the Helius rate limiter")
+        metrics.append(f"# TYPE helius_rate_limit_waiting gauge")
+        for key, stats in limiter_stats.items():
+            metrics.append(f'helius_rate_limit_waiting{{key="{key}"}} {stats["waiting"]}')
+
+        metrics.append(f"\n# HELP helius_rate_limit_in_flight Requests queued or awaiting a response per API key")
+        metrics.append(f"# TYPE helius_rate_limit_in_flight gauge")
+        for key, stats in limiter_stats.items():
+            metrics.append(f'helius_rate_limit_in_flight{{key="{key}"}} {stats["in_flight"]}')
+
+        metrics.append(f"\n# HELP helius_key_cooldown_seconds Seconds until a throttled API key rejoins the key pool")
+        metrics.append(f"# TYPE helius_key_cooldown_seconds gauge")
+        for key, stats in limiter_stats.items():
+            metrics.append(f'helius_key_cooldown_seconds{{key="{key}"}} {stats["cooldown_seconds"]:.3f}')
+
+        metrics.append(f"\n# HELP helius_rate_limit_wait_seconds_total Total time requests spent queued")
+        metrics.append(f"# TYPE helius_rate_limit_wait_seconds_total counter")
+        for key, stats in limiter_stats.items():
+            metrics.append(f'helius_rate_limit_wait_seconds_total{{key="{key}"}} {stats["total_wait_seconds"]:.3f}')
+
+        metrics.append(f"\n# HELP helius_rate_limit_wait_seconds_max Longest single queue wait")
+        metrics.append(f"# TYPE helius_rate_limit_wait_seconds_max gauge")
+        for key, stats in limiter_stats.items():
+            metrics.append(f'helius_rate_limit_wait_seconds_max{{key="{key}"}} {stats["max_wait_seconds"]:.3f}')
+
+        metrics.append(f"\n# HELP helius_requests_total Helius requests sent through the rate limiter")
+        metrics.append(f"# TYPE helius_requests_total counter")
+        for key, stats in limiter_stats.items():
+            metrics.append(f'helius_requests_total{{key="{key}"}} {stats["requests"]}')
+
+        metrics.append(f"\n# HELP helius_credits_total Helius credits charged against the rate limiter")
+        metrics.append(f"# TYPE helius_credits_total counter")
+        for key, stats in limiter_stats.items():
+            metrics.append(f'helius_credits_total{{key="{key}"}} {stats["credits"]}')
+
+        metrics.append(f"\n# HELP helius_throttled_total Helius 429 responses")
+        metrics.append(f"# TYPE helius_throttled_total counter")
+        for key, stats in limiter_stats.items():
+            metrics.append(f'helius_throttled_total{{key="{key}"}} {stats["throttled"]}')
+
+        metrics.append(f"\n# HELP helius_retries_total Helius requests retried after backoff")
+        metrics.append(f"# TYPE helius_retries_total counter")
+        for key, stats in limiter_stats.items():
+            metrics.append(f'helius_retries_total{{key="{key}"}} {stats["retries"]}')
+
+        metrics.append(f"\n# HELP helius_concurrency_limit Current AIMD concurrency window per API key")
+        metrics.append(f"# TYPE helius_concurrency_limit gauge")
+        for key, stats in limiter_stats.items():
+            metrics.append(f'helius_concurrency_limit{{key="{key}"}} {stats["concurrency_limit"]}')
+
+        metrics.append(f"\n# HELP helius_concurrency_in_use Requests holding a concurrency slot")
+        metrics.append(f"# TYPE helius_concurrency_in_use gauge")
+        for key, stats in limiter_stats.items():
+            metrics.append(f'helius_concurrency_in_use{{key="{key}"}} {stats["concurrency_in_use"]}')
+
+        metrics.append(f"\n# HELP helius_concurrency_decisions_total Concurrency window changes by direction")
+        metrics.append(f"# TYPE helius_concurrency_decisions_total counter")
+        for key, stats in limiter_stats.items():
+            metrics.append(
+                f'helius_concurrency_decisions_total{{key="{key}",decision="increase"}} {stats["concurrency_increases"]}'
+            )
+            metrics.append(
+                f'helius_concurrency_decisions_total{{key="{key}",decision="decrease"}} {stats["concurrency_decreases"]}'
+            )
+
+        metrics.append(f"\n# HELP helius_latency_p95_seconds p95 response time of recent Helius requests")
+        metrics.append(f"# TYPE helius_latency_p95_seconds gauge")
+        for key, stats in limiter_stats.items():
+            metrics.append(f'helius_latency_p95_seconds{{key="{key}"}} {stats["latency_p95_seconds"]:.4f}')
+
+        # Helius circuit breakers (per endpoint family)
+        circuit_stats = get_circuit_breaker_stats()
+        circuit_states = {"closed": 0, "half_open": 1, "open": 2}
+        metrics.append(f"\n# HELP helius_circuit_state Helius circuit breaker state (0=closed, 1=half-open, 2=open)")
+        metrics.append(f"# TYPE helius_circuit_state gauge")
+        for endpoint, stats in circuit_stats.items():
+            metrics.append(f'helius_circuit_state{{endpoint="{endpoint}"}} {circuit_states[stats["state"]]}')
+
+        metrics.append(f"\n# HELP helius_circuit_trips_total Times a Helius circuit opened")
+        metrics.append(f"# TYPE helius_circuit_trips_total counter")
+        for endpoint, stats in circuit_stats.items():
+            metrics.append(f'helius_circuit_trips_total{{endpoint="{endpoint}"}} {stats["trips"]}')
+
+        metrics.append(f"\n# HELP helius_circuit_rejected_total Requests failed fast by an open Helius circuit")
+        metrics.append(f"# TYPE helius_circuit_rejected_total counter")
+        for endpoint, stats in circuit_stats.items():
+            metrics.append(f'helius_circuit_rejected_total{{endpoint="{endpoint}"}} {stats["rejected"]}')
+
         return "\n".join(metrics) + "\n"
 
 
@@ -11,7 +11,7 @@ import json
 import os
 import uuid
 from datetime import datetime
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 from fastapi import APIRouter, HTTPException
 from fastapi.responses import FileResponse, StreamingResponse
@@ -27,7 +27,7 @@ from app.observability import (
     sanitize_address,
     set_job_id,
 )
-from app.settings import CURRENT_API_SETTINGS, HELIUS_API_KEY
+from app.settings import CURRENT_API_SETTINGS, HELIUS_KEY_POOL
 from app.state import ANALYSIS_EXECUTOR, get_all_analysis_jobs, get_analysis_job, set_analysis_job, update_analysis_job
 from app.utils.models import (
     AnalysisJob,
@@ -36,14 +36,103 @@ from app.utils.models import (
     AnalysisSettings,
     AnalyzeTokenRequest,
     QueueTokenResponse,
+    RescoreTokenRequest,
+    RescoreTokenResponse,
 )
 from app.utils.validators import is_valid_solana_address
 from app.websocket import get_connection_manager
-from helius_api import TokenAnalyzer, generate_axiom_export, generate_token_acronym
+from helius_api import HeliusAPI, TokenAnalyzer, generate_axiom_export, generate_token_acronym
+from helius_transport import CircuitOpenError, check_circuit, get_circuit_breaker
 
 router = APIRouter()
 
 
+def save_result_files(token_id: int, token_name: str, acronym: str, result: Dict, axiom_export: List[Dict]) -> str:
+    """Write analysis and Axiom export files for a saved token, returning the result filename"""
+    analysis_filepath = db.get_analysis_file_path(token_id, token_name, in_trash=False)
+    axiom_filepath = db.get_axiom_file_path(token_id, acronym, in_trash=False)
+
+    # Ensure directories exist
+    os.makedirs(os.path.dirname(analysis_filepath), exist_ok=True)
+    os.makedirs(os.path.dirname(axiom_filepath), exist_ok=True)
+
+    # Save files
+    with open(analysis_filepath, "w") as f:
+        json.dump(result, f, indent=2)
+    with open(axiom_filepath, "w") as f:
+        json.dump(axiom_export, f, indent=2)
+
+    # Update database with file paths
+    db.update_token_file_paths(token_id, analysis_filepath, axiom_filepath)
+
+    return os.path.basename(analysis_filepath)
+
+
+def extend_token_analysis(
+    analyzer: TokenAnalyzer,
+    token_address: str,
+    min_usd: float,
+    time_window_hours: int,
+    max_transactions: int,
+    max_credits: int,
+    max_wallets: int,
+    prefetch_depth: int = 0,
+) -> Optional[Dict[str, Any]]:
+    """
+    Deepen the latest analysis of a token to max_transactions, fetching only the delta.
+
+    Returns None if the token has no earlier fetch (or stored transactions) to continue from,
+    or if its stored transactions stop before the requested time window ends.
+    """
+    fetch_cursor = db.get_latest_fetch_cursor(token_address)
+    if fetch_cursor is None:
+        return None
+
+    token = db.get_token_details(fetch_cursor["token_id"])
+    known_balances = {}
+    for wallet in token["wallets"]:
+        known_balances.setdefault(wallet["wallet_address"], wallet.get("wallet_balance_usd"))
+
+    remaining = max_transactions - (fetch_cursor["transactions_fetched"] or 0)
+    if remaining <= 0:
+        # Already fetched this deep - re-score the stored transactions (0 credits)
+        log_info("Extend target already fetched - re-scoring", token_id=fetch_cursor["token_id"])
+        result = analyzer.helius.rescore_early_bidders(
+            mint_address=token_address,
+            min_usd=min_usd,
+            time_window_hours=time_window_hours,
+            max_wallets_to_store=max_wallets,
+            known_balances=known_balances,
+        )
+        if result is not None and result.get("needs_extend"):
+            # The earlier fetch stopped early and cannot answer this window - analyze from scratch
+            log_info("Stored transactions do not cover the window", token_id=fetch_cursor["token_id"])
+            return None
+        if result is not None:
+            result["token_info"] = {
+                "onChainMetadata": {"metadata": {"name": token["token_name"], "symbol": token["token_symbol"]}}
+            }
+        return result
+
+    log_info(
+        "Extending analysis",
+        token_id=fetch_cursor["token_id"],
+        transactions_fetched=fetch_cursor["transactions_fetched"],
+        new_transactions=remaining,
+    )
+    return analyzer.extend_token(
+        mint_address=token_address,
+        resume_cursor=fetch_cursor,
+        max_new_transactions=remaining,
+        min_usd=min_usd,
+        time_window_hours=time_window_hours,
+        max_credits=max_credits,
+        max_wallets_to_store=max_wallets,
+        known_balances=known_balances,
+        prefetch_depth=prefetch_depth,
+    )
+
+
 def run_token_analysis_sync(
     job_id: str,
     token_address: str,
@@ -52,6 +141,10 @@ def run_token_analysis_sync(
     max_transactions: int,
     max_credits: int,
     max_wallets: int,
+    prefetch_depth: int = 0,
+    columnar_parser: bool = False,
+    parse_workers: int = 0,
+    mode: str = "full",
 ):
     """Synchronous worker function for background thread pool"""
     try:
@@ -60,15 +153,48 @@ def run_token_analysis_sync(
         log_analysis_start(job_id, token_address)
         update_analysis_job(job_id, {"status": "processing"})
 
-        analyzer = TokenAnalyzer(HELIUS_API_KEY)
-        result = analyzer.analyze_token(
-            mint_address=token_address,
-            min_usd=min_usd,
-            time_window_hours=time_window_hours,
-            max_transactions=max_transactions,
-            max_credits=max_credits,
-            max_wallets_to_store=max_wallets,
-        )
+        # Fail fast instead of holding an executor thread while Helius RPC is down
+        check_circuit("rpc")
+
+        analyzer = TokenAnalyzer(HELIUS_KEY_POOL, columnar_parser=columnar_parser, parse_workers=parse_workers)
+        result = None
+        if mode == "deep":
+            result = analyzer.deep_analyze_token(
+                mint_address=token_address,
+                min_usd=min_usd,
+                time_window_hours=time_window_hours,
+                max_transactions=max_transactions,
+                max_credits=max_credits,
+                max_wallets_to_store=max_wallets,
+                prefetch_depth=prefetch_depth,
+                on_progress=lambda progress: update_analysis_job(job_id, {"progress": progress}),
+            )
+        elif mode == "extend":
+            result = extend_token_analysis(
+                analyzer,
+                token_address,
+                min_usd,
+                time_window_hours,
+                max_transactions,
+                max_credits,
+                max_wallets,
+                prefetch_depth=prefetch_depth,
+            )
+            if result is None:
+                log_info(
+                    "No previous fetch to extend - running full analysis", token_address=sanitize_address(token_address)
+                )
+
+        if result is None:
+            result = analyzer.analyze_token(
+                mint_address=token_address,
+                min_usd=min_usd,
+                time_window_hours=time_window_hours,
+                max_transactions=max_transactions,
+                max_credits=max_credits,
+                max_wallets_to_store=max_wallets,
+                prefetch_depth=prefetch_depth,
+            )
 
         # Extract token info
         token_info = result.get("token_info")
@@ -82,6 +208,10 @@ def run_token_analysis_sync(
 
         # Check if analysis found any meaningful data
         early_bidders = result.get("early_bidders", [])
+        rpc_circuit = get_circuit_breaker("rpc")
+        if len(early_bidders) == 0 and rpc_circuit.is_open():
+            # The fetch was cut short by a Helius outage, not an empty token
+            raise CircuitOpenError("rpc", rpc_circuit.retry_in())
         if len(early_bidders) == 0 and token_info is None:
             error_msg = result.get("error", "No transactions found")
             log_info("Analysis found no data - skipping database save", wallets_found=0)
@@ -113,28 +243,15 @@ def run_token_analysis_sync(
             first_buy_timestamp=result.get("first_transaction_time"),
             credits_used=result.get("api_credits_used", 0),
             max_wallets=max_wallets,
+            fetch_cursor=result.get("fetch_cursor"),
+            covered_until=result.get("covered_until"),
         )
         log_info("Saved token to database", token_id=token_id, acronym=acronym)
 
-        # Get file paths
-        analysis_filepath = db.get_analysis_file_path(token_id, token_name, in_trash=False)
+        # Save result files
+        result_filename = save_result_files(token_id, token_name, acronym, result, axiom_export)
         axiom_filepath = db.get_axiom_file_path(token_id, acronym, in_trash=False)
 
-        # Ensure directories exist
-        os.makedirs(os.path.dirname(analysis_filepath), exist_ok=True)
-        os.makedirs(os.path.dirname(axiom_filepath), exist_ok=True)
-
-        # Save files
-        with open(analysis_filepath, "w") as f:
-            json.dump(result, f, indent=2)
-        with open(axiom_filepath, "w") as f:
-            json.dump(axiom_export, f, indent=2)
-
-        # Update database with file paths
-        db.update_token_file_paths(token_id, analysis_filepath, axiom_filepath)
-
-        result_filename = os.path.basename(analysis_filepath)
-
         # Update job with results
         update_analysis_job(
             job_id,
@@ -200,6 +317,7 @@ async def analyze_token(request: AnalyzeTokenRequest):
         "transaction_limit": settings.transactionLimit,
         "max_wallets": settings.walletCount,
         "max_credits": settings.maxCreditsPerAnalysis,
+        "mode": request.mode,
         "created_at": datetime.now().isoformat(),
         "result": None,
         "error": None,
@@ -225,6 +343,10 @@ async def analyze_token(request: AnalyzeTokenRequest):
         settings.transactionLimit,
         settings.maxCreditsPerAnalysis,
         settings.walletCount,
+        settings.prefetchDepth,
+        settings.columnarParser,
+        settings.parseWorkers,
+        request.mode,
     )
 
     return {
@@ -241,6 +363,86 @@ async def analyze_token(request: AnalyzeTokenRequest):
     }
 
 
+def rescore_token_sync(token_id: int, min_usd: float, time_window_hours: int, max_wallets: int) -> Dict[str, Any]:
+    """Re-score a token from its stored transactions and save the result as a new analysis run"""
+    token = db.get_token_details(token_id)
+    if not token or token.get("deleted_at"):
+        raise HTTPException(status_code=404, detail="Token not found")
+
+    # Carry over the most recently fetched balance for each wallet (wallets are newest run first)
+    known_balances = {}
+    for wallet in token["wallets"]:
+        known_balances.setdefault(wallet["wallet_address"], wallet.get("wallet_balance_usd"))
+
+    helius = HeliusAPI(HELIUS_KEY_POOL)
+    result = helius.rescore_early_bidders(
+        mint_address=token["token_address"],
+        min_usd=min_usd,
+        time_window_hours=time_window_hours,
+        max_wallets_to_store=max_wallets,
+        known_balances=known_balances,
+    )
+    if result is None:
+        raise HTTPException(status_code=409, detail="No stored transactions for this token - run a full analysis first")
+    if result.get("needs_extend"):
+        raise HTTPException(status_code=409, detail=result["error"])
+    if result.get("error"):
+        raise HTTPException(status_code=422, detail=result["error"])
+
+    token_name = token.get("token_name") or "Unknown"
+    token_symbol = token.get("token_symbol") or "UNK"
+    acronym = token.get("acronym") or generate_token_acronym(token_name, token_symbol)
+
+    early_bidders = result["early_bidders"]
+    for bidder in early_bidders:
+        if "first_buy_time" in bidder and hasattr(bidder["first_buy_time"], "isoformat"):
+            bidder["first_buy_time"] = bidder["first_buy_time"].isoformat()
+
+    axiom_export = generate_axiom_export(
+        early_bidders=early_bidders, token_name=token_name, token_symbol=token_symbol, limit=max_wallets
+    )
+    db.save_analyzed_token(
+        token_address=token["token_address"],
+        token_name=token_name,
+        token_symbol=token_symbol,
+        acronym=acronym,
+        early_bidders=early_bidders,
+        axiom_json=axiom_export,
+        first_buy_timestamp=result.get("first_transaction_time"),
+        credits_used=0,
+        max_wallets=max_wallets,
+    )
+    save_result_files(token_id, token_name, acronym, result, axiom_export)
+
+    return {
+        "token_id": token_id,
+        "token_address": token["token_address"],
+        "min_usd": min_usd,
+        "time_window_hours": time_window_hours,
+        "max_wallets": max_wallets,
+        "wallets_found": len(early_bidders),
+        "total_transactions_analyzed": result["total_transactions_analyzed"],
+        "credits_used": 0,
+        "early_bidders": early_bidders,
+    }
+
+
+@router.post("/analysis/{token_id}/rescore", response_model=RescoreTokenResponse)
+async def rescore_token(token_id: int, request: RescoreTokenRequest):
+    """Re-score a previously analyzed token with new thresholds (0 API credits)"""
+    settings = AnalysisSettings(**CURRENT_API_SETTINGS)
+    min_usd = request.min_usd if request.min_usd is not None else settings.minUsdFilter
+    max_wallets = request.max_wallets or settings.walletCount
+
+    # Loading, scoring and saving are blocking - keep them off the event loop
+    loop = asyncio.get_running_loop()
+    result = await loop.run_in_executor(
+        ANALYSIS_EXECUTOR, rescore_token_sync, token_id, min_usd, request.time_window_hours, max_wallets
+    )
+    log_info("Token re-scored", token_id=token_id, min_usd=min_usd, wallets_found=result["wallets_found"])
+    return result
+
+
 @router.get("/analysis/{job_id}", response_model=AnalysisJob)
 async def get_analysis(job_id: str):
     """Get analysis job status and results"""
@@ -8,6 +8,7 @@ from fastapi import APIRouter
 from fastapi.responses import PlainTextResponse
 
 from app.observability import metrics_collector
+from helius_transport import get_circuit_breaker_stats, get_key_pool_health, get_rate_limiter_stats
 
 router = APIRouter()
 
@@ -33,11 +34,22 @@ async def get_health():
     """
     Get health check status
 
-    Returns basic health information including queue depth
-    and success rate
+    Returns basic health information including queue depth,
+    success rate, Helius rate limiter queue stats, the health of
+    each key in the Helius API key pool and the Helius circuit breakers.
+    Status is "degraded" while any Helius circuit is open.
     """
     queue_depth = metrics_collector.get_queue_depth()
     success_rate = metrics_collector.get_success_rate()
     ws_stats = metrics_collector.get_websocket_stats()
-
-    return {"status": "healthy", "queue": queue_depth, "success_rate": success_rate, "websocket": ws_stats}
+    circuits = get_circuit_breaker_stats()
+
+    return {
+        "status": "degraded" if any(c["state"] != "closed" for c in circuits.values()) else "healthy",
+        "queue": queue_depth,
+        "success_rate": success_rate,
+        "websocket": ws_stats,
+        "helius_rate_limits": get_rate_limiter_stats(),
+        "helius_key_pool": get_key_pool_health(),
+        "helius_circuits": circuits,
+    }
@@ -4,7 +4,8 @@ Tags router - wallet tagging and Codex endpoints
 Provides REST endpoints for wallet tagging operations
 """
 
-import aiosqlite
+import sqlite3
+
 from fastapi import APIRouter, HTTPException
 
 import analyzed_tokens_db as db
@@ -19,6 +20,7 @@ from app.utils.models import (
     TagsResponse,
     WalletTagsResponse,
 )
+from db_pool import get_pool
 from secure_logging import log_error
 
 router = APIRouter()
@@ -28,8 +30,7 @@ cache = ResponseCache()
 @router.get("/wallets/{wallet_address}/tags", response_model=WalletTagsResponse)
 async def get_wallet_tags(wallet_address: str):
     """Get tags for a wallet"""
-    async with aiosqlite.connect(settings.DATABASE_FILE) as conn:
-        conn.row_factory = aiosqlite.Row
+    async with get_pool(settings.DATABASE_FILE).reader_async() as conn:
         query = "SELECT tag, is_kol FROM wallet_tags WHERE wallet_address = ?"
         cursor = await conn.execute(query, (wallet_address,))
         rows = await cursor.fetchall()
@@ -40,14 +41,14 @@ async def get_wallet_tags(wallet_address: str):
 @router.post("/wallets/{wallet_address}/tags", response_model=MessageResponse)
 async def add_wallet_tag(wallet_address: str, request: AddTagRequest):
     """Add a tag to a wallet"""
-    async with aiosqlite.connect(settings.DATABASE_FILE) as conn:
+    async with get_pool(settings.DATABASE_FILE).writer_async() as conn:
         try:
             await conn.execute(
                 "INSERT INTO wallet_tags (wallet_address, tag, is_kol) VALUES (?, ?, ?)",
                 (wallet_address, request.tag, request.is_kol),
             )
             await conn.commit()
-        except aiosqlite.IntegrityError:
+        except sqlite3.IntegrityError:
             raise HTTPException(status_code=400, detail="Tag already exists for this wallet")
 
     cache.invalidate("codex")
@@ -57,7 +58,7 @@ async def add_wallet_tag(wallet_address: str, request: AddTagRequest):
 @router.delete("/wallets/{wallet_address}/tags", response_model=MessageResponse)
 async def remove_wallet_tag(wallet_address: str, request: RemoveTagRequest):
     """Remove a tag from a wallet"""
-    async with aiosqlite.connect(settings.DATABASE_FILE) as conn:
+    async with get_pool(settings.DATABASE_FILE).writer_async() as conn:
         await conn.execute(
             "DELETE FROM wallet_tags WHERE wallet_address = ? AND tag = ?", (wallet_address, request.tag)
         )
@@ -75,7 +76,7 @@ async def get_all_tags():
     if cached_data:
         return cached_data
 
-    async with aiosqlite.connect(settings.DATABASE_FILE) as conn:
+    async with get_pool(settings.DATABASE_FILE).reader_async() as conn:
         query = "SELECT DISTINCT tag FROM wallet_tags ORDER BY tag"
         cursor = await conn.execute(query)
         rows = await cursor.fetchall()
@@ -93,8 +94,7 @@ async def get_codex():
     if cached_data:
         return cached_data
 
-    async with aiosqlite.connect(settings.DATABASE_FILE) as conn:
-        conn.row_factory = aiosqlite.Row
+    async with get_pool(settings.DATABASE_FILE).reader_async() as conn:
         query = """
             SELECT wallet_address, tag, is_kol
             FROM wallet_tags
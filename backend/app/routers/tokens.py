@@ -8,12 +8,13 @@ import json
 from datetime import datetime
 from typing import Any, Dict, List
 
-import aiosqlite
 from fastapi import APIRouter, HTTPException, Request, Response
 
+import analyzed_tokens_db as db
 from app import settings
 from app.cache import ResponseCache
 from app.utils.models import AnalysisHistory, MessageResponse, TokenDetail, TokensResponse
+from db_pool import get_pool
 
 router = APIRouter()
 cache = ResponseCache()
@@ -36,8 +37,7 @@ async def get_tokens_history(request: Request, response: Response):
 
     # Fetch from database
     async def fetch_tokens():
-        async with aiosqlite.connect(settings.DATABASE_FILE) as conn:
-            conn.row_factory = aiosqlite.Row
+        async with get_pool(settings.DATABASE_FILE).reader_async() as conn:
             query = """
                 SELECT
                     t.id, t.token_address, t.token_name, t.token_symbol, t.acronym,
@@ -71,8 +71,7 @@ async def get_tokens_history(request: Request, response: Response):
 @router.get("/api/tokens/trash", response_model=TokensResponse)
 async def get_deleted_tokens():
     """Get all soft-deleted tokens"""
-    async with aiosqlite.connect(settings.DATABASE_FILE) as conn:
-        conn.row_factory = aiosqlite.Row
+    async with get_pool(settings.DATABASE_FILE).reader_async() as conn:
         query = """
             SELECT
                 t.*, COUNT(DISTINCT ebw.wallet_address) as wallets_found
@@ -92,8 +91,7 @@ async def get_deleted_tokens():
 @router.get("/api/tokens/{token_id}", response_model=TokenDetail)
 async def get_token_by_id(token_id: int):
     """Get token details with wallets and axiom export"""
-    async with aiosqlite.connect(settings.DATABASE_FILE) as conn:
-        conn.row_factory = aiosqlite.Row
+    async with get_pool(settings.DATABASE_FILE).reader_async() as conn:
 
         # Get token info
         token_query = "SELECT * FROM analyzed_tokens WHERE id = ? AND deleted_at IS NULL"
@@ -127,8 +125,7 @@ async def get_token_by_id(token_id: int):
 @router.get("/api/tokens/{token_id}/history", response_model=AnalysisHistory)
 async def get_token_analysis_history(token_id: int):
     """Get analysis history for a specific token"""
-    async with aiosqlite.connect(settings.DATABASE_FILE) as conn:
-        conn.row_factory = aiosqlite.Row
+    async with get_pool(settings.DATABASE_FILE).reader_async() as conn:
 
         # Verify token exists
         token_query = "SELECT id FROM analyzed_tokens WHERE id = ?"
@@ -138,7 +135,7 @@ async def get_token_analysis_history(token_id: int):
 
         # Fetch analysis runs
         runs_query = """
-            SELECT id, analysis_timestamp, wallets_found, credits_used
+            SELECT id, analysis_timestamp, wallets_found, credits_used, covered_until
             FROM analysis_runs
             WHERE token_id = ?
             ORDER BY analysis_timestamp DESC
@@ -166,9 +163,10 @@ async def get_token_analysis_history(token_id: int):
 @router.delete("/api/tokens/{token_id}", response_model=MessageResponse)
 async def soft_delete_token(token_id: int):
     """Soft delete a token (move to trash)"""
-    async with aiosqlite.connect(settings.DATABASE_FILE) as conn:
+    async with get_pool(settings.DATABASE_FILE).writer_async() as conn:
         query = "UPDATE analyzed_tokens SET deleted_at = ? WHERE id = ?"
         await conn.execute(query, (datetime.utcnow().isoformat(), token_id))
+        await conn.run_sync(db.refresh_token_wallet_rollup, token_id)
         await conn.commit()
 
     cache.invalidate("tokens")
@@ -178,9 +176,10 @@ async def soft_delete_token(token_id: int):
 @router.post("/api/tokens/{token_id}/restore", response_model=MessageResponse)
 async def restore_token(token_id: int):
     """Restore a soft-deleted token"""
-    async with aiosqlite.connect(settings.DATABASE_FILE) as conn:
+    async with get_pool(settings.DATABASE_FILE).writer_async() as conn:
         query = "UPDATE analyzed_tokens SET deleted_at = NULL WHERE id = ?"
         await conn.execute(query, (token_id,))
+        await conn.run_sync(db.refresh_token_wallet_rollup, token_id)
         await conn.commit()
 
     cache.invalidate("tokens")
@@ -190,11 +189,13 @@ async def restore_token(token_id: int):
 @router.delete("/api/tokens/{token_id}/permanent", response_model=MessageResponse)
 async def permanent_delete_token(token_id: int):
     """Permanently delete a token and all associated data"""
-    async with aiosqlite.connect(settings.DATABASE_FILE) as conn:
-        # Delete in order: wallets, analysis runs, token
+    async with get_pool(settings.DATABASE_FILE).writer_async() as conn:
+        # Delete in order: wallets, analysis runs, token (then drop the token from its wallets' rollups)
+        wallet_addresses = await conn.run_sync(db.get_token_wallet_addresses, token_id)
         await conn.execute("DELETE FROM early_buyer_wallets WHERE token_id = ?", (token_id,))
         await conn.execute("DELETE FROM analysis_runs WHERE token_id = ?", (token_id,))
         await conn.execute("DELETE FROM analyzed_tokens WHERE id = ?", (token_id,))
+        await conn.run_sync(db.refresh_wallet_rollup, wallet_addresses)
         await conn.commit()
 
     cache.invalidate("tokens")
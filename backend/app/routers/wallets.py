@@ -4,12 +4,9 @@ Wallets router - multi-token wallets and balance refresh endpoints
 Provides REST endpoints for wallet operations
 """
 
-import asyncio
-
-import aiosqlite
-import requests
 from fastapi import APIRouter, HTTPException
 
+import analyzed_tokens_db as db
 from app import settings
 from app.cache import ResponseCache
 from app.utils.models import (
@@ -17,6 +14,8 @@ from app.utils.models import (
     RefreshBalancesRequest,
     RefreshBalancesResponse,
 )
+from db_pool import get_pool
+from helius_api import HeliusAPI, lamports_to_usd
 
 router = APIRouter()
 cache = ResponseCache()
@@ -30,41 +29,35 @@ async def get_multi_early_buyer_wallets(min_tokens: int = 2):
     if cached_data:
         return cached_data
 
-    async with aiosqlite.connect(settings.DATABASE_FILE) as conn:
-        conn.row_factory = aiosqlite.Row
+    async with get_pool(settings.DATABASE_FILE).reader_async() as conn:
+        # wallet_rollup is kept current by every write that changes a wallet's tokens
         query = """
-            SELECT
-                tw.wallet_address,
-                COUNT(DISTINCT tw.token_id) as token_count,
-                GROUP_CONCAT(DISTINCT t.token_name) as token_names,
-                GROUP_CONCAT(DISTINCT t.token_address) as token_addresses,
-                GROUP_CONCAT(DISTINCT t.id) as token_ids,
-                MAX(tw.wallet_balance_usd) as wallet_balance_usd
-            FROM early_buyer_wallets tw
-            JOIN analyzed_tokens t ON tw.token_id = t.id
-            WHERE t.deleted_at IS NULL
-            GROUP BY tw.wallet_address
-            HAVING COUNT(DISTINCT tw.token_id) >= ?
+            SELECT wallet_address, token_count, token_ids, wallet_balance_usd
+            FROM wallet_rollup
+            WHERE token_count >= ?
             ORDER BY token_count DESC, wallet_balance_usd DESC
         """
         cursor = await conn.execute(query, (min_tokens,))
         rows = await cursor.fetchall()
-
-        wallets = []
-        for row in rows:
-            wallet_dict = dict(row)
-            wallet_dict["token_names"] = wallet_dict["token_names"].split(",") if wallet_dict["token_names"] else []
-            wallet_dict["token_addresses"] = (
-                wallet_dict["token_addresses"].split(",") if wallet_dict["token_addresses"] else []
-            )
-            wallet_dict["token_ids"] = [
-                int(id) for id in wallet_dict["token_ids"].split(",") if wallet_dict["token_ids"]
-            ]
-            wallets.append(wallet_dict)
-
-        result = {"total": len(wallets), "wallets": wallets}
-        cache.set(cache_key, result)
-        return result
+        tokens = await conn.run_sync(db.get_rollup_tokens, rows)
+
+    wallets = []
+    for row in rows:
+        token_ids = sorted(int(x) for x in row["token_ids"].split(","))
+        wallets.append(
+            {
+                "wallet_address": row["wallet_address"],
+                "token_count": row["token_count"],
+                "token_names": [tokens[i]["token_name"] for i in token_ids],
+                "token_addresses": [tokens[i]["token_address"] for i in token_ids],
+                "token_ids": token_ids,
+                "wallet_balance_usd": row["wallet_balance_usd"],
+            }
+        )
+
+    result = {"total": len(wallets), "wallets": wallets}
+    cache.set(cache_key, result)
+    return result
 
 
 @router.post("/wallets/refresh-balances", response_model=RefreshBalancesResponse)
@@ -76,36 +69,32 @@ async def refresh_wallet_balances(request: RefreshBalancesRequest):
     if not api_key:
         raise HTTPException(status_code=500, detail="Helius API key not configured")
 
-    async def fetch_balance(wallet_address: str):
-        try:
-            loop = asyncio.get_event_loop()
-            response = await loop.run_in_executor(
-                None,
-                lambda: requests.get(
-                    f"https://api.helius.xyz/v0/addresses/{wallet_address}/balances?api-key={api_key}", timeout=10
-                ),
+    # Batched getMultipleAccounts over the shared Helius connection pool, spread across the key pool
+    helius = HeliusAPI(settings.HELIUS_KEY_POOL)
+    balances, credits_used = await helius.get_wallet_balances_async(wallet_addresses)
+
+    results = []
+    for wallet_address in wallet_addresses:
+        lamports = balances.get(wallet_address)
+        if lamports is None:
+            results.append({"wallet_address": wallet_address, "balance_usd": None, "success": False})
+        else:
+            results.append(
+                {"wallet_address": wallet_address, "balance_usd": lamports_to_usd(lamports), "success": True}
             )
 
-            if response.status_code == 200:
-                data = response.json()
-                balance_usd = data.get("nativeBalance", 0) * 0.001
-                return {"wallet_address": wallet_address, "balance_usd": balance_usd, "success": True}
-            else:
-                return {"wallet_address": wallet_address, "balance_usd": None, "success": False}
-        except Exception:
-            return {"wallet_address": wallet_address, "balance_usd": None, "success": False}
-
-    # Fetch all balances concurrently
-    results = await asyncio.gather(*[fetch_balance(addr) for addr in wallet_addresses])
-
     # Update database
-    async with aiosqlite.connect(settings.DATABASE_FILE) as conn:
+    async with get_pool(settings.DATABASE_FILE).writer_async() as conn:
         for result in results:
             if result["success"] and result["balance_usd"] is not None:
                 await conn.execute(
                     "UPDATE early_buyer_wallets SET wallet_balance_usd = ? WHERE wallet_address = ?",
                     (result["balance_usd"], result["wallet_address"]),
                 )
+                await conn.execute(
+                    "UPDATE wallet_rollup SET wallet_balance_usd = ? WHERE wallet_address = ?",
+                    (result["balance_usd"], result["wallet_address"]),
+                )
         await conn.commit()
 
     cache.invalidate("multi_early_buyer_wallets")
@@ -117,5 +106,5 @@ async def refresh_wallet_balances(request: RefreshBalancesRequest):
         "results": results,
         "total_wallets": len(wallet_addresses),
         "successful": successful,
-        "api_credits_used": len(wallet_addresses),
+        "api_credits_used": credits_used,
     }
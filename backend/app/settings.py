@@ -2,14 +2,16 @@
 Configuration and settings management for Gun Del Sol
 
 Centralizes loading of:
-- Helius API key
+- Helius API keys (one primary key, optionally more for the key pool)
 - API settings (transaction limits, wallet count, etc.)
 - File paths (database, results directories)
 """
 
 import json
 import os
-from typing import Dict, Optional
+from typing import Dict, List, Optional
+
+from helius_transport import configure_key_pool, configure_rate_limits
 
 # ============================================================================
 # Directory Paths
@@ -31,31 +33,54 @@ os.makedirs(AXIOM_EXPORTS_DIR, exist_ok=True)
 # ============================================================================
 
 
-def load_api_key() -> Optional[str]:
-    """Load Helius API key from environment or config file"""
-    # Try environment variable first
-    api_key = os.environ.get("HELIUS_API_KEY")
-    if api_key:
-        return api_key
-
-    # Try config.json (look in the backend directory where this script is located)
+def _read_config_file() -> Dict:
+    """Read backend/config.json (empty dict if missing or unreadable)"""
     config_file = os.path.join(SCRIPT_DIR, "config.json")
     if os.path.exists(config_file):
         try:
             with open(config_file, "r") as f:
-                config = json.load(f)
-                return config.get("helius_api_key")
+                return json.load(f)
         except Exception as e:
             print(f"[Config] Error reading config.json: {e}")
+    return {}
+
+
+def load_api_keys() -> List[str]:
+    """
+    Load every configured Helius API key, primary key first
+
+    Keys come from HELIUS_API_KEY and HELIUS_API_KEYS (comma-separated) in the
+    environment, falling back to "helius_api_key" and "helius_api_keys" (a list)
+    in config.json. Duplicates are dropped.
+    """
+    keys = [os.environ.get("HELIUS_API_KEY", "")]
+    keys += os.environ.get("HELIUS_API_KEYS", "").split(",")
+
+    if not any(key.strip() for key in keys):
+        config = _read_config_file()
+        keys = [config.get("helius_api_key") or ""]
+        keys += config.get("helius_api_keys") or []
 
-    return None
+    return list(dict.fromkeys(key.strip() for key in keys if key and key.strip()))
 
 
-HELIUS_API_KEY = load_api_key()
-if not HELIUS_API_KEY:
+def load_api_key() -> Optional[str]:
+    """Load the primary Helius API key from environment or config file"""
+    keys = load_api_keys()
+    return keys[0] if keys else None
+
+
+HELIUS_API_KEYS = load_api_keys()
+if not HELIUS_API_KEYS:
     raise RuntimeError("HELIUS_API_KEY not set. Add it to environment variable or backend/config.json")
 
-print(f"[Config] Loaded Helius API key: {HELIUS_API_KEY[:8]}..." if HELIUS_API_KEY else "[Config] No API key loaded")
+# Primary key (webhooks are registered under it); analyses spread over the whole pool
+HELIUS_API_KEY = HELIUS_API_KEYS[0]
+HELIUS_KEY_POOL = configure_key_pool(HELIUS_API_KEYS)
+
+print(f"[Config] Loaded Helius API key: {HELIUS_API_KEY[:8]}...")
+if len(HELIUS_API_KEYS) > 1:
+    print(f"[Config] Helius key pool: {len(HELIUS_API_KEYS)} keys")
 
 # ============================================================================
 # API Settings Management
@@ -68,6 +93,10 @@ DEFAULT_API_SETTINGS = {
     "apiRateDelay": 100,
     "maxCreditsPerAnalysis": 1000,
     "maxRetries": 3,
+    "maxCreditsPerMinute": 0,  # 0 = no credit governor
+    "prefetchDepth": 0,  # transaction pages fetched ahead while parsing (0 = sequential)
+    "columnarParser": False,  # parse transaction pages with the NumPy batch parser
+    "parseWorkers": 0,  # worker processes for page decoding/parsing (0 = parse in the analysis thread)
 }
 
 DEFAULT_THRESHOLD = 100
@@ -99,8 +128,24 @@ def save_api_settings(settings: Dict) -> bool:
         return False
 
 
+def apply_rate_limit_settings(settings: Dict):
+    """
+    Push rate limit settings into the shared Helius rate limiters
+
+    apiRateDelay (ms between requests) becomes a requests/sec budget per API key,
+    maxCreditsPerMinute a credit budget, and maxRetries the retry ceiling.
+    """
+    rate_delay_ms = settings.get("apiRateDelay") or 0
+    configure_rate_limits(
+        requests_per_second=1000.0 / rate_delay_ms if rate_delay_ms > 0 else 0,
+        credits_per_minute=settings.get("maxCreditsPerMinute") or 0,
+        max_retries=settings.get("maxRetries", 3),
+    )
+
+
 # Load settings on module import
 CURRENT_API_SETTINGS = load_api_settings()
+apply_rate_limit_settings(CURRENT_API_SETTINGS)
 print(
     f"[Config] API Settings: walletCount={CURRENT_API_SETTINGS['walletCount']}, "
     f"transactionLimit={CURRENT_API_SETTINGS['transactionLimit']}, "
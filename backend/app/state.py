@@ -16,7 +16,9 @@ from typing import Any, Dict
 # In-memory job tracking (will be replaced with database or Redis in future)
 analysis_jobs: Dict[str, Dict[str, Any]] = {}
 
-# Thread pool for background analysis jobs
+# Thread pool for background analysis jobs. Each analysis holds one of these threads for its
+# whole run (its Helius calls block on the shared transport loop), so max_workers caps how many
+# analyses run at once; the transport only shares connections between them.
 ANALYSIS_EXECUTOR = ThreadPoolExecutor(max_workers=10, thread_name_prefix="analysis")
 WEBHOOK_EXECUTOR = ThreadPoolExecutor(max_workers=5, thread_name_prefix="webhook")
 
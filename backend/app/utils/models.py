@@ -4,7 +4,7 @@ Pydantic models for Gun Del Sol API
 All request/response schemas used across the application
 """
 
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Literal, Optional
 
 from pydantic import BaseModel, Field
 
@@ -142,6 +142,7 @@ class AnalysisRun(BaseModel):
     analysis_timestamp: str
     wallets_found: int
     credits_used: int
+    covered_until: Optional[int] = None  # Buyer totals only cover history up to this block time
     wallets: List[Wallet]
 
 
@@ -182,12 +183,16 @@ class WalletTagRequest(BaseModel):
 class AnalysisSettings(BaseModel):
     """API settings for token analysis"""
 
-    transactionLimit: int = Field(default=500, ge=1, le=10000)
+    transactionLimit: int = Field(default=500, ge=1, le=50000)
     minUsdFilter: float = Field(default=50.0, ge=0)
     walletCount: int = Field(default=10, ge=1, le=100)
     apiRateDelay: int = Field(default=100, ge=0)
-    maxCreditsPerAnalysis: int = Field(default=1000, ge=1, le=10000)
+    maxCreditsPerAnalysis: int = Field(default=1000, ge=1, le=50000)
     maxRetries: int = Field(default=3, ge=0, le=10)
+    maxCreditsPerMinute: int = Field(default=0, ge=0)
+    prefetchDepth: int = Field(default=0, ge=0, le=4)
+    columnarParser: bool = False
+    parseWorkers: int = Field(default=0, ge=0, le=32)
 
 
 class AnalyzeTokenRequest(BaseModel):
@@ -197,6 +202,31 @@ class AnalyzeTokenRequest(BaseModel):
     api_settings: Optional[AnalysisSettings] = None
     min_usd: Optional[float] = None
     time_window_hours: int = Field(default=999999, ge=1)
+    # "extend" continues the token's last fetch up to transactionLimit instead of starting over;
+    # "deep" streams up to transactionLimit transactions (no 500 cap) with resumable checkpoints
+    mode: Literal["full", "extend", "deep"] = "full"
+
+
+class RescoreTokenRequest(BaseModel):
+    """Request model for re-scoring a token from its stored transactions"""
+
+    min_usd: Optional[float] = Field(default=None, ge=0)
+    time_window_hours: int = Field(default=999999, ge=1)
+    max_wallets: Optional[int] = Field(default=None, ge=1, le=100)
+
+
+class RescoreTokenResponse(BaseModel):
+    """Response for a zero-credit re-score"""
+
+    token_id: int
+    token_address: str
+    min_usd: float
+    time_window_hours: int
+    max_wallets: int
+    wallets_found: int
+    total_transactions_analyzed: int
+    credits_used: int
+    early_bidders: List[Dict[str, Any]]
 
 
 class AnalysisJob(BaseModel):
@@ -208,6 +238,7 @@ class AnalysisJob(BaseModel):
     created_at: str
     result: Optional[Dict[str, Any]] = None
     error: Optional[str] = None
+    progress: Optional[Dict[str, Any]] = None  # per-page progress of deep analyses
     axiom_file: Optional[str] = None
     result_file: Optional[str] = None
 
@@ -278,12 +309,16 @@ class ImportAddressesRequest(BaseModel):
 
 
 class UpdateSettingsRequest(BaseModel):
-    transactionLimit: Optional[int] = Field(None, ge=1, le=10000)
+    transactionLimit: Optional[int] = Field(None, ge=1, le=50000)
     minUsdFilter: Optional[float] = Field(None, ge=0)
     walletCount: Optional[int] = Field(None, ge=1, le=100)
     apiRateDelay: Optional[int] = Field(None, ge=0)
-    maxCreditsPerAnalysis: Optional[int] = Field(None, ge=1, le=10000)
+    maxCreditsPerAnalysis: Optional[int] = Field(None, ge=1, le=50000)
     maxRetries: Optional[int] = Field(None, ge=0, le=10)
+    maxCreditsPerMinute: Optional[int] = Field(None, ge=0)
+    prefetchDepth: Optional[int] = Field(None, ge=0, le=4)
+    columnarParser: Optional[bool] = None
+    parseWorkers: Optional[int] = Field(None, ge=0, le=32)
 
 
 # ============================================================================
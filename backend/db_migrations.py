@@ -0,0 +1,344 @@
+"""
+Database Migrations
+Numbered schema migrations for the analyzed tokens database
+
+The database's `PRAGMA user_version` records the last migration applied.
+At startup every newer migration runs once, in order, each in its own
+transaction together with the version bump, so a failed migration leaves
+the database at the previous version. On an up-to-date database startup
+costs a single pragma read.
+
+To change the schema, append a function decorated with the next number:
+
+    @migration(3, "Add foo column to analyzed_tokens")
+    def _add_foo(conn):
+        conn.execute("ALTER TABLE analyzed_tokens ADD COLUMN foo TEXT")
+
+Never edit a migration that has shipped; add a new one instead.
+"""
+
+import sqlite3
+from typing import Callable, Dict, Iterable, List, NamedTuple, Tuple
+
+
+class Migration(NamedTuple):
+    """One numbered schema change"""
+
+    version: int
+    description: str
+    apply: Callable[[sqlite3.Connection], None]
+
+
+MIGRATIONS: List[Migration] = []
+
+
+def migration(version: int, description: str):
+    """Register the decorated function as migration `version` (must be the next number)"""
+
+    def register(apply: Callable[[sqlite3.Connection], None]):
+        expected = len(MIGRATIONS) + 1
+        if version != expected:
+            raise ValueError(f"Migration {version} registered out of order (expected {expected})")
+        MIGRATIONS.append(Migration(version, description, apply))
+        return apply
+
+    return register
+
+
+def schema_version(conn: sqlite3.Connection) -> int:
+    """Last migration applied to the database (0 for a new or pre-migration database)"""
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def latest_version() -> int:
+    """Version the registered migrations bring a database to"""
+    return MIGRATIONS[-1].version if MIGRATIONS else 0
+
+
+def apply_migrations(conn: sqlite3.Connection) -> int:
+    """
+    Bring a database up to the latest schema version
+
+    Args:
+        conn: Writable connection (any open transaction is committed first)
+
+    Returns:
+        Number of migrations applied
+    """
+    current = schema_version(conn)
+    pending = [m for m in MIGRATIONS if m.version > current]
+    if not pending:
+        return 0
+
+    if conn.in_transaction:
+        conn.commit()
+    for m in pending:
+        print(f"[Database] Migration {m.version}: {m.description}...")
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            m.apply(conn)
+            conn.execute(f"PRAGMA user_version = {m.version}")
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    print(f"[Database] Schema migrated from version {current} to {pending[-1].version}")
+    return len(pending)
+
+
+# ----------------------------------------------------------------------
+# Helpers
+# ----------------------------------------------------------------------
+
+
+def _table_columns(conn: sqlite3.Connection, table: str) -> List[str]:
+    return [row[1] for row in conn.execute(f"PRAGMA table_info({table})")]
+
+
+def _add_missing_columns(conn: sqlite3.Connection, table: str, columns: Iterable[Tuple[str, str]]):
+    """ALTER TABLE ADD COLUMN for each (name, type) the table doesn't have yet"""
+    existing = _table_columns(conn, table)
+    for column, column_type in columns:
+        if column not in existing:
+            print(f"[Database] Migrating: Adding {column} column to {table}...")
+            conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {column_type}")
+
+
+def _create_indexes(conn: sqlite3.Connection, indexes: Dict[str, str]):
+    for name, target in indexes.items():
+        conn.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {target}")
+
+
+EARLY_BUYER_WALLETS_COLUMNS = (
+    "id",
+    "token_id",
+    "analysis_run_id",
+    "wallet_address",
+    "position",
+    "first_buy_usd",
+    "total_usd",
+    "transaction_count",
+    "average_buy_usd",
+    "first_buy_timestamp",
+    "axiom_name",
+    "wallet_balance_usd",
+)
+
+EARLY_BUYER_WALLETS_SCHEMA = """
+    (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        token_id INTEGER NOT NULL,
+        analysis_run_id INTEGER NOT NULL,
+        wallet_address TEXT NOT NULL,
+        position INTEGER NOT NULL,
+        first_buy_usd REAL,
+        total_usd REAL,
+        transaction_count INTEGER,
+        average_buy_usd REAL,
+        first_buy_timestamp TIMESTAMP,
+        axiom_name TEXT,
+        wallet_balance_usd REAL,
+        FOREIGN KEY (token_id) REFERENCES analyzed_tokens(id) ON DELETE CASCADE,
+        FOREIGN KEY (analysis_run_id) REFERENCES analysis_runs(id) ON DELETE CASCADE,
+        UNIQUE(analysis_run_id, wallet_address)
+    )
+"""
+
+
+# ----------------------------------------------------------------------
+# Migrations
+# ----------------------------------------------------------------------
+
+
+@migration(1, "Baseline schema")
+def _baseline(conn: sqlite3.Connection):
+    """
+    Tables and indexes as of the first versioned release
+
+    Also upgrades databases created before versioning: adds columns that
+    used to be probed at every startup, links pre-run wallets to one
+    analysis run per token, and rebuilds early_buyer_wallets if it still has
+    the old UNIQUE(token_id, wallet_address) constraint (formerly
+    migrate_database.py).
+    """
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS analyzed_tokens (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            token_address TEXT UNIQUE NOT NULL,
+            token_name TEXT,
+            token_symbol TEXT,
+            acronym TEXT,
+            analysis_timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            first_buy_timestamp TIMESTAMP,
+            wallets_found INTEGER DEFAULT 0,
+            axiom_json TEXT,
+            webhook_id TEXT,
+            credits_used INTEGER DEFAULT 0,
+            last_analysis_credits INTEGER DEFAULT 0,
+            is_deleted BOOLEAN DEFAULT 0,
+            deleted_at TIMESTAMP,
+            analysis_file_path TEXT,
+            axiom_file_path TEXT
+        )
+    """)
+
+    # Analysis runs table - tracks each time we analyze a token
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS analysis_runs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            token_id INTEGER NOT NULL,
+            analysis_timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            wallets_found INTEGER DEFAULT 0,
+            credits_used INTEGER DEFAULT 0,
+            pagination_cursor TEXT,
+            last_slot INTEGER,
+            last_block_time INTEGER,
+            transactions_fetched INTEGER,
+            FOREIGN KEY (token_id) REFERENCES analyzed_tokens(id) ON DELETE CASCADE
+        )
+    """)
+
+    conn.execute(f"CREATE TABLE IF NOT EXISTS early_buyer_wallets {EARLY_BUYER_WALLETS_SCHEMA}")
+
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS wallet_activity (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            wallet_id INTEGER NOT NULL,
+            transaction_signature TEXT UNIQUE,
+            timestamp TIMESTAMP,
+            activity_type TEXT,
+            description TEXT,
+            sol_amount REAL,
+            token_amount REAL,
+            recipient_address TEXT,
+            FOREIGN KEY (wallet_id) REFERENCES early_buyer_wallets(id) ON DELETE CASCADE
+        )
+    """)
+
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS wallet_tags (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            wallet_address TEXT NOT NULL,
+            tag TEXT NOT NULL,
+            is_kol BOOLEAN DEFAULT 0,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            UNIQUE(wallet_address, tag)
+        )
+    """)
+
+    # Columns added after the tables first shipped
+    _add_missing_columns(
+        conn,
+        "analyzed_tokens",
+        (("credits_used", "INTEGER DEFAULT 0"), ("last_analysis_credits", "INTEGER DEFAULT 0")),
+    )
+    _add_missing_columns(
+        conn,
+        "early_buyer_wallets",
+        (
+            ("total_usd", "REAL"),
+            ("transaction_count", "INTEGER"),
+            ("average_buy_usd", "REAL"),
+            ("wallet_balance_usd", "REAL"),
+            ("analysis_run_id", "INTEGER"),
+        ),
+    )
+    _add_missing_columns(
+        conn,
+        "analysis_runs",
+        (
+            ("pagination_cursor", "TEXT"),
+            ("last_slot", "INTEGER"),
+            ("last_block_time", "INTEGER"),
+            ("transactions_fetched", "INTEGER"),
+        ),
+    )
+    _add_missing_columns(conn, "wallet_tags", (("is_kol", "BOOLEAN DEFAULT 0"),))
+
+    # Wallets saved before analysis runs existed: one run per token, dated like the token
+    created = conn.execute("""
+        INSERT INTO analysis_runs (token_id, analysis_timestamp, wallets_found, credits_used)
+        SELECT id, analysis_timestamp, COALESCE(wallets_found, 0), COALESCE(last_analysis_credits, 0)
+        FROM analyzed_tokens
+        WHERE id IN (SELECT token_id FROM early_buyer_wallets WHERE analysis_run_id IS NULL)
+    """).rowcount
+    if created:
+        conn.execute("""
+            UPDATE early_buyer_wallets
+            SET analysis_run_id = (
+                SELECT MAX(ar.id) FROM analysis_runs ar WHERE ar.token_id = early_buyer_wallets.token_id
+            )
+            WHERE analysis_run_id IS NULL
+        """)
+        print(f"[Database] Migrating: Linked existing wallets to {created} analysis runs")
+
+    # UNIQUE(token_id, wallet_address) blocked re-analysis: rebuild with UNIQUE(analysis_run_id, wallet_address)
+    table_sql = conn.execute("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'early_buyer_wallets'")
+    if "UNIQUE(token_id, wallet_address)" in table_sql.fetchone()[0]:
+        print("[Database] Migrating: Rebuilding early_buyer_wallets with per-run uniqueness...")
+        columns = ", ".join(EARLY_BUYER_WALLETS_COLUMNS)
+        conn.execute(f"CREATE TABLE early_buyer_wallets_new {EARLY_BUYER_WALLETS_SCHEMA}")
+        copied = conn.execute(
+            f"INSERT INTO early_buyer_wallets_new ({columns}) SELECT {columns} FROM early_buyer_wallets"
+            " WHERE analysis_run_id IS NOT NULL"  # orphans of deleted tokens never got a run
+        ).rowcount
+        print(f"[Database] Migrating: Copied {copied} wallet records")
+        conn.execute("DROP TABLE early_buyer_wallets")
+        conn.execute("ALTER TABLE early_buyer_wallets_new RENAME TO early_buyer_wallets")
+
+    _create_indexes(
+        conn,
+        {
+            "idx_token_address": "analyzed_tokens(token_address)",
+            "idx_wallet_address": "early_buyer_wallets(wallet_address)",
+            "idx_activity_timestamp": "wallet_activity(timestamp DESC)",
+            "idx_wallet_tags_address": "wallet_tags(wallet_address)",
+            "idx_is_deleted_timestamp": "analyzed_tokens(is_deleted, analysis_timestamp DESC)",
+            "idx_token_analysis_run": "early_buyer_wallets(token_id, analysis_run_id)",
+            "idx_analysis_runs_token_timestamp": "analysis_runs(token_id, analysis_timestamp DESC)",
+            "idx_wallet_tags_tag": "wallet_tags(tag)",
+        },
+    )
+
+
+@migration(2, "Index early buyer wallets by run and position")
+def _run_position_index(conn: sqlite3.Connection):
+    # Covers the token list's wallet lookup (a run's wallets in ranking order)
+    _create_indexes(
+        conn, {"idx_early_buyer_wallets_run_position": "early_buyer_wallets(analysis_run_id, position, wallet_address)"}
+    )
+
+
+@migration(3, "Add wallet_rollup table")
+def _wallet_rollup(conn: sqlite3.Connection):
+    # One row per wallet: active (not soft-deleted) tokens it was an early buyer of, and its latest balance on them.
+    # Filled and maintained by analyzed_tokens_db.refresh_wallet_rollup in the transactions that change them
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS wallet_rollup (
+            wallet_address TEXT PRIMARY KEY,
+            token_count INTEGER NOT NULL,
+            token_ids TEXT NOT NULL,
+            wallet_balance_usd REAL
+        ) WITHOUT ROWID
+    """)
+    _create_indexes(conn, {"idx_wallet_rollup_count": "wallet_rollup(token_count DESC, wallet_balance_usd DESC)"})
+
+    # analyzed_tokens_db imports this module, so import its rollup query here
+    from analyzed_tokens_db import refresh_wallet_rollup
+
+    refresh_wallet_rollup(conn)
+
+
+@migration(4, "Add covered_until to analysis_runs")
+def _run_coverage(conn: sqlite3.Connection):
+    # Block time an early-stopped fetch covered buyer totals up to (NULL when they are complete)
+    _add_missing_columns(conn, "analysis_runs", (("covered_until", "INTEGER"),))
+
+
+@migration(5, "Rebuild wallet_rollup balances from active tokens only")
+def _rollup_active_balances(conn: sqlite3.Connection):
+    # Balances used to be taken from soft-deleted tokens' runs too
+    from analyzed_tokens_db import refresh_wallet_rollup
+
+    refresh_wallet_rollup(conn)
@@ -0,0 +1,347 @@
+"""
+SQLite Connection Pool
+Persistent connections to the analyzed tokens database, shared by sync and async code
+
+Each database file gets one writer connection and a small pool of read-only
+reader connections, opened once and reused instead of connecting per call.
+Every connection runs in WAL mode with tuned pragmas, so readers never wait
+behind an analysis writing its results (and vice versa); writes serialize on
+the single writer.
+
+- Sync helpers (analyzed_tokens_db, executor threads): `with pool.writer() as conn`
+  / `with pool.reader() as conn`
+- Async routers: `async with pool.writer_async() as conn` / `pool.reader_async()`,
+  which hand out the same pooled connections behind an awaitable facade
+  (statements run in a worker thread, like aiosqlite)
+
+Async checkouts wait on event loop futures, never in a worker thread: a
+waiter parked in the executor would hold a thread that the current holder
+needs to run its statements and release the connection.
+"""
+
+import asyncio
+import atexit
+import queue
+import sqlite3
+import threading
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+# Reader connections per database file
+READER_CONNECTIONS = 4
+
+# Applied to every pooled connection
+PRAGMAS = (
+    ("journal_mode", "WAL"),  # readers don't block the writer and vice versa
+    ("synchronous", "NORMAL"),  # fsync at checkpoints only (safe with WAL)
+    ("cache_size", -32000),  # ~32 MiB page cache per connection
+    ("mmap_size", 268435456),  # read through a 256 MiB memory map
+    ("temp_store", "MEMORY"),
+    ("busy_timeout", 30000),
+)
+
+
+class AsyncCursor:
+    """Awaitable view of a sqlite3 cursor"""
+
+    def __init__(self, cursor: sqlite3.Cursor):
+        self._cursor = cursor
+
+    @property
+    def rowcount(self) -> int:
+        return self._cursor.rowcount
+
+    @property
+    def lastrowid(self) -> Optional[int]:
+        return self._cursor.lastrowid
+
+    async def fetchone(self) -> Optional[sqlite3.Row]:
+        return await asyncio.to_thread(self._cursor.fetchone)
+
+    async def fetchall(self) -> List[sqlite3.Row]:
+        return await asyncio.to_thread(self._cursor.fetchall)
+
+
+class AsyncConnection:
+    """Awaitable view of a pooled connection (same calls the routers made on aiosqlite)"""
+
+    def __init__(self, conn: sqlite3.Connection):
+        self._conn = conn
+
+    async def execute(self, sql: str, parameters: Iterable[Any] = ()) -> AsyncCursor:
+        return AsyncCursor(await asyncio.to_thread(self._conn.execute, sql, parameters))
+
+    async def executemany(self, sql: str, parameters: Iterable[Iterable[Any]]) -> AsyncCursor:
+        return AsyncCursor(await asyncio.to_thread(self._conn.executemany, sql, parameters))
+
+    async def commit(self):
+        await asyncio.to_thread(self._conn.commit)
+
+    async def run_sync(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Run a sync helper taking a sqlite3 connection (e.g. analyzed_tokens_db's) on this connection"""
+        return await asyncio.to_thread(fn, self._conn, *args)
+
+
+class _AsyncWaiters:
+    """Event loop futures waiting for a pooled connection that any thread may release"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._waiters: "deque[asyncio.Future]" = deque()
+
+    def add(self) -> asyncio.Future:
+        future = asyncio.get_running_loop().create_future()
+        with self._lock:
+            self._waiters.append(future)
+        return future
+
+    def discard(self, future: asyncio.Future):
+        with self._lock:
+            try:
+                self._waiters.remove(future)
+            except ValueError:
+                pass
+
+    def wake_one(self):
+        """Wake the oldest waiter (called after a release, from any thread)"""
+        with self._lock:
+            while self._waiters:
+                future = self._waiters.popleft()
+                loop = future.get_loop()
+                if not loop.is_closed():
+                    loop.call_soon_threadsafe(self._resolve, future)
+                    return
+
+    def _resolve(self, future: asyncio.Future):
+        if future.done():
+            # Cancelled after it was picked - pass the wakeup on
+            self.wake_one()
+        else:
+            future.set_result(None)
+
+
+async def _checkout_async(try_acquire: Callable[[], Optional[sqlite3.Connection]], waiters: _AsyncWaiters):
+    """Check out a connection without blocking the event loop or holding a worker thread while waiting"""
+    while True:
+        conn = try_acquire()
+        if conn is not None:
+            return conn
+
+        future = waiters.add()
+        try:
+            # Retry once registered, in case the release happened in between
+            conn = try_acquire()
+            if conn is not None:
+                return conn
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                waiters.wake_one()
+            raise
+        finally:
+            waiters.discard(future)
+
+
+class SQLitePool:
+    """One writer and READER_CONNECTIONS readers for a database file"""
+
+    def __init__(self, db_path: str, readers: int = READER_CONNECTIONS):
+        """
+        Args:
+            db_path: SQLite database file
+            readers: Maximum reader connections
+        """
+        self.db_path = db_path
+        self.max_readers = readers
+        self._writer: Optional[sqlite3.Connection] = None
+        self._write_lock = threading.Lock()  # plain Lock: async checkouts release it from another thread
+        self._write_owner: Optional[int] = None
+        self._write_depth = 0
+        self._write_waiters = _AsyncWaiters()
+        self._readers: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._reader_count = 0
+        self._all_readers: List[sqlite3.Connection] = []
+        self._readers_lock = threading.Lock()
+        self._read_waiters = _AsyncWaiters()
+
+    def _open(self, read_only: bool) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+        conn.row_factory = sqlite3.Row  # Enable dict-like access
+        for name, value in PRAGMAS:
+            conn.execute(f"PRAGMA {name}={value}")
+        if read_only:
+            conn.execute("PRAGMA query_only=ON")
+        return conn
+
+    # ------------------------------------------------------------------
+    # Writer
+    # ------------------------------------------------------------------
+
+    def _acquire_writer(self, owner: Optional[int] = None, blocking: bool = True) -> Optional[sqlite3.Connection]:
+        if not self._write_lock.acquire(blocking=blocking):
+            return None
+        self._write_owner = owner
+        self._write_depth = 1
+        if self._writer is None:
+            self._writer = self._open(read_only=False)
+        return self._writer
+
+    def _release_writer(self, conn: sqlite3.Connection):
+        self._write_owner = None
+        self._write_depth = 0
+        self._write_lock.release()
+        self._write_waiters.wake_one()
+
+    @staticmethod
+    def _finish(conn: sqlite3.Connection, failed: bool):
+        if failed:
+            conn.rollback()
+        else:
+            conn.commit()
+
+    @contextmanager
+    def writer(self):
+        """
+        Check out the writer connection (commits on success, rolls back on error)
+
+        Nested use on the same thread shares the outer transaction.
+        """
+        thread_id = threading.get_ident()
+        if self._write_owner == thread_id:
+            self._write_depth += 1
+            try:
+                yield self._writer
+            finally:
+                self._write_depth -= 1
+            return
+
+        conn = self._acquire_writer(owner=thread_id)
+        try:
+            yield conn
+            self._finish(conn, failed=False)
+        except BaseException:
+            self._finish(conn, failed=True)
+            raise
+        finally:
+            self._release_writer(conn)
+
+    @asynccontextmanager
+    async def writer_async(self):
+        """Async variant of writer() (waits for the writer without blocking the event loop)"""
+        conn = await _checkout_async(lambda: self._acquire_writer(blocking=False), self._write_waiters)
+        try:
+            yield AsyncConnection(conn)
+            await asyncio.to_thread(self._finish, conn, False)
+        except BaseException:
+            await asyncio.shield(asyncio.to_thread(self._finish, conn, True))
+            raise
+        finally:
+            self._release_writer(conn)
+
+    # ------------------------------------------------------------------
+    # Readers
+    # ------------------------------------------------------------------
+
+    def _acquire_reader(self, blocking: bool = True) -> Optional[sqlite3.Connection]:
+        try:
+            return self._readers.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._readers_lock:
+            if self._reader_count < self.max_readers:
+                self._reader_count += 1
+                conn = self._open(read_only=True)
+                self._all_readers.append(conn)
+                return conn
+
+        if not blocking:
+            return None
+        return self._readers.get()
+
+    def _release_reader(self, conn: sqlite3.Connection):
+        if conn.in_transaction:
+            conn.rollback()
+        self._readers.put(conn)
+        self._read_waiters.wake_one()
+
+    @contextmanager
+    def reader(self):
+        """Check out a read-only connection (never waits for the writer)"""
+        conn = self._acquire_reader()
+        try:
+            yield conn
+        finally:
+            self._release_reader(conn)
+
+    @asynccontextmanager
+    async def reader_async(self):
+        """Async variant of reader()"""
+        conn = await _checkout_async(lambda: self._acquire_reader(blocking=False), self._read_waiters)
+        try:
+            yield AsyncConnection(conn)
+        finally:
+            self._release_reader(conn)
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def close(self):
+        """Close every connection (checkpoints the WAL when the last one closes)"""
+        with self._readers_lock:
+            for conn in self._all_readers:
+                conn.close()
+            self._all_readers.clear()
+            self._reader_count = 0
+            self._readers = queue.LifoQueue()
+        with self._write_lock:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+
+
+# Pools keyed by database file (process-wide)
+_pools: Dict[str, SQLitePool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(db_path: str) -> SQLitePool:
+    """
+    Get the shared connection pool for a database file
+
+    Args:
+        db_path: SQLite database file
+
+    Returns:
+        SQLitePool shared by every caller using this file
+    """
+    pool = _pools.get(db_path)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.get(db_path)
+            if pool is None:
+                pool = SQLitePool(db_path)
+                _pools[db_path] = pool
+    return pool
+
+
+def close_pool(db_path: str):
+    """Close and forget the pool of one database file"""
+    with _pools_lock:
+        pool = _pools.pop(db_path, None)
+    if pool is not None:
+        pool.close()
+
+
+def close_pools():
+    """Close every pool (application shutdown / interpreter exit)"""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close()
+
+
+atexit.register(close_pools)
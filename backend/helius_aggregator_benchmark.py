@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Aggregation Benchmark for Early Bidder Scoring
+Compares the previous dict-of-dicts buyer map against EarlyBidderAggregator
+
+Transactions are synthetic parsed transactions where most buys come from a
+new wallet, so the buyer map grows with the transaction count, like a deep
+scan of a busy launch. Buy extraction and the on-curve check are stubbed
+out, so only the aggregation itself is measured.
+Run from the backend directory: python helius_aggregator_benchmark.py
+"""
+
+import random
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+from helius_api import EarlyBidderAggregator, lamports_to_usd
+from helius_tx_store import BuyRecord
+
+SIZES = (10_000, 100_000)
+ROUNDS = 5
+MIN_USD = 50.0
+TIME_WINDOW_HOURS = 999999
+
+
+class StubHelius:
+    """Stands in for HeliusAPI: buys are precomputed on the fake transactions"""
+
+    def _extract_buy_info(self, tx: dict, mint_address: str, debug_first: bool = False) -> tuple:
+        return tx["buyer"], lamports_to_usd(tx["lamports"])
+
+    def is_wallet_on_curve(self, wallet_address: str) -> bool:
+        return True
+
+
+def fake_transactions(count: int, seed: int = 0) -> list:
+    rng = random.Random(seed)
+    wallets = [f"{rng.getrandbits(256):064x}" for _ in range(int(count * 0.8))]
+    return [
+        {
+            "signature": f"sig{i}",
+            "timestamp": 1_700_000_000 + i // 4,
+            "buyer": wallets[i] if i < len(wallets) else rng.choice(wallets),
+            "lamports": rng.randrange(50_000_000, 2_500_000_000),
+        }
+        for i in range(count)
+    ]
+
+
+class LegacyAggregator(EarlyBidderAggregator):
+    """The previous aggregation: a datetime per transaction and a dict per buyer"""
+
+    def reset(self):
+        super().reset()
+        self.first_tx_time = None
+        self.window_end = None
+
+    def add_transactions(self, transactions: list):
+        for tx in transactions:
+            self.transactions_seen += 1
+            if not tx.get("timestamp"):
+                continue
+
+            tx_time = datetime.utcfromtimestamp(tx["timestamp"])
+            if self.first_tx_time is None:
+                self.first_tx_time = tx_time
+                self.window_end = tx_time + timedelta(hours=self.time_window_hours)
+
+            self.total_checked += 1
+            if tx_time > self.window_end:
+                self.window_closed = True
+                continue
+
+            self.within_window += 1
+            buyer_wallet, usd_amount = self.helius._extract_buy_info(
+                tx, self.mint_address, debug_first=not self.debug_first_done
+            )
+            if not self.debug_first_done:
+                self.debug_first_done = True
+
+            if buyer_wallet and usd_amount:
+                self.has_buyer += 1
+                if not self.helius.is_wallet_on_curve(buyer_wallet):
+                    continue
+
+                if usd_amount >= self.min_usd:
+                    self.meets_threshold += 1
+                    if buyer_wallet not in self.buyers:
+                        self.buyers[buyer_wallet] = {
+                            "wallet_address": buyer_wallet,
+                            "first_buy_time": tx_time,
+                            "total_usd": 0.0,
+                            "transaction_count": 0,
+                        }
+
+                    buyer = self.buyers[buyer_wallet]
+                    buyer["total_usd"] += usd_amount
+                    buyer["transaction_count"] += 1
+                    if tx_time < buyer["first_buy_time"]:
+                        buyer["first_buy_time"] = tx_time
+
+
+def legacy_aggregate(helius: StubHelius, transactions: list) -> EarlyBidderAggregator:
+    aggregator = LegacyAggregator(helius, "mint", MIN_USD, TIME_WINDOW_HOURS, max_wallets_to_store=10**9)
+    aggregator.add_transactions(transactions)
+    return aggregator
+
+
+def compact_aggregate(helius: StubHelius, transactions: list) -> EarlyBidderAggregator:
+    aggregator = EarlyBidderAggregator(helius, "mint", MIN_USD, TIME_WINDOW_HOURS, max_wallets_to_store=10**9)
+    aggregator.add_transactions(transactions)
+    return aggregator
+
+
+def measure(name: str, transactions: list, aggregate) -> None:
+    """Print mean aggregation time and peak/retained memory for one implementation"""
+    helius = StubHelius()
+    started = time.perf_counter()
+    for _ in range(ROUNDS):
+        aggregate(helius, transactions)
+    elapsed = (time.perf_counter() - started) / ROUNDS * 1000
+
+    tracemalloc.start()
+    result = aggregate(helius, transactions)
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+
+    print(f"  {name:<22} {elapsed:9.2f} ms   peak {peak / 2**20:7.2f} MiB   retained {retained / 2**20:7.2f} MiB")
+
+
+def main():
+    print("=" * 80)
+    print("Early bidder aggregation benchmark (buy extraction stubbed)")
+    print("=" * 80)
+
+    for size in SIZES:
+        transactions = fake_transactions(size)
+        print(f"\n{size:,} transactions")
+        measure("dict of dicts", transactions, legacy_aggregate)
+        # The fetch pipeline hands the aggregator BuyRecords
+        records = [BuyRecord(tx["signature"], tx["timestamp"], tx["buyer"], tx["lamports"]) for tx in transactions]
+        measure("EarlyBidderAggregator", records, compact_aggregate)
+
+
+if __name__ == "__main__":
+    main()
@@ -5,19 +5,31 @@ Provides functions to analyze tokens and extract early bidder data
 
 from __future__ import annotations
 
+import asyncio
 import os
+import queue
 import re
 import sys
+import threading
+import time
+from collections import deque
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, Union
 
-import base58
-import requests
+import orjson
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
 import builtins
 
 from debug_config import is_debug_enabled
+from helius_batch_parser import NUMPY_AVAILABLE, parse_transaction_page
+from helius_checkpoints import DeepAnalysisCheckpointStore, get_checkpoint_store
+from helius_creation_times import CreationTimeStore, get_creation_time_store
+from helius_curve import is_on_curve
+from helius_page_cache import TransactionPageCache, get_page_cache
+from helius_parse_pool import ParsedPage, get_parse_pool
+from helius_transport import HELIUS_API_URL, HELIUS_RPC_URL, HeliusKeyPool, HeliusTransport, get_transport
+from helius_tx_store import BuyRecord, ParsedTransactionStore, buy_records, get_tx_store
 
 # ============================================================================
 # OPSEC: PRODUCTION MODE - Disable Sensitive Logging
@@ -36,33 +48,352 @@ def safe_print(*args, **kwargs):
 print = safe_print
 # ============================================================================
 
+# getMultipleAccounts accepts at most 100 pubkeys per call
+MAX_ACCOUNTS_PER_BATCH = 100
+
+# Helius credit cost per RPC method (anything not listed costs 1 credit)
+RPC_CREDIT_COSTS = {"getTransactionsForAddress": 100}
+
+# getSignaturesForAddress page size (max allowed by Solana RPC, 1 credit per call)
+SIGNATURE_PAGE_SIZE = 1000
+
+# getTransaction requests per JSON-RPC batch, and batches in flight per fetch
+TRANSACTION_BATCH_SIZE = 50
+MAX_CONCURRENT_TRANSACTION_BATCHES = 4
+
+# Creation time lookups walk at most this many signature pages (10 credits vs 100 for one transaction page)
+CREATION_LOOKUP_MAX_CALLS = 10
+
+# Transaction meta fields the parser never reads (the bulk of a full-detail page)
+UNPARSED_META_FIELDS = ("logMessages", "innerInstructions", "rewards")
+
+# Earliest-transaction fetch caps: regular analyses keep every parsed transaction in memory,
+# deep analyses stream pages through the aggregator and keep none
+MAX_TRANSACTIONS_PER_FETCH = 500
+DEEP_MAX_TRANSACTIONS = 50_000
+
+
+def lamports_to_usd(lamports: int) -> float:
+    """Convert lamports to USD (1 SOL = 1,000,000,000 lamports, 1 SOL ≈ $200 USD)"""
+    return lamports / 1_000_000_000 * 200
+
+
+def new_fetch_cursor(resume_cursor: Optional[Dict] = None) -> Dict:
+    """
+    Start a fetch cursor, continuing from an earlier run's cursor if given.
+
+    A fetch cursor records where an earliest-transactions fetch stopped, so a
+    later run can fetch only what comes after it:
+        pagination_token: getTransactionsForAddress token for the next page (None at end of history)
+        last_slot / last_block_time: slot and blockTime of the newest transaction fetched
+        boundary_signatures: signatures fetched at last_block_time, skipped when resuming by blockTime
+        transactions_fetched: raw transactions fetched so far, across resumed runs
+    """
+    cursor = {
+        "pagination_token": None,
+        "last_slot": None,
+        "last_block_time": None,
+        "boundary_signatures": [],
+        "transactions_fetched": 0,
+    }
+    if resume_cursor:
+        cursor.update({key: resume_cursor.get(key) for key in cursor})
+        cursor["transactions_fetched"] = cursor["transactions_fetched"] or 0
+        cursor["boundary_signatures"] = list(cursor["boundary_signatures"] or [])
+    return cursor
+
+
+def strip_unparsed_fields(result: Optional[Dict]) -> Optional[Dict]:
+    """
+    Drop transaction meta fields the parser never reads from a getTransactionsForAddress result.
+
+    Log messages and inner instructions make up most of a full-detail page;
+    dropping them right after decoding frees them before parsing, keeps
+    prefetched pages small and shrinks what the page cache stores and replays.
+    This only reduces what is retained: orjson has no selective decode, so a
+    fresh response is still decoded in full before the fields are deleted.
+    Only pages replayed from the page cache skip decoding them.
+
+    Args:
+        result: Decoded RPC result (modified in place)
+
+    Returns:
+        The same result
+    """
+    if not isinstance(result, dict):
+        return result
+    for tx_data in result.get("data") or []:
+        meta = tx_data.get("meta") if isinstance(tx_data, dict) else None
+        if isinstance(meta, dict):
+            for field in UNPARSED_META_FIELDS:
+                meta.pop(field, None)
+    return result
+
+
+class EarlyBuyer:
+    """Running totals of one qualifying buyer (slotted: deep analyses can track tens of thousands)"""
+
+    __slots__ = ("wallet_address", "first_buy", "total_usd", "transaction_count")
+
+    def __init__(self, wallet_address: str, first_buy: int, total_usd: float = 0.0, transaction_count: int = 0):
+        self.wallet_address = wallet_address
+        self.first_buy = first_buy  # Unix timestamp, converted to a datetime only in the result
+        self.total_usd = total_usd
+        self.transaction_count = transaction_count
+
+
+class EarlyBidderAggregator:
+    """
+    Incremental early bidder scoring over transactions fed oldest first.
+
+    Lets the transaction fetch stop paginating as soon as the earliest
+    max_wallets qualifying buyers are known: with ascending transactions a
+    later page can only add buyers whose first buy is no earlier than the ones
+    already found.
+
+    Times are kept as integer Unix timestamps while scoring; datetimes are only
+    built for the ranked result.
+    """
+
+    def __init__(
+        self,
+        helius: "HeliusAPI",
+        mint_address: str,
+        min_usd: float = 50.0,
+        time_window_hours: int = 999999,
+        max_wallets_to_store: int = 10,
+    ):
+        self.helius = helius
+        self.mint_address = mint_address
+        self.min_usd = min_usd
+        self.time_window_hours = time_window_hours
+        self.max_wallets = max_wallets_to_store or 10  # Default to 10 if not specified
+        self.reset()
+
+    def reset(self):
+        """Discard everything seen so far"""
+        self.first_timestamp = None
+        self.window_end_timestamp = None
+        self.window_closed = False
+        self.buyers: Dict[str, EarlyBuyer] = {}
+
+        # Debug: Track what we're seeing
+        self.transactions_seen = 0
+        self.total_checked = 0
+        self.within_window = 0
+        self.has_buyer = 0
+        self.meets_threshold = 0
+        self.debug_first_done = False
+
+    def state(self) -> Dict:
+        """Snapshot of the scoring state (JSON-serializable, for deep analysis checkpoints)"""
+        return {
+            "first_timestamp": self.first_timestamp,
+            "window_closed": self.window_closed,
+            "buyers": [
+                [buyer.wallet_address, buyer.first_buy, buyer.total_usd, buyer.transaction_count]
+                for buyer in self.buyers.values()
+            ],
+            "counts": {
+                "transactions_seen": self.transactions_seen,
+                "total_checked": self.total_checked,
+                "within_window": self.within_window,
+                "has_buyer": self.has_buyer,
+                "meets_threshold": self.meets_threshold,
+            },
+        }
+
+    def restore(self, state: Dict):
+        """Continue from a state() snapshot taken with the same scoring parameters"""
+        self.reset()
+        if state.get("first_timestamp") is not None:
+            self.first_timestamp = state["first_timestamp"]
+            self.window_end_timestamp = self.first_timestamp + self.time_window_hours * 3600
+        self.window_closed = state.get("window_closed", False)
+        for wallet_address, first_buy, total_usd, transaction_count in state.get("buyers", []):
+            self.buyers[wallet_address] = EarlyBuyer(wallet_address, first_buy, total_usd, transaction_count)
+        for name, value in state.get("counts", {}).items():
+            setattr(self, name, value)
+        self.debug_first_done = self.transactions_seen > 0
+
+    @property
+    def settled(self) -> bool:
+        """
+        True once no later transaction can change which wallets are the earliest buyers
+
+        Only the ranking is final at that point: while the window is still open,
+        later buys keep adding to the buyers' totals and transaction counts, so
+        the transactions seen so far only cover history up to the last one.
+        """
+        return self.window_closed or len(self.buyers) >= self.max_wallets
+
+    def add_transactions(self, transactions: List[Union[Dict, BuyRecord]]):
+        """
+        Score a batch of transactions (must continue in chronological order)
+
+        Args:
+            transactions: BuyRecords (as handed over by the fetch pipeline and the
+                          transaction store) or parsed transactions
+        """
+        if not self.debug_first_done and transactions:
+            self.debug_first_done = True
+            if isinstance(transactions[0], dict) and is_debug_enabled():
+                self.helius._extract_buy_info(transactions[0], self.mint_address, debug_first=True)
+
+        buyers = self.buyers
+        min_usd = self.min_usd
+        is_wallet_on_curve = self.helius.is_wallet_on_curve
+        total_checked = within_window = has_buyer = meets_threshold = 0
+        records = transactions
+        if transactions and not isinstance(transactions[0], BuyRecord):
+            # Direct callers pass parsed transactions; pipeline pages and stored sets are already records
+            records = buy_records(transactions, self.mint_address)
+        for record in records:
+            tx_time = record.timestamp
+            if not tx_time:
+                continue
+
+            # The first timestamped transaction anchors the analysis window
+            if self.first_timestamp is None:
+                self.first_timestamp = tx_time
+                self.window_end_timestamp = tx_time + self.time_window_hours * 3600
+                print(
+                    f"[Helius] Analysis window: {datetime.utcfromtimestamp(tx_time)} to "
+                    f"{datetime.utcfromtimestamp(tx_time) + timedelta(hours=self.time_window_hours)}"
+                )
+
+            total_checked += 1
+
+            # Skip transactions outside time window
+            if tx_time > self.window_end_timestamp:
+                self.window_closed = True
+                continue
+
+            within_window += 1
+            buyer_wallet = record.buyer
+            if not buyer_wallet:
+                continue
+            has_buyer += 1
+
+            # CRITICAL: Only include on-curve wallets (wallets that can sign transactions)
+            if not is_wallet_on_curve(buyer_wallet):
+                continue
+
+            usd_amount = lamports_to_usd(record.lamports)
+            if usd_amount >= min_usd:
+                meets_threshold += 1
+
+                buyer = buyers.get(buyer_wallet)
+                if buyer is None:
+                    buyer = buyers[buyer_wallet] = EarlyBuyer(buyer_wallet, tx_time)
+
+                buyer.total_usd += usd_amount
+                buyer.transaction_count += 1
+
+                # Keep earliest buy time
+                if tx_time < buyer.first_buy:
+                    buyer.first_buy = tx_time
+
+        self.transactions_seen += len(transactions)
+        self.total_checked += total_checked
+        self.within_window += within_window
+        self.has_buyer += has_buyer
+        self.meets_threshold += meets_threshold
+
+    def result(self) -> Dict:
+        """
+        Rank the buyers seen so far.
+
+        Returns:
+            Dictionary with 'first_transaction_time', 'analysis_window_end' (datetimes)
+            and 'early_bidders', or {'error': str} if no timestamp was seen
+        """
+        if self.first_timestamp is None:
+            return {"error": "Could not determine first transaction time"}
+
+        print(
+            f"[Helius] Debug: Checked {self.total_checked} txs, {self.within_window} in window, {self.has_buyer} with buyers, {self.meets_threshold} meeting threshold"
+        )
+
+        # Sort on the integer timestamps (earliest buyers first), datetimes only for the kept wallets
+        ranked = sorted(self.buyers.values(), key=lambda buyer: buyer.first_buy)
+
+        print(f"[Helius] Found {len(ranked)} early bidders (>${self.min_usd} USD)")
+
+        # Limit to max_wallets BEFORE fetching balances to save API credits
+        if len(ranked) > self.max_wallets:
+            print(f"[Helius] Limiting to top {self.max_wallets} earliest wallets (from {len(ranked)} total)")
+            ranked = ranked[: self.max_wallets]
+
+        early_bidders = [
+            {
+                "wallet_address": buyer.wallet_address,
+                "first_buy_time": datetime.utcfromtimestamp(buyer.first_buy),
+                "total_usd": buyer.total_usd,
+                "transaction_count": buyer.transaction_count,
+                "average_buy_usd": buyer.total_usd / buyer.transaction_count,
+            }
+            for buyer in ranked
+        ]
+
+        first_tx_time = datetime.utcfromtimestamp(self.first_timestamp)
+        return {
+            "first_transaction_time": first_tx_time,
+            "analysis_window_end": first_tx_time + timedelta(hours=self.time_window_hours),
+            "early_bidders": early_bidders,
+        }
+
 
 class HeliusAPI:
     """Wrapper for Helius RPC and Enhanced API endpoints"""
 
-    def __init__(self, api_key: str):
-        self.api_key = api_key
-        self.rpc_url = f"https://mainnet.helius-rpc.com/?api-key={api_key}"
-        self.enhanced_url = "https://api.helius.xyz/v0"
-        self.session = requests.Session()
-        self.session.headers.update({"Content-Type": "application/json"})
+    def __init__(
+        self,
+        api_key: Union[str, HeliusKeyPool],
+        transport: Optional[HeliusTransport] = None,
+        page_cache: Optional[TransactionPageCache] = None,
+        tx_store: Optional[ParsedTransactionStore] = None,
+        columnar_parser: bool = False,
+        parse_workers: int = 0,
+        creation_times: Optional[CreationTimeStore] = None,
+        checkpoints: Optional[DeepAnalysisCheckpointStore] = None,
+    ):
+        if isinstance(api_key, HeliusKeyPool):
+            # The transport picks a key from the pool per request and adds it as the api-key param
+            self.key_pool = api_key
+            self.api_key = api_key.primary_key
+            self.rpc_url = HELIUS_RPC_URL
+        else:
+            self.key_pool = None
+            self.api_key = api_key
+            self.rpc_url = f"{HELIUS_RPC_URL}?api-key={api_key}"
+        # What requests are billed to: the single key, or the pool
+        self.billing_key = self.key_pool or self.api_key
+        self.enhanced_url = HELIUS_API_URL
+        # Shared process-wide connection pool (HTTP/2 keep-alive across analyses)
+        self.transport = transport or get_transport()
+        # Persistent cache of immutable getTransactionsForAddress pages
+        self.page_cache = page_cache or get_page_cache()
+        # Parsed transactions behind each analysis (for zero-credit re-scoring)
+        self.tx_store = tx_store or get_tx_store()
+        # First-transaction time per mint (resolved once per token)
+        self.creation_times = creation_times or get_creation_time_store()
+        # Progress of interrupted deep analyses
+        self.checkpoints = checkpoints or get_checkpoint_store()
+        # Parse transaction pages with the NumPy columnar parser (same results as the dict path)
+        self.columnar_parser = columnar_parser and NUMPY_AVAILABLE
+        # Decode/parse transaction pages in worker processes (None = in the calling thread)
+        self.parse_pool = get_parse_pool(parse_workers)
         self.api_credits_used = 0  # Track API credits used
+        self.last_fetch_stats = None  # Page counts and fetch/prefetch timings of the last transaction fetch
 
     def is_wallet_on_curve(self, wallet_address: str) -> bool:
         """
         Check if a wallet address is on-curve using Solana's PublicKey validation.
         On-curve addresses are valid ed25519 curve points that can sign transactions.
+        Results are cached process-wide (see helius_curve).
         """
-        try:
-            # Use base58 to decode and validate the address
-            decoded = base58.b58decode(wallet_address)
-            # Solana addresses are 32 bytes
-            if len(decoded) != 32:
-                return False
-            # If it decodes properly and is 32 bytes, it's on-curve
-            return True
-        except Exception:
-            return False
+        return is_on_curve(wallet_address)
 
     def get_wallet_balance(self, wallet_address: str) -> tuple[Optional[float], int]:
         """
@@ -79,51 +410,226 @@ class HeliusAPI:
             result = self._rpc_call("getBalance", [wallet_address])
             # getBalance returns lamports (1 SOL = 1,000,000,000 lamports)
             if result and "value" in result:
-                lamports = result["value"]
-                sol_balance = lamports / 1_000_000_000
-                # Convert SOL to USD (1 SOL ≈ $200 USD)
-                usd_balance = sol_balance * 200
                 # getBalance costs 1 credit per call
-                return usd_balance, 1
+                return lamports_to_usd(result["value"]), 1
             return None, 0
         except Exception as e:
             print(f"Error fetching wallet balance for {wallet_address}: {str(e)}")
             return None, 0
 
-    def _rpc_call(self, method: str, params: list) -> dict:
-        """Make a JSON-RPC call to Helius"""
+    def get_wallet_balances(self, wallet_addresses: List[str]) -> tuple[Dict[str, Optional[int]], int]:
+        """
+        Get lamport balances for many wallets using batched getMultipleAccounts calls.
+
+        Args:
+            wallet_addresses: Solana wallet addresses
+
+        Returns:
+            Tuple of (wallet_address -> lamports, API credits used)
+            Wallets whose chunk failed map to None
+        """
+        return self.transport.run(self.get_wallet_balances_async(wallet_addresses))
+
+    async def get_wallet_balances_async(self, wallet_addresses: List[str]) -> tuple[Dict[str, Optional[int]], int]:
+        """
+        Get lamport balances for many wallets (async).
+
+        Wallets are sent in chunks of MAX_ACCOUNTS_PER_BATCH to getMultipleAccounts,
+        with all chunks in flight concurrently. A missing account has 0 lamports.
+
+        Args:
+            wallet_addresses: Solana wallet addresses
+
+        Returns:
+            Tuple of (wallet_address -> lamports, API credits used)
+        """
+        unique_wallets = list(dict.fromkeys(wallet_addresses))
+        chunks = [
+            unique_wallets[i : i + MAX_ACCOUNTS_PER_BATCH]
+            for i in range(0, len(unique_wallets), MAX_ACCOUNTS_PER_BATCH)
+        ]
+
+        async def fetch_chunk(chunk: List[str]) -> tuple[Dict[str, Optional[int]], int]:
+            try:
+                # dataSlice length 0: we only need lamports, not account data
+                result = await self._rpc_call_async(
+                    "getMultipleAccounts",
+                    [chunk, {"encoding": "base64", "dataSlice": {"offset": 0, "length": 0}}],
+                )
+                accounts = result.get("value") or []
+                balances = {wallet: (account or {}).get("lamports", 0) for wallet, account in zip(chunk, accounts)}
+                # getMultipleAccounts costs 1 credit per call
+                return balances, 1
+            except Exception as e:
+                print(f"Error fetching balances for {len(chunk)} wallets: {str(e)}")
+                return {wallet: None for wallet in chunk}, 0
+
+        balances: Dict[str, Optional[int]] = {}
+        credits = 0
+        for chunk_balances, chunk_credits in await asyncio.gather(*[fetch_chunk(c) for c in chunks]):
+            balances.update(chunk_balances)
+            credits += chunk_credits
+
+        return balances, credits
+
+    async def _rpc_call_async(self, method: str, params: list) -> dict:
+        """Make a JSON-RPC call to Helius (async, shared connection pool)"""
         payload = {"jsonrpc": "2.0", "id": 1, "method": method, "params": params}
         try:
-            response = self.session.post(self.rpc_url, json=payload, timeout=30)
+            response = await self.transport.request(
+                "POST",
+                self.rpc_url,
+                json=payload,
+                api_key=self.billing_key,
+                credits=RPC_CREDIT_COSTS.get(method, 1),
+            )
             response.raise_for_status()
-            result = response.json()
+            result = orjson.loads(response.content)
             if "error" in result:
                 raise Exception(f"RPC Error: {result['error']}")
             return result.get("result", {})
         except Exception as e:
             raise Exception(f"RPC call failed: {str(e)}")
 
-    def _enhanced_call(self, endpoint: str, params: dict) -> dict:
-        """Make a call to Helius Enhanced API"""
+    def _rpc_call(self, method: str, params: list) -> dict:
+        """Make a JSON-RPC call to Helius"""
+        return self.transport.run(self._rpc_call_async(method, params))
+
+    async def _rpc_batch_call_async(self, method: str, params_list: List[list]) -> List[Optional[dict]]:
+        """
+        Make a JSON-RPC batch call to Helius (one HTTP request, billed per entry).
+
+        Args:
+            method: RPC method for every entry
+            params_list: Params of each entry
+
+        Returns:
+            Results aligned with params_list (None for entries that returned an error)
+        """
+        payload = [
+            {"jsonrpc": "2.0", "id": i, "method": method, "params": params} for i, params in enumerate(params_list)
+        ]
+        try:
+            response = await self.transport.request(
+                "POST",
+                self.rpc_url,
+                json=payload,
+                api_key=self.billing_key,
+                credits=RPC_CREDIT_COSTS.get(method, 1) * len(params_list),
+            )
+            response.raise_for_status()
+            replies = orjson.loads(response.content)
+        except Exception as e:
+            raise Exception(f"RPC batch call failed: {str(e)}")
+
+        if not isinstance(replies, list):
+            # The whole batch was rejected (e.g. batch requests not allowed)
+            raise Exception(f"RPC batch call failed: {replies.get('error') if isinstance(replies, dict) else replies}")
+
+        results: List[Optional[dict]] = [None] * len(params_list)
+        for reply in replies:
+            index = reply.get("id")
+            if isinstance(index, int) and 0 <= index < len(results) and "error" not in reply:
+                results[index] = reply.get("result")
+        return results
+
+    async def get_transactions_async(self, signatures: List[str]) -> tuple[List[Optional[dict]], int]:
+        """
+        Fetch raw transactions for many signatures (async).
+
+        Signatures are sent in JSON-RPC batches of TRANSACTION_BATCH_SIZE getTransaction
+        calls, with at most MAX_CONCURRENT_TRANSACTION_BATCHES batches in flight. Every
+        batch goes through the shared per-key rate limiter.
+
+        Args:
+            signatures: Transaction signatures
+
+        Returns:
+            Tuple of (raw transactions aligned with signatures - None where missing or
+            failed, API credits used)
+        """
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_TRANSACTION_BATCHES)
+        options = {"encoding": "jsonParsed", "maxSupportedTransactionVersion": 0}
+
+        async def fetch_batch(batch: List[str]) -> tuple[List[Optional[dict]], int]:
+            async with semaphore:
+                try:
+                    results = await self._rpc_batch_call_async("getTransaction", [[sig, options] for sig in batch])
+                    # Each getTransaction in the batch costs 1 credit
+                    return results, len(batch)
+                except Exception as e:
+                    print(f"Error fetching {len(batch)} transactions: {str(e)}")
+                    return [None] * len(batch), 0
+
+        batches = [
+            signatures[i : i + TRANSACTION_BATCH_SIZE] for i in range(0, len(signatures), TRANSACTION_BATCH_SIZE)
+        ]
+        transactions: List[Optional[dict]] = []
+        credits = 0
+        for batch_results, batch_credits in await asyncio.gather(*[fetch_batch(b) for b in batches]):
+            transactions.extend(batch_results)
+            credits += batch_credits
+
+        return transactions, credits
+
+    def get_transactions(self, signatures: List[str]) -> tuple[List[Optional[dict]], int]:
+        """Fetch raw transactions for many signatures (see get_transactions_async)"""
+        return self.transport.run(self.get_transactions_async(signatures))
+
+    async def _rpc_call_raw_async(self, method: str, params: list) -> bytes:
+        """Make a JSON-RPC call to Helius and return the undecoded response body"""
+        payload = {"jsonrpc": "2.0", "id": 1, "method": method, "params": params}
+        try:
+            response = await self.transport.request(
+                "POST",
+                self.rpc_url,
+                json=payload,
+                api_key=self.billing_key,
+                credits=RPC_CREDIT_COSTS.get(method, 1),
+            )
+            response.raise_for_status()
+            return response.content
+        except Exception as e:
+            raise Exception(f"RPC call failed: {str(e)}")
+
+    def _rpc_call_raw(self, method: str, params: list) -> bytes:
+        """Make a JSON-RPC call to Helius, leaving decoding to the caller"""
+        return self.transport.run(self._rpc_call_raw_async(method, params))
+
+    async def _enhanced_call_async(self, endpoint: str, params: dict) -> dict:
+        """Make a call to Helius Enhanced API (async, shared connection pool)"""
         url = f"{self.enhanced_url}/{endpoint}"
         params["api-key"] = self.api_key
         try:
-            response = self.session.get(url, params=params, timeout=30)
+            response = await self.transport.request("GET", url, params=params, api_key=self.billing_key)
             response.raise_for_status()
-            return response.json()
+            return orjson.loads(response.content)
         except Exception as e:
             raise Exception(f"Enhanced API call failed: {str(e)}")
 
+    def _enhanced_call(self, endpoint: str, params: dict) -> dict:
+        """Make a call to Helius Enhanced API"""
+        return self.transport.run(self._enhanced_call_async(endpoint, params))
+
     def get_token_metadata(self, mint_address: str) -> tuple[Optional[Dict], int]:
         """
         Get token metadata including name, symbol, etc.
 
+        Returns:
+            Tuple of (metadata dict, credits_used)
+        """
+        return self.transport.run(self.get_token_metadata_async(mint_address))
+
+    async def get_token_metadata_async(self, mint_address: str) -> tuple[Optional[Dict], int]:
+        """
+        Get token metadata including name, symbol, etc. (async)
+
         Returns:
             Tuple of (metadata dict, credits_used)
         """
         try:
             # Try the regular token metadata endpoint first
-            result = self._enhanced_call("token-metadata", {"mintAccounts": mint_address})
+            result = await self._enhanced_call_async("token-metadata", {"mintAccounts": mint_address})
             if result and result[0]:
                 # Enhanced API token-metadata costs 1 credit
                 return result[0], 1
@@ -142,9 +648,9 @@ class HeliusAPI:
                     "displayOptions": {"showUnverifiedCollections": True, "showCollectionMetadata": True},
                 },
             }
-            response = self.session.post(self.rpc_url, json=payload, timeout=30)
+            response = await self.transport.request("POST", self.rpc_url, json=payload, api_key=self.billing_key)
             response.raise_for_status()
-            result = response.json()
+            result = orjson.loads(response.content)
 
             if "result" in result and result["result"]:
                 asset = result["result"]
@@ -171,12 +677,14 @@ class HeliusAPI:
 
     def get_token_creation_time(self, mint_address: str) -> tuple[Optional[int], int]:
         """
-        Get the token creation timestamp by finding the first transaction.
-
-        NOTE: This method is currently DISABLED because it's too expensive.
-        It would require paginating through ALL transactions just to find the first one.
+        Get the token creation timestamp (blockTime of the mint's first transaction).
 
-        Instead, we'll just return None and let the transaction fetching handle it naturally.
+        Resolved at most once per token and kept in the creation time store. On a
+        miss, getSignaturesForAddress is walked back to the first signature, but
+        only for CREATION_LOOKUP_MAX_CALLS pages so the lookup always costs less
+        than a single getTransactionsForAddress page. Longer histories are left
+        unresolved; the first ascending fetch without a filter starts at the
+        mint's first transaction and records the time for free.
 
         Args:
             mint_address: Token mint address
@@ -184,10 +692,48 @@ class HeliusAPI:
         Returns:
             Tuple of (creation_timestamp in unix time, credits_used)
         """
-        # DISABLED: This is too expensive - would need to paginate through potentially
-        # tens of thousands of signatures just to find the first one
-        print(f"[Helius] Skipping token creation time lookup (too expensive)")
-        return None, 0
+        creation_time = self.creation_times.get(mint_address)
+        if creation_time is not None:
+            print(f"[Helius] Token creation time (stored): {datetime.utcfromtimestamp(creation_time)}")
+            return creation_time, 0
+
+        credits = 0
+        oldest = None
+        before_signature = None
+        try:
+            for _ in range(CREATION_LOOKUP_MAX_CALLS):
+                params = [mint_address, {"limit": SIGNATURE_PAGE_SIZE}]
+                if before_signature:
+                    params[1]["before"] = before_signature
+
+                signatures = self._rpc_call("getSignaturesForAddress", params)
+                credits += 1  # 1 credit per pagination call
+
+                if signatures:
+                    oldest = signatures[-1]
+                if len(signatures or []) < SIGNATURE_PAGE_SIZE:
+                    break
+
+                before_signature = oldest["signature"]
+            else:
+                print(
+                    f"[Helius] Token has over {CREATION_LOOKUP_MAX_CALLS * SIGNATURE_PAGE_SIZE} signatures - "
+                    f"creation time will be recorded from the first fetch"
+                )
+                return None, credits
+
+        except Exception as e:
+            print(f"[Helius] Creation time lookup failed: {str(e)}")
+            return None, credits
+
+        if not oldest or not oldest.get("blockTime"):
+            print(f"[Helius] Could not determine token creation time ({credits} credits)")
+            return None, credits
+
+        creation_time = oldest["blockTime"]
+        self.creation_times.put(mint_address, creation_time, oldest.get("signature"))
+        print(f"[Helius] Token creation time: {datetime.utcfromtimestamp(creation_time)} ({credits} credits)")
+        return creation_time, credits
 
     def get_parsed_transactions(
         self,
@@ -196,6 +742,9 @@ class HeliusAPI:
         get_earliest: bool = False,
         token_creation_time: int = None,
         max_credits: int = 1000,
+        aggregator: Optional[EarlyBidderAggregator] = None,
+        prefetch_depth: int = 0,
+        resume_cursor: Optional[Dict] = None,
     ) -> tuple[List[Dict], int]:
         """
         Get parsed transaction history for an address.
@@ -207,14 +756,26 @@ class HeliusAPI:
             get_earliest: If True, fetches earliest transactions from token creation.
                          If False, fetches most recent transactions (default)
             token_creation_time: Unix timestamp of token creation (optional, improves efficiency)
+            aggregator: Early bidder aggregator to stream earliest transactions into (get_earliest only)
+            prefetch_depth: Pages to fetch ahead while parsing (get_earliest only, 0 = sequential)
+            resume_cursor: Fetch cursor of an earlier run to continue after (get_earliest only)
 
         Returns:
-            Tuple of (List of transactions, API credits used)
+            Tuple of (List of transactions, API credits used); with get_earliest the
+            transactions are BuyRecords for `address` as the token mint
         """
         try:
             if get_earliest:
                 # Fetch earliest transactions using the new efficient method
-                return self._get_earliest_transactions_new(address, limit, token_creation_time, max_credits)
+                return self._get_earliest_transactions_new(
+                    address,
+                    limit,
+                    token_creation_time,
+                    max_credits,
+                    aggregator=aggregator,
+                    prefetch_depth=prefetch_depth,
+                    resume_cursor=resume_cursor,
+                )
 
             # Get transaction signatures first (most recent by default)
             # NOTE: getSignaturesForAddress costs 1 credit per call on Helius paid plans
@@ -227,31 +788,9 @@ class HeliusAPI:
             sig_list = [sig["signature"] for sig in signatures[:limit]]
             print(f"[Helius] Fetching details for {len(sig_list)} transactions...")
 
-            # Fetch transactions individually using RPC method
-            # Each getTransaction call costs 1 credit
-            all_transactions = []
-            transaction_api_calls = 0
-
-            for i, signature in enumerate(sig_list):
-                if i % 50 == 0:  # Progress indicator every 50 transactions
-                    print(f"[Helius] Progress: {i}/{len(sig_list)} transactions fetched...")
-
-                try:
-                    # Use getTransaction RPC method with maxSupportedTransactionVersion
-                    tx_data = self._rpc_call(
-                        "getTransaction", [signature, {"encoding": "jsonParsed", "maxSupportedTransactionVersion": 0}]
-                    )
-                    transaction_api_calls += 1  # 1 credit per getTransaction call
-
-                    if tx_data:
-                        # Extract relevant transaction info
-                        parsed_tx = self._parse_rpc_transaction(tx_data, signature)
-                        if parsed_tx:
-                            all_transactions.append(parsed_tx)
-
-                except Exception as tx_error:
-                    # Skip individual transaction errors
-                    continue
+            # Fetch transactions with batched getTransaction calls (1 credit each)
+            raw_transactions, transaction_api_calls = self.get_transactions(sig_list)
+            all_transactions = self._parse_fetched_transactions(sig_list, raw_transactions)
 
             total_credits = signature_api_calls + transaction_api_calls
             print(f"[Helius] Total transactions retrieved: {len(all_transactions)}")
@@ -264,110 +803,399 @@ class HeliusAPI:
             print(f"Error fetching parsed transactions: {str(e)}")
             return [], 0
 
-    def _get_earliest_transactions_new(
-        self, address: str, limit: int = 500, token_creation_time: int = None, max_credits: int = 1000
-    ) -> tuple[List[Dict], int]:
+    def _iter_raw_transaction_pages(
+        self,
+        address: str,
+        limit: int,
+        token_creation_time: int,
+        max_credits: int,
+        fetch_stats: Dict,
+        resume_cursor: Optional[Dict] = None,
+        max_transactions: int = MAX_TRANSACTIONS_PER_FETCH,
+    ) -> Iterator[Dict]:
         """
-        Fetch earliest transactions for an address using Helius's getTransactionsForAddress.
-        This is MUCH more efficient than the old method - uses timestamp filtering and ascending order.
+        Yield raw getTransactionsForAddress results, oldest first.
+
+        Pagination only advances when the consumer asks for the next page, so
+        closing the generator early skips the remaining (100-credit) calls.
 
         Args:
             address: Solana address to fetch transactions for
             limit: Maximum number of earliest transactions to return
             token_creation_time: Unix timestamp of token creation (optional)
-            max_credits: Maximum API credits to spend (default: 1000)
-
-        Returns:
-            Tuple of (List of parsed transactions oldest first, API credits used)
+            max_credits: Maximum API credits to spend
+            fetch_stats: Dict updated in place with 'api_calls' and 'cached_pages'
+            resume_cursor: Fetch cursor of an earlier run to continue from (see fetch_cursor)
+            max_transactions: Hard cap on `limit` (DEEP_MAX_TRANSACTIONS for deep analyses)
+
+        Yields:
+            Raw RPC result for each page (with 'data' and 'paginationToken'),
+            or a ParsedPage when the parse pool is enabled
         """
-        print(f"[Helius] Fetching earliest transactions using getTransactionsForAddress (efficient method)...")
-        print(f"[Helius] Credit limit: {max_credits} credits (max {max_credits // 100} API calls)")
-        if token_creation_time:
-            print(f"[Helius] Filtering from token creation time: {datetime.utcfromtimestamp(token_creation_time)}")
-
-        all_transactions = []
-        api_calls = 0
         pagination_token = None
+        if resume_cursor:
+            # Continue after the last page of the earlier run; without a token (end of
+            # history), restart at its blockTime high-water mark and let the caller dedupe
+            pagination_token = resume_cursor.get("pagination_token")
+            if not pagination_token and resume_cursor.get("last_block_time"):
+                token_creation_time = max(token_creation_time or 0, resume_cursor["last_block_time"])
         max_api_calls = max_credits // 100  # Each call costs 100 credits
 
-        try:
-            # getTransactionsForAddress costs 100 credits per call
-            # Can fetch up to 100 transactions with full details per call
-            # We'll need multiple calls if limit > 100
-            remaining_limit = min(limit, 500)  # Cap at 500 for safety
+        # getTransactionsForAddress costs 100 credits per call
+        # Can fetch up to 100 transactions with full details per call
+        # We'll need multiple calls if limit > 100
+        remaining_limit = min(limit, max_transactions)  # Cap for safety (500 unless streaming a deep analysis)
+
+        while remaining_limit > 0 and fetch_stats["api_calls"] < max_api_calls:
+            batch_limit = min(remaining_limit, 100)  # Max 100 per call with full details
+
+            # Build request params
+            params = [
+                address,
+                {
+                    "transactionDetails": "full",  # Get full transaction details
+                    "limit": batch_limit,
+                    "sortOrder": "asc",  # Ascending = oldest first!
+                },
+            ]
 
-            while remaining_limit > 0 and api_calls < max_api_calls:
-                batch_limit = min(remaining_limit, 100)  # Max 100 per call with full details
+            # Add timestamp filter if we have token creation time
+            if token_creation_time:
+                params[1]["filters"] = {
+                    "blockTime": {"gte": token_creation_time}  # Greater than or equal to creation time
+                }
 
-                # Build request params
-                params = [
-                    address,
-                    {
-                        "transactionDetails": "full",  # Get full transaction details
-                        "limit": batch_limit,
-                        "sortOrder": "asc",  # Ascending = oldest first!
-                    },
-                ]
+            # Add pagination token if we have one
+            if pagination_token:
+                params[1]["paginationToken"] = pagination_token
+
+            print(f"[Helius] Calling getTransactionsForAddress (batch limit: {batch_limit})...")
+            print(f"[Helius] Request params: {params}")
+
+            if self.parse_pool is not None:
+                # Decoded and parsed in a worker process
+                result = self._fetch_parsed_page(address, params, fetch_stats)
+            else:
+                # Serve immutable pages from the local page cache (0 credits)
+                result = self.page_cache.get(address, params[1])
+                if result is not None:
+                    fetch_stats["cached_pages"] += 1
+                    print(f"[Helius] Page served from cache (0 credits)")
+                else:
+                    # Make the RPC call (decoded in full, unparsed fields only dropped afterwards)
+                    result = strip_unparsed_fields(self._rpc_call("getTransactionsForAddress", params))
+                    fetch_stats["api_calls"] += 1  # 100 credits per call
+                    self.page_cache.put(address, params[1], result)
 
-                # Add timestamp filter if we have token creation time
-                if token_creation_time:
-                    params[1]["filters"] = {
-                        "blockTime": {"gte": token_creation_time}  # Greater than or equal to creation time
-                    }
+                print(f"[Helius] Raw result type: {type(result)}")
+                print(f"[Helius] Raw result keys: {result.keys() if isinstance(result, dict) else 'N/A'}")
 
-                # Add pagination token if we have one
-                if pagination_token:
-                    params[1]["paginationToken"] = pagination_token
+            if not result:
+                print(f"[Helius] Result is empty/None, breaking")
+                return
+
+            # Extract transaction count and pagination token
+            # Note: getTransactionsForAddress returns 'data', not 'transactions'
+            if isinstance(result, ParsedPage):
+                tx_count = result.tx_count
+                pagination_token = result.pagination_token
+            else:
+                tx_count = len(result.get("data", []))
+                pagination_token = result.get("paginationToken")
 
-                print(f"[Helius] Calling getTransactionsForAddress (batch limit: {batch_limit})...")
-                print(f"[Helius] Request params: {params}")
+            print(f"[Helius] Received {tx_count} transactions in this batch")
+            print(f"[Helius] Pagination token: {pagination_token}")
 
-                # Make the RPC call
-                result = self._rpc_call("getTransactionsForAddress", params)
-                api_calls += 1  # 100 credits per call
+            yield result
 
-                print(f"[Helius] Raw result type: {type(result)}")
-                print(f"[Helius] Raw result keys: {result.keys() if isinstance(result, dict) else 'N/A'}")
+            remaining_limit -= tx_count
 
-                if not result:
-                    print(f"[Helius] Result is empty/None, breaking")
-                    break
+            # If no pagination token or no more transactions, we're done
+            if not pagination_token or tx_count == 0:
+                return
 
-                # Extract transactions and pagination token
-                # Note: getTransactionsForAddress returns 'data', not 'transactions'
-                transactions = result.get("data", [])
-                pagination_token = result.get("paginationToken")
+            # If we got fewer than requested, we've reached the end
+            if tx_count < batch_limit:
+                return
+
+    def _fetch_parsed_page(self, address: str, params: list, fetch_stats: Dict) -> Optional[ParsedPage]:
+        """
+        Fetch one getTransactionsForAddress page and parse it in the parse pool.
 
-                print(f"[Helius] Received {len(transactions)} transactions in this batch")
-                print(f"[Helius] Pagination token: {pagination_token}")
+        The response (or cached page) body is passed to the worker undecoded; the
+        worker reduces the transactions to BuyRecords and also compresses
+        immutable pages so the page cache write stays cheap.
 
-                # Parse each transaction
-                for tx_data in transactions:
+        Args:
+            address: Token mint to fetch transactions for
+            params: getTransactionsForAddress params (address, options)
+            fetch_stats: Dict updated in place with 'api_calls' and 'cached_pages'
+
+        Returns:
+            ParsedPage, or None if the RPC result was empty
+        """
+        body = self.page_cache.get_body(address, params[1])
+        from_cache = body is not None
+        if from_cache:
+            fetch_stats["cached_pages"] += 1
+            print(f"[Helius] Page served from cache (0 credits)")
+        else:
+            body = self._rpc_call_raw("getTransactionsForAddress", params)
+            fetch_stats["api_calls"] += 1  # 100 credits per call
+
+        page = self.parse_pool.parse(
+            body,
+            address,
+            from_cache=from_cache,
+            columnar_parser=self.columnar_parser,
+            compress_for_cache=not from_cache and self.page_cache.enabled,
+            page_limit=params[1].get("limit"),
+        )
+        if page is not None and page.cache_body is not None:
+            self.page_cache.put_body(address, params[1], page.cache_body, page.tx_count)
+        return page
+
+    def _prefetch_pages(self, raw_pages: Iterator[Dict], depth: int, fetch_stats: Dict) -> Iterator[Dict]:
+        """
+        Run a raw page iterator on a background thread, up to `depth` pages ahead of the consumer.
+
+        The next page's request only needs the current page's paginationToken, so
+        its network round trip can overlap with parsing the current page. The
+        credit budget still applies: the producer stops at the same call limit.
+
+        Args:
+            raw_pages: Iterator from _iter_raw_transaction_pages
+            depth: Maximum number of pages fetched ahead of the page being parsed
+            fetch_stats: Dict updated in place with 'fetch_seconds'
+
+        Yields:
+            Raw RPC results in order
+        """
+        pages: queue.Queue = queue.Queue()
+        slots = threading.Semaphore(depth)
+        stop = threading.Event()
+        done = object()
+
+        def produce():
+            try:
+                while True:
+                    slots.acquire()
+                    if stop.is_set():
+                        return
+                    started = time.perf_counter()
                     try:
-                        # tx_data is already the full transaction object
-                        signature = tx_data.get("signature")
-                        parsed_tx = self._parse_rpc_transaction(tx_data, signature)
-                        if parsed_tx:
-                            all_transactions.append(parsed_tx)
-                    except Exception as parse_error:
-                        continue
+                        result = next(raw_pages)
+                    except StopIteration:
+                        return
+                    fetch_stats["fetch_seconds"] += time.perf_counter() - started
+                    pages.put(result)
+            except Exception as e:
+                pages.put(e)
+            finally:
+                pages.put(done)
+
+        producer = threading.Thread(target=produce, name="helius-prefetch", daemon=True)
+        producer.start()
+        try:
+            while True:
+                item = pages.get()
+                if item is done:
+                    return
+                if isinstance(item, Exception):
+                    raise item
+                slots.release()
+                yield item
+        finally:
+            stop.set()
+            slots.release()
+            # Wait for an in-flight request so its credits are accounted for
+            producer.join()
+
+    def _iter_earliest_transaction_pages(
+        self,
+        address: str,
+        limit: int,
+        token_creation_time: int,
+        max_credits: int,
+        fetch_stats: Dict,
+        prefetch_depth: int = 0,
+        resume_cursor: Optional[Dict] = None,
+        max_transactions: int = MAX_TRANSACTIONS_PER_FETCH,
+    ) -> Iterator[List[BuyRecord]]:
+        """
+        Yield getTransactionsForAddress pages as BuyRecords, oldest first.
 
-                remaining_limit -= len(transactions)
+        Args:
+            address: Token mint to fetch transactions for (buys are extracted for it)
+            limit: Maximum number of earliest transactions to return
+            token_creation_time: Unix timestamp of token creation (optional)
+            max_credits: Maximum API credits to spend
+            fetch_stats: Dict updated in place with call counts, fetch timings and the
+                         'cursor' after the last page handed to the consumer
+            prefetch_depth: Pages to fetch ahead while the current page is parsed (0 = sequential)
+            resume_cursor: Fetch cursor of an earlier run to continue from
+            max_transactions: Hard cap on `limit` (DEEP_MAX_TRANSACTIONS for deep analyses)
+
+        Yields:
+            BuyRecords of each page's parsed transactions
+        """
+        raw_pages = self._iter_raw_transaction_pages(
+            address,
+            limit,
+            token_creation_time,
+            max_credits,
+            fetch_stats,
+            resume_cursor=resume_cursor,
+            max_transactions=max_transactions,
+        )
+        if prefetch_depth > 0:
+            raw_pages = self._prefetch_pages(raw_pages, prefetch_depth, fetch_stats)
+
+        # Resuming by blockTime refetches the boundary block - skip what the earlier run already counted
+        already_seen = set()
+        if resume_cursor and not resume_cursor.get("pagination_token"):
+            already_seen = set(resume_cursor.get("boundary_signatures") or [])
+        debug_first = is_debug_enabled()
+
+        while True:
+            started = time.perf_counter()
+            result = next(raw_pages, None)
+            waited = time.perf_counter() - started
+            fetch_stats["wait_seconds"] += waited
+            if prefetch_depth <= 0:
+                fetch_stats["fetch_seconds"] += waited
+            if result is None:
+                return
+
+            cursor = fetch_stats["cursor"]
+            if isinstance(result, ParsedPage):
+                page = result.transactions
+                tx_count, last_slot, last_block_time = result.tx_count, result.last_slot, result.last_block_time
+                cursor["pagination_token"] = result.pagination_token
+            else:
+                raw_transactions = result.get("data", [])
+                parsed = self._parse_transaction_page(raw_transactions)
+                if debug_first and parsed:
+                    debug_first = False
+                    self._extract_buy_info(parsed[0], address, debug_first=True)
+                page = buy_records(parsed, address)
+                newest = raw_transactions[-1] if raw_transactions else {}
+                tx_count, last_slot, last_block_time = (
+                    len(raw_transactions),
+                    newest.get("slot"),
+                    newest.get("blockTime"),
+                )
+                cursor["pagination_token"] = result.get("paginationToken")
+
+            if already_seen:
+                unseen = [tx for tx in page if tx.signature not in already_seen]
+                tx_count -= len(page) - len(unseen)
+                page = unseen
+
+            # Cursor only advances for pages the consumer actually receives (not prefetched ones)
+            cursor["transactions_fetched"] += tx_count
+            if last_slot is not None:
+                cursor["last_slot"] = last_slot
+            if last_block_time is not None:
+                boundary = [tx.signature for tx in page if tx.timestamp == last_block_time]
+                if last_block_time == cursor["last_block_time"]:
+                    boundary = cursor["boundary_signatures"] + boundary
+                cursor["boundary_signatures"] = boundary
+                cursor["last_block_time"] = last_block_time
+
+            try:
+                yield page
+            except GeneratorExit:
+                raw_pages.close()
+                raise
 
-                # If no pagination token or no more transactions, we're done
-                if not pagination_token or len(transactions) == 0:
-                    break
+    def _get_earliest_transactions_new(
+        self,
+        address: str,
+        limit: int = 500,
+        token_creation_time: int = None,
+        max_credits: int = 1000,
+        aggregator: Optional[EarlyBidderAggregator] = None,
+        prefetch_depth: int = 0,
+        resume_cursor: Optional[Dict] = None,
+    ) -> tuple[List[Dict], int]:
+        """
+        Fetch earliest transactions for an address using Helius's getTransactionsForAddress.
+        This is MUCH more efficient than the old method - uses timestamp filtering and ascending order.
 
-                # If we got fewer than requested, we've reached the end
-                if len(transactions) < batch_limit:
-                    break
+        Args:
+            address: Token mint to fetch transactions for
+            limit: Maximum number of earliest transactions to return
+            token_creation_time: Unix timestamp of token creation (optional)
+            max_credits: Maximum API credits to spend (default: 1000)
+            aggregator: Optional early bidder aggregator fed each page; pagination
+                        stops as soon as it is settled
+            prefetch_depth: Pages to fetch ahead while the current page is parsed (0 = sequential)
+            resume_cursor: Fetch cursor of an earlier run; only transactions after it are fetched
 
+        Returns:
+            Tuple of (BuyRecords of the transactions oldest first, API credits used)
+        """
+        print(f"[Helius] Fetching earliest transactions using getTransactionsForAddress (efficient method)...")
+        print(f"[Helius] Credit limit: {max_credits} credits (max {max_credits // 100} API calls)")
+        if token_creation_time:
+            print(f"[Helius] Filtering from token creation time: {datetime.utcfromtimestamp(token_creation_time)}")
+
+        all_transactions = []
+        fetch_stats = {
+            "api_calls": 0,
+            "cached_pages": 0,
+            "fetch_seconds": 0.0,
+            "wait_seconds": 0.0,
+            "cursor": new_fetch_cursor(resume_cursor),
+        }
+        self.last_fetch_stats = fetch_stats
+        max_api_calls = max_credits // 100  # Each call costs 100 credits
+        stopped_early = fetch_stats["stopped_early"] = False
+
+        try:
+            pages = self._iter_earliest_transaction_pages(
+                address,
+                limit,
+                token_creation_time,
+                max_credits,
+                fetch_stats,
+                prefetch_depth=prefetch_depth,
+                resume_cursor=resume_cursor,
+            )
+            for page in pages:
+                all_transactions.extend(page)
+                if aggregator is not None:
+                    aggregator.add_transactions(page)
+                    if aggregator.settled:
+                        # Earliest buyers are known - skip the remaining pages
+                        pages.close()
+                        stopped_early = fetch_stats["stopped_early"] = True
+                        break
+
+            api_calls = fetch_stats["api_calls"]
             total_credits = api_calls * 100  # Each call costs 100 credits
             print(f"[Helius] Total transactions retrieved: {len(all_transactions)}")
             print(f"[Helius] API credits used: {api_calls} calls × 100 credits = {total_credits} total")
+            if fetch_stats["cached_pages"]:
+                print(f"[Helius] Pages served from cache: {fetch_stats['cached_pages']}")
+            if prefetch_depth > 0:
+                fetch_stats["prefetch_saved_seconds"] = max(
+                    0.0, fetch_stats["fetch_seconds"] - fetch_stats["wait_seconds"]
+                )
+                print(
+                    f"[Helius] Prefetch (depth {prefetch_depth}) saved {fetch_stats['prefetch_saved_seconds']:.2f}s "
+                    f"of {fetch_stats['fetch_seconds']:.2f}s fetch time"
+                )
+            if not token_creation_time and not resume_cursor and all_transactions and all_transactions[0].timestamp:
+                # An unfiltered ascending fetch starts at the address's first transaction
+                first = all_transactions[0]
+                self.creation_times.put(address, first.timestamp, first.signature)
+            if stopped_early:
+                print(f"[Helius] Early bidders settled - stopped paginating early")
 
             # Warn if we hit the credit limit
-            if api_calls >= max_api_calls:
+            elif api_calls >= max_api_calls:
                 print(f"[Helius] ⚠️  WARNING: Reached credit limit ({max_credits} credits)")
                 print(f"[Helius] Analysis may be incomplete. Consider increasing maxCreditsPerAnalysis in settings.")
 
@@ -378,9 +1206,23 @@ class HeliusAPI:
             import traceback
 
             print(f"[Helius] Traceback: {traceback.format_exc()}")
+            if resume_cursor:
+                # The old method can only start from the beginning - keep what was fetched after the cursor
+                print(f"[Helius] Resumed fetch failed - keeping {len(all_transactions)} transactions fetched so far")
+                return all_transactions, fetch_stats["api_calls"] * 100
+
             # Fall back to old method if new method fails
             print(f"[Helius] Falling back to old pagination method...")
-            return self._get_earliest_transactions_old(address, limit, token_creation_time)
+            transactions, credits = self._get_earliest_transactions_old(address, limit, token_creation_time)
+            transactions = buy_records(transactions, address)
+            fetch_stats["cursor"] = new_fetch_cursor()
+            fetch_stats["cursor"]["transactions_fetched"] = len(transactions)
+            if transactions:
+                fetch_stats["cursor"]["last_block_time"] = transactions[-1].timestamp
+            if aggregator is not None:
+                aggregator.reset()
+                aggregator.add_transactions(transactions)
+            return transactions, credits
 
     def _get_earliest_transactions_old(
         self, address: str, limit: int = 500, token_creation_time: int = None
@@ -401,8 +1243,9 @@ class HeliusAPI:
         if token_creation_time:
             print(f"[Helius] Starting from token creation time: {datetime.utcfromtimestamp(token_creation_time)}")
 
-        all_signatures = []
-        batch_size = 1000  # Max allowed by Solana RPC
+        # Signatures arrive newest first, so a bounded deque ends up holding the oldest `limit`
+        oldest_signatures: deque = deque(maxlen=limit)
+        batch_size = SIGNATURE_PAGE_SIZE
         before_signature = None
         total_fetched = 0
         signature_api_calls = 0
@@ -424,12 +1267,13 @@ class HeliusAPI:
 
                 # If we have a token creation time, filter out transactions before it
                 if token_creation_time:
-                    filtered_sigs = []
+                    filtered_count = 0
                     found_older_than_creation = False
                     for sig in signatures:
                         sig_time = sig.get("blockTime")
                         if sig_time and sig_time >= token_creation_time:
-                            filtered_sigs.append(sig)
+                            oldest_signatures.append(sig["signature"])
+                            filtered_count += 1
                         elif sig_time and sig_time < token_creation_time:
                             # We've gone past the creation time, stop pagination after this batch
                             found_older_than_creation = True
@@ -438,16 +1282,13 @@ class HeliusAPI:
                             )
                             break
 
-                    # Add any filtered signatures from this batch
-                    if filtered_sigs:
-                        all_signatures.extend(filtered_sigs)
-                        total_fetched += len(filtered_sigs)
+                    total_fetched += filtered_count
 
                     # Stop if we found older transactions or no more filtered results
-                    if found_older_than_creation or (not filtered_sigs and before_signature):
+                    if found_older_than_creation or (not filtered_count and before_signature):
                         break
                 else:
-                    all_signatures.extend(signatures)
+                    oldest_signatures.extend(sig["signature"] for sig in signatures)
                     total_fetched += len(signatures)
 
                 print(f"[Helius] Fetched {total_fetched} signatures so far ({signature_api_calls} pagination calls)...")
@@ -468,36 +1309,15 @@ class HeliusAPI:
                 f"[Helius] Total signatures fetched: {total_fetched} ({signature_api_calls} getSignaturesForAddress calls)"
             )
 
-            # Reverse to get oldest-first, then take the first 'limit' transactions
-            all_signatures.reverse()
-            earliest_signatures = all_signatures[:limit]
+            # Oldest first
+            earliest_signatures = list(reversed(oldest_signatures))
 
             print(f"[Helius] Processing {len(earliest_signatures)} earliest signatures...")
 
             # Now fetch full transaction data for these earliest signatures
-            # Each getTransaction call costs 1 credit
-            all_transactions = []
-            transaction_api_calls = 0
-
-            for i, sig_obj in enumerate(earliest_signatures):
-                if i % 50 == 0:
-                    print(f"[Helius] Progress: {i}/{len(earliest_signatures)} earliest transactions fetched...")
-
-                try:
-                    signature = sig_obj["signature"]
-                    tx_data = self._rpc_call(
-                        "getTransaction", [signature, {"encoding": "jsonParsed", "maxSupportedTransactionVersion": 0}]
-                    )
-                    transaction_api_calls += 1  # 1 credit per getTransaction call
-
-                    if tx_data:
-                        parsed_tx = self._parse_rpc_transaction(tx_data, signature)
-                        if parsed_tx:
-                            all_transactions.append(parsed_tx)
-
-                except Exception as tx_error:
-                    # Skip individual transaction errors
-                    continue
+            # Batched getTransaction calls, 1 credit per transaction
+            raw_transactions, transaction_api_calls = self.get_transactions(earliest_signatures)
+            all_transactions = self._parse_fetched_transactions(earliest_signatures, raw_transactions)
 
             total_credits = signature_api_calls + transaction_api_calls
             print(f"[Helius] Successfully retrieved {len(all_transactions)} earliest transactions")
@@ -510,7 +1330,25 @@ class HeliusAPI:
             print(f"Error fetching earliest transactions: {str(e)}")
             return [], 0
 
-    def _parse_rpc_transaction(self, tx_data: dict, signature: str) -> dict:
+    def _parse_fetched_transactions(self, signatures: List[str], raw_transactions: List[Optional[dict]]) -> List[Dict]:
+        """Parse getTransaction results aligned with their signatures, skipping missing ones"""
+        parsed = []
+        for signature, tx_data in zip(signatures, raw_transactions):
+            if tx_data:
+                parsed_tx = self._parse_rpc_transaction(tx_data, signature)
+                if parsed_tx:
+                    parsed.append(parsed_tx)
+        return parsed
+
+    def _parse_transaction_page(self, transactions: List[Dict]) -> List[Dict]:
+        """
+        Parse a page of raw RPC transactions, dropping ones that fail to parse.
+        Uses the columnar NumPy parser when enabled (same results as the dict path).
+        """
+        return parse_transaction_list(transactions, self.columnar_parser)
+
+    @staticmethod
+    def _parse_rpc_transaction(tx_data: dict, signature: str) -> dict:
         """
         Parse RPC transaction data into a simplified format.
         Extracts timestamp, type, transfers, etc.
@@ -625,6 +1463,7 @@ class HeliusAPI:
         max_transactions: int = 500,
         max_credits: int = 1000,
         max_wallets_to_store: int = 10,
+        prefetch_depth: int = 0,
     ) -> Dict:
         """
         Analyze a token to find early bidders.
@@ -634,6 +1473,7 @@ class HeliusAPI:
             min_usd: Minimum USD amount to consider (default: $50)
             time_window_hours: Hours from first transaction to consider (default: 999999, effectively unlimited)
             max_transactions: Maximum transactions to analyze (default: 500)
+            prefetch_depth: Transaction pages to fetch ahead while parsing (default: 0, sequential)
 
         Returns:
             Dictionary with analysis results:
@@ -652,8 +1492,14 @@ class HeliusAPI:
                     }
                 ],
                 'total_unique_buyers': int,
-                'total_transactions_analyzed': int
+                'total_transactions_analyzed': int,
+                'covered_until': int or None
             }
+
+            If pagination stopped early because the earliest buyers were settled
+            while the time window was still open, their total_usd,
+            transaction_count and average_buy_usd only count buys before the
+            'covered_until' block time; it is None when the totals are complete.
         """
         print(f"[Helius] Analyzing token: {mint_address}")
 
@@ -668,6 +1514,11 @@ class HeliusAPI:
         # First, find the token creation time
         token_creation_time, creation_time_credits = self.get_token_creation_time(mint_address)
 
+        self.last_fetch_stats = None
+
+        # Buyers are scored page by page so the fetch can stop once the earliest wallets are known
+        aggregator = EarlyBidderAggregator(self, mint_address, min_usd, time_window_hours, max_wallets_to_store)
+
         # Get transaction history - fetch earliest transactions starting from token creation
         print(f"[Helius] Fetching up to {max_transactions} EARLIEST transactions...")
         if token_creation_time:
@@ -677,12 +1528,19 @@ class HeliusAPI:
                 get_earliest=True,
                 token_creation_time=token_creation_time,
                 max_credits=max_credits,
+                aggregator=aggregator,
+                prefetch_depth=prefetch_depth,
             )
         else:
             # Fallback to old method if we can't determine creation time
             print(f"[Helius] Warning: Could not determine token creation time, using fallback method")
             transactions, transaction_credits = self.get_parsed_transactions(
-                mint_address, limit=max_transactions, get_earliest=True, max_credits=max_credits
+                mint_address,
+                limit=max_transactions,
+                get_earliest=True,
+                max_credits=max_credits,
+                aggregator=aggregator,
+                prefetch_depth=prefetch_depth,
             )
 
         print(f"[Helius] Retrieved {len(transactions)} earliest transactions (used {transaction_credits} API credits)")
@@ -700,131 +1558,463 @@ class HeliusAPI:
                 "api_credits_used": total_credits,
             }
 
-        # Find first transaction timestamp
-        # Transactions are already in chronological order (oldest first)
-        first_tx_time = None
-        for tx in transactions:
-            if tx.get("timestamp"):
-                first_tx_time = datetime.utcfromtimestamp(tx["timestamp"])
-                break
+        # Keep the parsed transactions so thresholds can be re-scored without re-fetching. An early stop
+        # leaves buyer totals accumulated only up to the last fetched block time - record that coverage
+        covered_until = None
+        if (self.last_fetch_stats or {}).get("stopped_early"):
+            covered_until = next((tx.timestamp for tx in reversed(transactions) if tx.timestamp), None)
+            self.last_fetch_stats["covered_until"] = covered_until
+        self.tx_store.save(mint_address, transactions, covered_until=covered_until)
 
-        if not first_tx_time:
+        scored = aggregator.result()
+        if "error" in scored:
             # Still need to report credits used even if can't determine time
             total_credits = metadata_credits + creation_time_credits + transaction_credits
             return {
                 "token_address": mint_address,
                 "token_info": token_info,
-                "error": "Could not determine first transaction time",
+                "error": scored["error"],
                 "early_bidders": [],
                 "total_unique_buyers": 0,
                 "total_transactions_analyzed": 0,
                 "api_credits_used": total_credits,
             }
 
-        window_end = first_tx_time + timedelta(hours=time_window_hours)
-        print(f"[Helius] Analysis window: {first_tx_time} to {window_end}")
+        early_bidders = scored["early_bidders"]
+        # A closed window means no later buy could have counted, so only an open one leaves the totals truncated
+        totals_covered_until = None if aggregator.window_closed else covered_until
+        if totals_covered_until is not None:
+            print(
+                f"[Helius] Buyer totals only cover buys before {datetime.utcfromtimestamp(totals_covered_until)} "
+                f"(stopped early) - extend the analysis for complete totals"
+            )
 
-        # Track buyers within time window
-        buyers = {}  # wallet_address -> {first_buy, total_usd, tx_count}
+        # Fetch wallet balances for the limited set of early bidders (batched, 1 round trip per 100 wallets)
+        print(f"[Helius] Fetching wallet balances for {len(early_bidders)} wallets...")
+        balances, balance_credits = self.get_wallet_balances([b["wallet_address"] for b in early_bidders])
+        for bidder in early_bidders:
+            lamports = balances.get(bidder["wallet_address"])
+            bidder["wallet_balance_usd"] = lamports_to_usd(lamports) if lamports is not None else None
 
-        # Debug: Track what we're seeing
-        total_checked = 0
-        within_window = 0
-        has_buyer = 0
-        meets_threshold = 0
-        debug_first_done = False
-
-        for tx in transactions:
-            if not tx.get("timestamp"):
-                continue
+        print(f"[Helius] Wallet balances fetched (used {balance_credits} credits)")
 
-            total_checked += 1
+        # Calculate actual API credits used
+        total_credits = metadata_credits + creation_time_credits + transaction_credits + balance_credits
 
-            tx_time = datetime.utcfromtimestamp(tx["timestamp"])
+        print(
+            f"[Helius] Total API credits used: {total_credits} ({metadata_credits} metadata + {creation_time_credits} creation time lookup + {transaction_credits} transactions + {balance_credits} wallet balances)"
+        )
 
-            # Skip transactions outside time window
-            if tx_time > window_end:
-                continue
+        return {
+            "token_address": mint_address,
+            "token_info": token_info,
+            "first_transaction_time": scored["first_transaction_time"].isoformat(),
+            "analysis_window_end": scored["analysis_window_end"].isoformat(),
+            "early_bidders": early_bidders,
+            "total_unique_buyers": len(early_bidders),
+            "total_transactions_analyzed": len(transactions),
+            "api_credits_used": total_credits,
+            "covered_until": totals_covered_until,
+            "fetch_stats": self.last_fetch_stats,
+            "fetch_cursor": (self.last_fetch_stats or {}).get("cursor"),
+        }
 
-            within_window += 1
+    def score_early_bidders(
+        self,
+        transactions: List[Union[Dict, BuyRecord]],
+        mint_address: str,
+        min_usd: float = 50.0,
+        time_window_hours: int = 999999,
+        max_wallets_to_store: int = 10,
+    ) -> Dict:
+        """
+        Rank early bidders from already-fetched transactions (no API calls).
 
-            # Parse transaction for swap/buy activity (debug first one)
-            buyer_wallet, usd_amount = self._extract_buy_info(tx, mint_address, debug_first=not debug_first_done)
-            if not debug_first_done:
-                debug_first_done = True
+        Applies the time window, extracts buys, drops off-curve wallets and
+        wallets below min_usd, and returns the earliest buyers first.
 
-            if buyer_wallet and usd_amount:
-                has_buyer += 1
+        Args:
+            transactions: BuyRecords or parsed transactions, oldest first
+            mint_address: Token mint address
+            min_usd: Minimum USD amount to consider (default: $50)
+            time_window_hours: Hours from first transaction to consider
+            max_wallets_to_store: Maximum wallets to return (default: 10)
 
-                # CRITICAL: Only include on-curve wallets (wallets that can sign transactions)
-                if not self.is_wallet_on_curve(buyer_wallet):
-                    if not debug_first_done:
-                        print(f"[Helius] Skipping off-curve wallet: {buyer_wallet}")
-                    continue
+        Returns:
+            Dictionary with 'first_transaction_time', 'analysis_window_end' (datetimes)
+            and 'early_bidders', or {'error': str} if no timestamp is available
+        """
+        aggregator = EarlyBidderAggregator(self, mint_address, min_usd, time_window_hours, max_wallets_to_store)
+        aggregator.add_transactions(transactions)
+        return aggregator.result()
 
-                if usd_amount >= min_usd:
-                    meets_threshold += 1
+    def rescore_early_bidders(
+        self,
+        mint_address: str,
+        min_usd: float = 50.0,
+        time_window_hours: int = 999999,
+        max_wallets_to_store: int = 10,
+        known_balances: Optional[Dict[str, Optional[float]]] = None,
+    ) -> Optional[Dict]:
+        """
+        Re-run early bidder scoring on the stored transactions of a previous analysis.
 
-                    if buyer_wallet not in buyers:
-                        buyers[buyer_wallet] = {
-                            "wallet_address": buyer_wallet,
-                            "first_buy_time": tx_time,
-                            "total_usd": 0.0,
-                            "transaction_count": 0,
-                        }
+        Uses 0 API credits: no transactions, metadata or balances are fetched.
 
-                    buyers[buyer_wallet]["total_usd"] += usd_amount
-                    buyers[buyer_wallet]["transaction_count"] += 1
+        Args:
+            mint_address: Token mint address
+            min_usd: Minimum USD amount to consider
+            time_window_hours: Hours from first transaction to consider
+            max_wallets_to_store: Maximum wallets to return
+            known_balances: Previously fetched wallet balances (wallet -> USD) to carry over
 
-                    # Keep earliest buy time
-                    if tx_time < buyers[buyer_wallet]["first_buy_time"]:
-                        buyers[buyer_wallet]["first_buy_time"] = tx_time
+        Returns:
+            Analysis results in the same shape as analyze_token_early_bidders,
+            or None if no transactions are stored for this token. If the stored
+            set stops before the end of the requested window (the fetch stopped
+            early), the result has an 'error' and 'needs_extend' is True.
+        """
+        transactions = self.tx_store.load(mint_address)
+        if transactions is None:
+            return None
 
-        print(
-            f"[Helius] Debug: Checked {total_checked} txs, {within_window} in window, {has_buyer} with buyers, {meets_threshold} meeting threshold"
-        )
+        covered_until = self.tx_store.covered_until(mint_address)
+        first_timestamp = next((tx.timestamp for tx in transactions if tx.timestamp), None)
+        if (
+            covered_until is not None
+            and first_timestamp is not None
+            and first_timestamp + time_window_hours * 3600 >= covered_until
+        ):
+            print(f"[Helius] Stored transactions for {mint_address} end before the requested window - not re-scoring")
+            return {
+                "token_address": mint_address,
+                "error": (
+                    f"Stored transactions only cover history up to {datetime.utcfromtimestamp(covered_until)} - "
+                    f"extend the analysis to re-score this time window"
+                ),
+                "needs_extend": True,
+                "early_bidders": [],
+                "total_unique_buyers": 0,
+                "total_transactions_analyzed": 0,
+                "api_credits_used": 0,
+            }
+
+        print(f"[Helius] Re-scoring {len(transactions)} stored transactions for {mint_address} (0 credits)")
+        scored = self.score_early_bidders(transactions, mint_address, min_usd, time_window_hours, max_wallets_to_store)
+        if "error" in scored:
+            return {
+                "token_address": mint_address,
+                "error": scored["error"],
+                "early_bidders": [],
+                "total_unique_buyers": 0,
+                "total_transactions_analyzed": 0,
+                "api_credits_used": 0,
+            }
 
-        # Convert to sorted list (earliest buyers first)
-        early_bidders = list(buyers.values())
+        known_balances = known_balances or {}
+        early_bidders = scored["early_bidders"]
         for bidder in early_bidders:
-            bidder["average_buy_usd"] = bidder["total_usd"] / bidder["transaction_count"]
+            bidder["wallet_balance_usd"] = known_balances.get(bidder["wallet_address"])
 
-        early_bidders.sort(key=lambda x: x["first_buy_time"])
+        return {
+            "token_address": mint_address,
+            "first_transaction_time": scored["first_transaction_time"].isoformat(),
+            "analysis_window_end": scored["analysis_window_end"].isoformat(),
+            "early_bidders": early_bidders,
+            "total_unique_buyers": len(early_bidders),
+            "total_transactions_analyzed": len(transactions),
+            "api_credits_used": 0,
+        }
 
-        print(f"[Helius] Found {len(early_bidders)} early bidders (>${min_usd} USD)")
+    def extend_early_bidders(
+        self,
+        mint_address: str,
+        resume_cursor: Dict,
+        max_new_transactions: int,
+        min_usd: float = 50.0,
+        time_window_hours: int = 999999,
+        max_credits: int = 1000,
+        max_wallets_to_store: int = 10,
+        known_balances: Optional[Dict[str, Optional[float]]] = None,
+        prefetch_depth: int = 0,
+    ) -> Optional[Dict]:
+        """
+        Deepen a previous analysis: fetch only transactions after its cursor and re-score.
 
-        # Limit to max_wallets BEFORE fetching balances to save API credits
-        max_wallets = max_wallets_to_store or 10  # Default to 10 if not specified
-        if len(early_bidders) > max_wallets:
-            print(f"[Helius] Limiting to top {max_wallets} earliest wallets (from {len(early_bidders)} total)")
-            early_bidders = early_bidders[:max_wallets]
+        New transactions are merged with the stored ones (deduplicated by
+        signature), so positions and transaction counts cover the whole history
+        fetched so far. Balances are only fetched for wallets without a known one.
 
-        # Fetch wallet balances for the limited set of early bidders
-        print(f"[Helius] Fetching wallet balances for {len(early_bidders)} wallets...")
-        balance_credits = 0
+        Args:
+            mint_address: Token mint address
+            resume_cursor: fetch_cursor of the previous run
+            max_new_transactions: Maximum transactions to fetch after the cursor
+            min_usd: Minimum USD amount to consider
+            time_window_hours: Hours from first transaction to consider
+            max_credits: Maximum API credits to spend on transactions
+            max_wallets_to_store: Maximum wallets to return
+            known_balances: Previously fetched wallet balances (wallet -> USD) to carry over
+            prefetch_depth: Transaction pages to fetch ahead while parsing (0 = sequential)
+
+        Returns:
+            Analysis results in the same shape as analyze_token_early_bidders,
+            or None if no transactions are stored for this token
+        """
+        stored = self.tx_store.load(mint_address)
+        if stored is None:
+            return None
+
+        print(f"[Helius] Extending analysis of {mint_address} ({len(stored)} stored transactions)")
+        last_block_time = resume_cursor.get("last_block_time")
+        if last_block_time and not resume_cursor.get("boundary_signatures"):
+            # Persisted cursors do not keep the boundary block - recover it from the stored transactions
+            resume_cursor = dict(
+                resume_cursor,
+                boundary_signatures=[tx.signature for tx in stored if tx.timestamp == last_block_time],
+            )
+        token_info, metadata_credits = self.get_token_metadata(mint_address)
+        token_creation_time, creation_time_credits = self.get_token_creation_time(mint_address)
+
+        self.last_fetch_stats = None
+        new_transactions, transaction_credits = self.get_parsed_transactions(
+            mint_address,
+            limit=max_new_transactions,
+            get_earliest=True,
+            token_creation_time=token_creation_time,
+            max_credits=max_credits,
+            prefetch_depth=prefetch_depth,
+            resume_cursor=resume_cursor,
+        )
+
+        seen = {tx.signature for tx in stored}
+        added = [tx for tx in new_transactions if tx.signature not in seen]
+        transactions = stored + added
+        print(f"[Helius] Added {len(added)} new transactions (used {transaction_credits} API credits)")
+        # Extending fetches without early stopping, so the merged set has no gaps
+        self.tx_store.save(mint_address, transactions)
+
+        scored = self.score_early_bidders(transactions, mint_address, min_usd, time_window_hours, max_wallets_to_store)
+        credits = metadata_credits + creation_time_credits + transaction_credits
+        fetch_cursor = (self.last_fetch_stats or {}).get("cursor") or new_fetch_cursor(resume_cursor)
+        if "error" in scored:
+            return {
+                "token_address": mint_address,
+                "token_info": token_info,
+                "error": scored["error"],
+                "early_bidders": [],
+                "total_unique_buyers": 0,
+                "total_transactions_analyzed": 0,
+                "api_credits_used": credits,
+                "fetch_cursor": fetch_cursor,
+            }
+
+        known_balances = {w: usd for w, usd in (known_balances or {}).items() if usd is not None}
+        early_bidders = scored["early_bidders"]
+        missing = [b["wallet_address"] for b in early_bidders if b["wallet_address"] not in known_balances]
+        balances, balance_credits = self.get_wallet_balances(missing) if missing else ({}, 0)
         for bidder in early_bidders:
-            wallet_balance_usd, credits = self.get_wallet_balance(bidder["wallet_address"])
-            bidder["wallet_balance_usd"] = wallet_balance_usd
-            balance_credits += credits
+            wallet = bidder["wallet_address"]
+            if wallet in known_balances:
+                bidder["wallet_balance_usd"] = known_balances[wallet]
+            else:
+                lamports = balances.get(wallet)
+                bidder["wallet_balance_usd"] = lamports_to_usd(lamports) if lamports is not None else None
 
-        print(f"[Helius] Wallet balances fetched (used {balance_credits} credits)")
+        return {
+            "token_address": mint_address,
+            "token_info": token_info,
+            "first_transaction_time": scored["first_transaction_time"].isoformat(),
+            "analysis_window_end": scored["analysis_window_end"].isoformat(),
+            "early_bidders": early_bidders,
+            "total_unique_buyers": len(early_bidders),
+            "total_transactions_analyzed": len(transactions),
+            "new_transactions": len(added),
+            "api_credits_used": credits + balance_credits,
+            "fetch_stats": self.last_fetch_stats,
+            "fetch_cursor": fetch_cursor,
+        }
 
-        # Calculate actual API credits used
-        total_credits = metadata_credits + creation_time_credits + transaction_credits + balance_credits
+    def deep_analyze_early_bidders(
+        self,
+        mint_address: str,
+        min_usd: float = 50.0,
+        time_window_hours: int = 999999,
+        max_transactions: int = 5000,
+        max_credits: int = 1000,
+        max_wallets_to_store: int = 10,
+        prefetch_depth: int = 0,
+        on_progress: Optional[Callable[[Dict], None]] = None,
+    ) -> Dict:
+        """
+        Analyze a token over up to DEEP_MAX_TRANSACTIONS earliest transactions.
+
+        Pages are streamed through the early bidder aggregator and dropped once
+        scored, so memory stays constant however deep the fetch goes (the parsed
+        transactions are not kept, so the result can't be re-scored or extended).
+        Progress is checkpointed after every page: if the run is interrupted,
+        the next deep analysis of the token with the same thresholds continues
+        after the last checkpointed page, and its credits count towards the same
+        max_credits budget. Running out of budget ends the run cleanly with the
+        buyers found so far.
+
+        Args:
+            mint_address: Token mint address to analyze
+            min_usd: Minimum USD amount to consider (default: $50)
+            time_window_hours: Hours from first transaction to consider
+            max_transactions: Maximum transactions to analyze (capped at DEEP_MAX_TRANSACTIONS)
+            max_credits: Maximum API credits to spend on transactions, across resumed runs
+            max_wallets_to_store: Maximum wallets to store (default: 10)
+            prefetch_depth: Transaction pages to fetch ahead while parsing (default: 0, sequential)
+            on_progress: Called after every page with a progress dict
+
+        Returns:
+            Analysis results in the same shape as analyze_token_early_bidders
+            (including 'covered_until' after an early stop), plus 'resumed' and
+            'credit_limit_reached' (no 'fetch_cursor')
+
+        Raises:
+            RuntimeError: If the fetch fails mid-run (the checkpoint is kept for the next run)
+        """
+        print(f"[Helius] Deep analysis of token: {mint_address} (up to {max_transactions} transactions)")
+
+        token_info, metadata_credits = self.get_token_metadata(mint_address)
+        token_creation_time, creation_time_credits = self.get_token_creation_time(mint_address)
+
+        aggregator = EarlyBidderAggregator(self, mint_address, min_usd, time_window_hours, max_wallets_to_store)
+        params = {"min_usd": min_usd, "time_window_hours": time_window_hours, "max_wallets": aggregator.max_wallets}
+
+        resume_cursor = None
+        checkpoint_credits = 0
+        checkpoint = self.checkpoints.load(mint_address, params)
+        if checkpoint is not None:
+            aggregator.restore(checkpoint["aggregator_state"])
+            resume_cursor = checkpoint["cursor"]
+            checkpoint_credits = checkpoint["credits_used"]
+            print(
+                f"[Helius] Resuming from checkpoint: {resume_cursor['transactions_fetched']} transactions, "
+                f"{checkpoint_credits} credits already spent"
+            )
+
+        fetch_stats = {
+            "api_calls": 0,
+            "cached_pages": 0,
+            "fetch_seconds": 0.0,
+            "wait_seconds": 0.0,
+            "cursor": new_fetch_cursor(resume_cursor),
+        }
+        self.last_fetch_stats = fetch_stats
+        cursor = fetch_stats["cursor"]
+        budget = max_credits - checkpoint_credits
+        remaining = min(max_transactions, DEEP_MAX_TRANSACTIONS) - cursor["transactions_fetched"]
+        pages_scored = 0
+        covered_until = None
+
+        # A checkpoint without a pagination token was taken after the last page of history
+        if (resume_cursor is None or resume_cursor.get("pagination_token")) and remaining > 0 and budget >= 100:
+            pages = self._iter_earliest_transaction_pages(
+                mint_address,
+                remaining,
+                token_creation_time,
+                budget,
+                fetch_stats,
+                prefetch_depth=prefetch_depth,
+                resume_cursor=resume_cursor,
+                max_transactions=DEEP_MAX_TRANSACTIONS,
+            )
+            try:
+                for page in pages:
+                    if not token_creation_time and resume_cursor is None and pages_scored == 0 and page:
+                        # An unfiltered ascending fetch starts at the mint's first transaction
+                        if page[0].timestamp:
+                            self.creation_times.put(mint_address, page[0].timestamp, page[0].signature)
+
+                    aggregator.add_transactions(page)
+                    pages_scored += 1
+                    credits_spent = checkpoint_credits + fetch_stats["api_calls"] * 100
+                    self.checkpoints.save(mint_address, params, cursor, aggregator.state(), credits_spent)
+
+                    progress = {
+                        "pages": pages_scored,
+                        "transactions_fetched": cursor["transactions_fetched"],
+                        "max_transactions": max_transactions,
+                        "credits_used": credits_spent,
+                        "max_credits": max_credits,
+                        "early_bidders_found": min(len(aggregator.buyers), aggregator.max_wallets),
+                    }
+                    print(
+                        f"[Helius] Deep analysis page {pages_scored}: {progress['transactions_fetched']} transactions, "
+                        f"{credits_spent}/{max_credits} credits, {progress['early_bidders_found']} early bidders"
+                    )
+                    if on_progress is not None:
+                        on_progress(progress)
+
+                    if aggregator.settled:
+                        # Earliest buyers are known - skip the remaining pages. With the window still
+                        # open, their totals only cover history up to the last scored block time
+                        pages.close()
+                        print(f"[Helius] Early bidders settled - stopped paginating early")
+                        if not aggregator.window_closed:
+                            covered_until = cursor["last_block_time"]
+                        break
+            except Exception as e:
+                print(f"[Helius] ERROR in deep analysis: {str(e)}")
+                raise RuntimeError(
+                    f"Deep analysis interrupted after {cursor['transactions_fetched']} transactions ({e}) - "
+                    f"analyze the token again in deep mode to resume from the checkpoint"
+                ) from e
+
+        transaction_credits = fetch_stats["api_calls"] * 100
+        credits_spent = checkpoint_credits + transaction_credits
+        credit_limit_reached = (
+            not aggregator.settled
+            and cursor["pagination_token"] is not None
+            and cursor["transactions_fetched"] < min(max_transactions, DEEP_MAX_TRANSACTIONS)
+            and max_credits - credits_spent < 100
+        )
+        if credit_limit_reached:
+            print(f"[Helius] ⚠️  WARNING: Reached credit limit ({max_credits} credits)")
+
+        # Finished (or out of budget) - the next deep run starts over
+        self.checkpoints.delete(mint_address)
+
+        scored = aggregator.result()
+        credits = metadata_credits + creation_time_credits + transaction_credits
+        if "error" in scored:
+            return {
+                "token_address": mint_address,
+                "token_info": token_info,
+                "error": scored["error"],
+                "early_bidders": [],
+                "total_unique_buyers": 0,
+                "total_transactions_analyzed": 0,
+                "api_credits_used": credits,
+            }
+
+        early_bidders = scored["early_bidders"]
+        balances, balance_credits = self.get_wallet_balances([b["wallet_address"] for b in early_bidders])
+        for bidder in early_bidders:
+            lamports = balances.get(bidder["wallet_address"])
+            bidder["wallet_balance_usd"] = lamports_to_usd(lamports) if lamports is not None else None
 
         print(
-            f"[Helius] Total API credits used: {total_credits} ({metadata_credits} metadata + {creation_time_credits} creation time lookup + {transaction_credits} transactions + {balance_credits} wallet balances)"
+            f"[Helius] Deep analysis done: {aggregator.transactions_seen} transactions, "
+            f"{len(early_bidders)} early bidders, {credits + balance_credits} credits this run"
         )
 
         return {
             "token_address": mint_address,
             "token_info": token_info,
-            "first_transaction_time": first_tx_time.isoformat(),
-            "analysis_window_end": window_end.isoformat(),
+            "first_transaction_time": scored["first_transaction_time"].isoformat(),
+            "analysis_window_end": scored["analysis_window_end"].isoformat(),
             "early_bidders": early_bidders,
             "total_unique_buyers": len(early_bidders),
-            "total_transactions_analyzed": len(transactions),
-            "api_credits_used": total_credits,
+            "total_transactions_analyzed": aggregator.transactions_seen,
+            "api_credits_used": credits + balance_credits,
+            "resumed": checkpoint is not None,
+            "credit_limit_reached": credit_limit_reached,
+            "covered_until": covered_until,
+            # No fetch_cursor: without stored transactions there is nothing to extend or re-score
+            "fetch_stats": fetch_stats,
         }
 
     def _extract_buy_info(self, tx: dict, mint_address: str, debug_first: bool = False) -> tuple:
@@ -839,6 +2029,7 @@ class HeliusAPI:
         come from the main wallet. We need to find the largest SOL sender in the transaction
         as the buyer (they're paying for the tokens).
         """
+        debug_first = debug_first and is_debug_enabled()  # Don't format debug output that won't be printed
         try:
             native_transfers = tx.get("nativeTransfers", [])
             token_transfers = tx.get("tokenTransfers", [])
@@ -919,6 +2110,35 @@ class HeliusAPI:
         return (None, None)
 
 
+def parse_transaction_list(transactions: List[Dict], columnar_parser: bool = False) -> List[Dict]:
+    """
+    Parse raw RPC transactions into the simplified transfer format, dropping ones that fail to parse.
+    Shared by HeliusAPI and the parse pool workers.
+
+    Args:
+        transactions: Raw transaction objects (getTransactionsForAddress 'data')
+        columnar_parser: Use the NumPy columnar parser (same results as the dict path)
+
+    Returns:
+        List of parsed transactions
+    """
+    if columnar_parser and NUMPY_AVAILABLE:
+        return [tx for tx in parse_transaction_page(transactions, HeliusAPI._parse_rpc_transaction) if tx]
+
+    # Parse each transaction
+    page = []
+    for tx_data in transactions:
+        try:
+            # tx_data is already the full transaction object
+            signature = tx_data.get("signature")
+            parsed_tx = HeliusAPI._parse_rpc_transaction(tx_data, signature)
+            if parsed_tx:
+                page.append(parsed_tx)
+        except Exception as parse_error:
+            continue
+    return page
+
+
 def generate_token_acronym(token_name: str, token_symbol: str = None) -> str:
     """
     Generate acronym from token name.
@@ -1009,8 +2229,8 @@ def generate_axiom_export(
 class TokenAnalyzer:
     """High-level token analysis interface"""
 
-    def __init__(self, api_key: str):
-        self.helius = HeliusAPI(api_key)
+    def __init__(self, api_key: Union[str, HeliusKeyPool], columnar_parser: bool = False, parse_workers: int = 0):
+        self.helius = HeliusAPI(api_key, columnar_parser=columnar_parser, parse_workers=parse_workers)
         self.api_credits_used = 0  # Track API credits used during analysis
 
     def analyze_token(
@@ -1021,6 +2241,7 @@ class TokenAnalyzer:
         max_transactions: int = 500,
         max_credits: int = 1000,
         max_wallets_to_store: int = 10,
+        prefetch_depth: int = 0,
     ) -> Dict:
         """
         Analyze a token to find early bidders.
@@ -1032,6 +2253,7 @@ class TokenAnalyzer:
             max_transactions: Maximum transactions to analyze (default: 500)
             max_credits: Maximum API credits to spend (default: 1000)
             max_wallets_to_store: Maximum wallets to store (default: 10)
+            prefetch_depth: Transaction pages to fetch ahead while parsing (default: 0, sequential)
 
         Returns:
             Analysis results dictionary
@@ -1043,17 +2265,83 @@ class TokenAnalyzer:
             max_transactions=max_transactions,
             max_credits=max_credits,
             max_wallets_to_store=max_wallets_to_store,
+            prefetch_depth=prefetch_depth,
+        )
+
+    def extend_token(
+        self,
+        mint_address: str,
+        resume_cursor: Dict,
+        max_new_transactions: int,
+        min_usd: float = 50.0,
+        time_window_hours: int = 999999,
+        max_credits: int = 1000,
+        max_wallets_to_store: int = 10,
+        known_balances: Optional[Dict[str, Optional[float]]] = None,
+        prefetch_depth: int = 0,
+    ) -> Optional[Dict]:
+        """
+        Deepen a previous analysis, fetching only transactions after its cursor.
+
+        Returns:
+            Analysis results dictionary, or None if the token has no stored transactions
+        """
+        return self.helius.extend_early_bidders(
+            mint_address=mint_address,
+            resume_cursor=resume_cursor,
+            max_new_transactions=max_new_transactions,
+            min_usd=min_usd,
+            time_window_hours=time_window_hours,
+            max_credits=max_credits,
+            max_wallets_to_store=max_wallets_to_store,
+            known_balances=known_balances,
+            prefetch_depth=prefetch_depth,
+        )
+
+    def deep_analyze_token(
+        self,
+        mint_address: str,
+        min_usd: float = 50.0,
+        time_window_hours: int = 999999,
+        max_transactions: int = 5000,
+        max_credits: int = 1000,
+        max_wallets_to_store: int = 10,
+        prefetch_depth: int = 0,
+        on_progress: Optional[Callable[[Dict], None]] = None,
+    ) -> Dict:
+        """
+        Analyze a token over thousands of earliest transactions in constant memory, with checkpoints.
+
+        Returns:
+            Analysis results dictionary
+        """
+        return self.helius.deep_analyze_early_bidders(
+            mint_address=mint_address,
+            min_usd=min_usd,
+            time_window_hours=time_window_hours,
+            max_transactions=max_transactions,
+            max_credits=max_credits,
+            max_wallets_to_store=max_wallets_to_store,
+            prefetch_depth=prefetch_depth,
+            on_progress=on_progress,
         )
 
 
 class WebhookManager:
     """Manages Helius webhooks for wallet monitoring"""
 
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, transport: Optional[HeliusTransport] = None):
         self.api_key = api_key
-        self.webhook_url = "https://api.helius.xyz/v0/webhooks"
-        self.session = requests.Session()
-        self.session.headers.update({"Content-Type": "application/json", "Authorization": f"Bearer {api_key}"})
+        self.webhook_url = f"{HELIUS_API_URL}/webhooks"
+        # Shared process-wide connection pool (same one used by HeliusAPI)
+        self.transport = transport or get_transport()
+        self.headers = {"Content-Type": "application/json", "Authorization": f"Bearer {api_key}"}
+
+    def _request(self, method: str, url: str, json: Dict = None, retry: Optional[bool] = None):
+        """Send a webhook API request through the shared transport (retry: see HeliusTransport.request)"""
+        return self.transport.request_sync(
+            method, url, json=json, headers=self.headers, api_key=self.api_key, retry=retry
+        )
 
     def create_webhook(
         self,
@@ -1085,9 +2373,10 @@ class WebhookManager:
         }
 
         try:
-            response = self.session.post(f"{self.webhook_url}?api-key={self.api_key}", json=payload, timeout=30)
+            # Not retried: a create that failed or timed out may still have registered the webhook
+            response = self._request("POST", f"{self.webhook_url}?api-key={self.api_key}", json=payload, retry=False)
             response.raise_for_status()
-            result = response.json()
+            result = orjson.loads(response.content)
             print(f"[Webhook] Created webhook {result.get('webhookID')} for {len(wallet_addresses)} addresses")
             return result
         except Exception as e:
@@ -1121,11 +2410,11 @@ class WebhookManager:
             payload["transactionTypes"] = transaction_types
 
         try:
-            response = self.session.put(
-                f"{self.webhook_url}/{webhook_id}?api-key={self.api_key}", json=payload, timeout=30
+            response = self._request(
+                "PUT", f"{self.webhook_url}/{webhook_id}?api-key={self.api_key}", json=payload, retry=False
             )
             response.raise_for_status()
-            result = response.json()
+            result = orjson.loads(response.content)
             print(f"[Webhook] Updated webhook {webhook_id}")
             return result
         except Exception as e:
@@ -1142,7 +2431,7 @@ class WebhookManager:
             True if successful
         """
         try:
-            response = self.session.delete(f"{self.webhook_url}/{webhook_id}?api-key={self.api_key}", timeout=30)
+            response = self._request("DELETE", f"{self.webhook_url}/{webhook_id}?api-key={self.api_key}")
             response.raise_for_status()
             print(f"[Webhook] Deleted webhook {webhook_id}")
             return True
@@ -1160,9 +2449,9 @@ class WebhookManager:
             Webhook details
         """
         try:
-            response = self.session.get(f"{self.webhook_url}/{webhook_id}?api-key={self.api_key}", timeout=30)
+            response = self._request("GET", f"{self.webhook_url}/{webhook_id}?api-key={self.api_key}")
             response.raise_for_status()
-            return response.json()
+            return orjson.loads(response.content)
         except Exception as e:
             raise Exception(f"Failed to get webhook: {str(e)}")
 
@@ -1174,8 +2463,8 @@ class WebhookManager:
             List of webhook objects
         """
         try:
-            response = self.session.get(f"{self.webhook_url}?api-key={self.api_key}", timeout=30)
+            response = self._request("GET", f"{self.webhook_url}?api-key={self.api_key}")
             response.raise_for_status()
-            return response.json()
+            return orjson.loads(response.content)
         except Exception as e:
             raise Exception(f"Failed to list webhooks: {str(e)}")
@@ -0,0 +1,248 @@
+"""
+Columnar Transaction Parser
+Vectorized batch version of HeliusAPI._parse_rpc_transaction
+
+A whole getTransactionsForAddress page is flattened into typed NumPy arrays
+(token balance entries with their transaction/account index and amount, and
+per-account lamport balances) so pre/post diffs are computed with array
+operations instead of per-entry dict building and uiTokenAmount reparsing.
+
+Results are identical to the dict path: a page containing anything the
+columnar path does not reproduce exactly (duplicate or negative account
+indexes, non-integer balances, missing keys that would make the dict path
+drop a transaction, ...) is parsed by the dict path instead.
+
+Opt-in via the columnarParser setting. The input is already a decoded Python
+object tree, so flattening it costs about as much as the dict path's own
+loops; on typical pump.fun pages the dict path is still as fast or faster.
+"""
+
+from typing import Callable, Dict, List, Optional
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy is optional, the dict path is used without it
+    np = None
+
+NUMPY_AVAILABLE = np is not None
+
+# Token decimals handled by the columnar path (SPL decimals are a u8, in practice <= 18)
+MAX_DECIMALS = 64
+
+# Exact float(10**d), matching the dict path's int power division
+_POW10 = np.array([float(10**d) for d in range(MAX_DECIMALS + 1)]) if NUMPY_AVAILABLE else None
+
+
+class _Fallback(Exception):
+    """Raised when a page has a shape the columnar path can't reproduce exactly"""
+
+
+def _account_address(accounts: list, index: int) -> Optional[str]:
+    account_key = accounts[index]
+    if isinstance(account_key, dict):
+        return account_key.get("pubkey")
+    return account_key
+
+
+def _int_array(values: list) -> "np.ndarray":
+    """Convert to int64, refusing anything the dict path would treat differently (floats, bools, bigints)"""
+    array = np.asarray(values) if values else np.zeros(0, dtype=np.int64)
+    if array.dtype.kind != "i":
+        raise _Fallback()
+    return array.astype(np.int64, copy=False)
+
+
+def parse_transaction_page(
+    transactions: List[Dict], fallback: Callable[[dict, str], Optional[dict]]
+) -> List[Optional[Dict]]:
+    """
+    Parse a page of raw RPC transactions into the simplified transfer format.
+
+    Args:
+        transactions: Raw transaction objects (getTransactionsForAddress 'data')
+        fallback: Per-transaction dict parser (HeliusAPI._parse_rpc_transaction)
+
+    Returns:
+        List aligned with `transactions`; each entry is the parsed transaction or
+        None where the dict path would have dropped it
+    """
+    try:
+        return _parse_columnar(transactions)
+    except Exception:
+        # Malformed or unusual page - the dict path defines the expected result
+        results = []
+        for tx_data in transactions:
+            try:
+                results.append(fallback(tx_data, tx_data.get("signature")))
+            except Exception:
+                results.append(None)
+        return results
+
+
+def _parse_columnar(transactions: List[Dict]) -> List[Optional[Dict]]:
+    count = len(transactions)
+    account_lists: List[list] = []
+
+    # Token balance entries, flattened across the page
+    token_entries: List[dict] = []
+    token_tx: List[int] = []
+    token_is_post: List[bool] = []
+
+    # Lamport balances, flattened across the page (native_counts[i] accounts compared for transaction i)
+    native_counts: List[int] = []
+    native_pre: List[int] = []
+    native_post: List[int] = []
+
+    for position, tx_data in enumerate(transactions):
+        transaction = tx_data.get("transaction", {})
+        meta = tx_data.get("meta", {})
+        message = transaction.get("message", {})
+
+        # The dict path reads instructions for mint hints; malformed ones make it drop the transaction
+        for instruction in message.get("instructions", []):
+            if isinstance(instruction, dict):
+                parsed = instruction.get("parsed")
+                if parsed and isinstance(parsed, dict) and not isinstance(parsed.get("info", {}), (dict, list, str)):
+                    raise _Fallback()
+
+        accounts = message.get("accountKeys", [])
+        if type(accounts) is not list:
+            raise _Fallback()
+        account_lists.append(accounts)
+
+        if "postTokenBalances" in meta and "preTokenBalances" in meta:
+            pre_tokens = meta.get("preTokenBalances", [])
+            post_tokens = meta.get("postTokenBalances", [])
+            token_entries += pre_tokens
+            token_entries += post_tokens
+            token_tx += [position] * (len(pre_tokens) + len(post_tokens))
+            token_is_post += [False] * len(pre_tokens)
+            token_is_post += [True] * len(post_tokens)
+
+        if "preBalances" in meta and "postBalances" in meta:
+            pre_balances = meta.get("preBalances", [])
+            post_balances = meta.get("postBalances", [])
+            compared = min(len(pre_balances), len(post_balances))
+            native_counts.append(compared)
+            native_pre += pre_balances if len(pre_balances) == compared else pre_balances[:compared]
+            native_post += post_balances if len(post_balances) == compared else post_balances[:compared]
+        else:
+            native_counts.append(0)
+
+    account_counts = np.fromiter((len(accounts) for accounts in account_lists), dtype=np.int64, count=count)
+    token_transfers = _token_transfers(token_entries, token_tx, token_is_post, account_lists, account_counts)
+    native_transfers = _native_transfers(native_counts, native_pre, native_post, account_lists, account_counts)
+
+    return [
+        {
+            "signature": tx_data.get("signature"),
+            "timestamp": tx_data.get("blockTime"),
+            "type": "UNKNOWN",  # We'll infer type from transfers
+            "tokenTransfers": token_transfers.get(position, []),
+            "nativeTransfers": native_transfers.get(position, []),
+        }
+        for position, tx_data in enumerate(transactions)
+    ]
+
+
+def _token_transfers(
+    entries: List[dict], entry_tx: List[int], entry_is_post: List[bool], account_lists: List[list], account_counts
+) -> Dict[int, List[Dict]]:
+    """Diff pre/post token balances for every (transaction, account) pair on the page"""
+    if not entries:
+        return {}
+
+    tx_index = np.asarray(entry_tx, dtype=np.int64)
+    is_post = np.asarray(entry_is_post, dtype=bool)
+    account_index = _int_array([entry["accountIndex"] for entry in entries])
+    if account_index.min() < 0:
+        raise _Fallback()
+
+    # Each (transaction, side, account) must be unique - the dict path keeps only the last duplicate
+    stride = int(account_index.max()) + 1
+    keys = tx_index * stride + account_index
+    side_keys = keys * 2 + is_post
+    if len(np.unique(side_keys)) != len(side_keys):
+        raise _Fallback()
+
+    # uiAmount when present (None -> NaN), otherwise raw amount scaled by decimals
+    ui_token_amounts = [entry.get("uiTokenAmount", {}) for entry in entries]
+    amounts = np.array([ui.get("uiAmount") for ui in ui_token_amounts], dtype=np.float64)
+    ui_missing = np.isnan(amounts)
+    if ui_missing.any():
+        missing = np.flatnonzero(ui_missing).tolist()
+        raw = np.array([ui_token_amounts[i].get("amount", 0) for i in missing], dtype=np.float64)
+        decimals = _int_array([ui_token_amounts[i].get("decimals", 0) for i in missing])
+        if np.isnan(raw).any() or decimals.min() < 0 or decimals.max() > MAX_DECIMALS:
+            raise _Fallback()
+        amounts[ui_missing] = np.where(decimals > 0, raw / _POW10[decimals], raw)
+
+    # Match each post entry with the pre entry for the same (transaction, account); missing pre = 0.0
+    pre_keys = keys[~is_post]
+    pre_amounts = amounts[~is_post]
+    order = np.argsort(pre_keys)
+    pre_keys = pre_keys[order]
+    pre_amounts = pre_amounts[order]
+
+    post_rows = np.flatnonzero(is_post)
+    post_keys = keys[post_rows]
+    post_amounts = amounts[post_rows]
+    matched_pre = np.zeros(len(post_rows), dtype=np.float64)
+    if len(pre_keys):
+        slot = np.minimum(np.searchsorted(pre_keys, post_keys), len(pre_keys) - 1)
+        found = pre_keys[slot] == post_keys
+        matched_pre[found] = pre_amounts[slot[found]]
+
+    post_accounts = account_index[post_rows]
+    changed = (post_amounts != matched_pre) & (post_accounts < account_counts[tx_index[post_rows]])
+
+    transfers: Dict[int, List[Dict]] = {}
+    for row, account, post_amount, pre_amount in zip(
+        post_rows[changed].tolist(),
+        post_accounts[changed].tolist(),
+        post_amounts[changed].tolist(),
+        matched_pre[changed].tolist(),
+    ):
+        position = entry_tx[row]
+        account_address = _account_address(account_lists[position], account)
+        transfers.setdefault(position, []).append(
+            {
+                "mint": entries[row].get("mint"),
+                "toUserAccount": account_address if post_amount > pre_amount else None,
+                "fromUserAccount": account_address if post_amount < pre_amount else None,
+                "tokenAmount": abs(post_amount - pre_amount),
+            }
+        )
+    return transfers
+
+
+def _native_transfers(
+    counts: List[int], pre_balances: List[int], post_balances: List[int], account_lists: List[list], account_counts
+) -> Dict[int, List[Dict]]:
+    """Diff pre/post lamport balances for every account on the page"""
+    if not pre_balances:
+        return {}
+
+    # Row -> (transaction, account) without materializing index lists in Python
+    counts = np.asarray(counts, dtype=np.int64)
+    offsets = np.cumsum(counts) - counts
+    tx_index = np.repeat(np.arange(len(counts)), counts)
+    account_index = np.arange(len(pre_balances), dtype=np.int64) - np.repeat(offsets, counts)
+    pre = _int_array(pre_balances)
+    post = _int_array(post_balances)
+
+    changed = (pre != post) & (account_index < account_counts[tx_index])
+
+    transfers: Dict[int, List[Dict]] = {}
+    for position, index, pre_balance, post_balance in zip(
+        tx_index[changed].tolist(), account_index[changed].tolist(), pre[changed].tolist(), post[changed].tolist()
+    ):
+        account_address = _account_address(account_lists[position], index)
+        transfers.setdefault(position, []).append(
+            {
+                "fromUserAccount": account_address if post_balance < pre_balance else None,
+                "toUserAccount": account_address if post_balance > pre_balance else None,
+                "amount": abs(post_balance - pre_balance),
+            }
+        )
+    return transfers
@@ -0,0 +1,162 @@
+"""
+Deep Analysis Checkpoint Store
+Per-mint progress of deep (uncapped) early bidder analyses
+
+A deep analysis streams thousands of pages through the early bidder
+aggregator. After every page, the fetch cursor, the aggregator state and the
+credits spent so far are written here. If the run dies mid-way, queuing the
+same token again (with the same thresholds) continues after the last
+checkpointed page instead of paying for the whole history again.
+Checkpoints are deleted once a run finishes. Stored next to the page cache.
+"""
+
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+import orjson
+
+from helius_page_cache import PAGE_CACHE_FILE
+
+
+class DeepAnalysisCheckpointStore:
+    """SQLite-backed store of deep analysis checkpoints, one row per mint"""
+
+    def __init__(self, db_path: str = PAGE_CACHE_FILE):
+        """
+        Args:
+            db_path: SQLite file holding the store table
+        """
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._initialized = False
+
+    @contextmanager
+    def _connect(self):
+        """Context manager for store database connections"""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            if not self._initialized:
+                self._init_schema(conn)
+            yield conn
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+    def _init_schema(self, conn: sqlite3.Connection):
+        with self._lock:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS deep_analysis_checkpoints (
+                    mint_address TEXT PRIMARY KEY,
+                    params TEXT NOT NULL,
+                    cursor TEXT NOT NULL,
+                    aggregator_state TEXT NOT NULL,
+                    credits_used INTEGER NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+            """)
+            self._initialized = True
+
+    def load(self, mint_address: str, params: Dict) -> Optional[Dict]:
+        """
+        Look up the checkpoint of an interrupted deep analysis
+
+        Args:
+            mint_address: Token mint address
+            params: Scoring parameters of the new run; a checkpoint taken with
+                    different ones is discarded
+
+        Returns:
+            Dict with 'cursor', 'aggregator_state' and 'credits_used', or None
+        """
+        try:
+            with self._connect() as conn:
+                row = conn.execute(
+                    """
+                    SELECT params, cursor, aggregator_state, credits_used
+                    FROM deep_analysis_checkpoints WHERE mint_address = ?
+                """,
+                    (mint_address,),
+                ).fetchone()
+        except sqlite3.Error as e:
+            print(f"[Checkpoints] Read failed: {e}")
+            return None
+
+        if row is None:
+            return None
+        if orjson.loads(row[0]) != params:
+            print(f"[Checkpoints] Discarding checkpoint for {mint_address} (scoring parameters changed)")
+            self.delete(mint_address)
+            return None
+
+        return {"cursor": orjson.loads(row[1]), "aggregator_state": orjson.loads(row[2]), "credits_used": row[3]}
+
+    def save(self, mint_address: str, params: Dict, cursor: Dict, aggregator_state: Dict, credits_used: int) -> bool:
+        """
+        Record progress after a page (replaces the previous checkpoint)
+
+        Args:
+            mint_address: Token mint address
+            params: Scoring parameters of the run
+            cursor: Fetch cursor after the last scored page
+            aggregator_state: EarlyBidderAggregator.state() after that page
+            credits_used: API credits spent by the run so far
+
+        Returns:
+            True if the checkpoint was stored
+        """
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    """
+                    INSERT OR REPLACE INTO deep_analysis_checkpoints
+                    (mint_address, params, cursor, aggregator_state, credits_used, updated_at)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                    (
+                        mint_address,
+                        orjson.dumps(params).decode(),
+                        orjson.dumps(cursor).decode(),
+                        orjson.dumps(aggregator_state).decode(),
+                        credits_used,
+                        time.time(),
+                    ),
+                )
+        except sqlite3.Error as e:
+            print(f"[Checkpoints] Write failed: {e}")
+            return False
+
+        return True
+
+    def delete(self, mint_address: str):
+        """Drop a mint's checkpoint (run finished or parameters changed)"""
+        try:
+            with self._connect() as conn:
+                conn.execute("DELETE FROM deep_analysis_checkpoints WHERE mint_address = ?", (mint_address,))
+        except sqlite3.Error as e:
+            print(f"[Checkpoints] Delete failed: {e}")
+
+
+# Global store instance (created lazily)
+_checkpoint_store: Optional[DeepAnalysisCheckpointStore] = None
+_checkpoint_store_lock = threading.Lock()
+
+
+def get_checkpoint_store() -> DeepAnalysisCheckpointStore:
+    """
+    Get the process-wide deep analysis checkpoint store
+
+    Returns:
+        Shared DeepAnalysisCheckpointStore instance
+    """
+    global _checkpoint_store
+    if _checkpoint_store is None:
+        with _checkpoint_store_lock:
+            if _checkpoint_store is None:
+                _checkpoint_store = DeepAnalysisCheckpointStore()
+    return _checkpoint_store
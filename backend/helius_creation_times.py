@@ -0,0 +1,124 @@
+"""
+Token Creation Time Store
+Persistent per-mint record of the first transaction's blockTime
+
+A mint's creation time never changes, so it is resolved at most once per
+token and reused by every later fetch as the getTransactionsForAddress
+`blockTime gte` lower bound. Stored next to the page cache.
+"""
+
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Optional
+
+from helius_page_cache import PAGE_CACHE_FILE
+
+
+class CreationTimeStore:
+    """SQLite-backed store of token creation times, one row per mint"""
+
+    def __init__(self, db_path: str = PAGE_CACHE_FILE):
+        """
+        Args:
+            db_path: SQLite file holding the store table
+        """
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._initialized = False
+
+    @contextmanager
+    def _connect(self):
+        """Context manager for store database connections"""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            if not self._initialized:
+                self._init_schema(conn)
+            yield conn
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+    def _init_schema(self, conn: sqlite3.Connection):
+        with self._lock:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS token_creation_times (
+                    mint_address TEXT PRIMARY KEY,
+                    creation_time INTEGER NOT NULL,
+                    signature TEXT,
+                    resolved_at REAL NOT NULL
+                )
+            """)
+            self._initialized = True
+
+    def get(self, mint_address: str) -> Optional[int]:
+        """
+        Look up a token's creation time
+
+        Args:
+            mint_address: Token mint address
+
+        Returns:
+            Unix timestamp of the mint's first transaction, or None if unknown
+        """
+        try:
+            with self._connect() as conn:
+                row = conn.execute(
+                    "SELECT creation_time FROM token_creation_times WHERE mint_address = ?", (mint_address,)
+                ).fetchone()
+        except sqlite3.Error as e:
+            print(f"[CreationTimes] Read failed: {e}")
+            return None
+
+        return row[0] if row else None
+
+    def put(self, mint_address: str, creation_time: int, signature: Optional[str] = None) -> bool:
+        """
+        Record a token's creation time (the first recorded value wins)
+
+        Args:
+            mint_address: Token mint address
+            creation_time: Unix timestamp of the mint's first transaction
+            signature: Signature of that transaction (optional)
+
+        Returns:
+            True if the time was stored
+        """
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    """
+                    INSERT OR IGNORE INTO token_creation_times (mint_address, creation_time, signature, resolved_at)
+                    VALUES (?, ?, ?, ?)
+                """,
+                    (mint_address, creation_time, signature, time.time()),
+                )
+        except sqlite3.Error as e:
+            print(f"[CreationTimes] Write failed: {e}")
+            return False
+
+        return True
+
+
+# Global store instance (created lazily)
+_creation_time_store: Optional[CreationTimeStore] = None
+_creation_time_store_lock = threading.Lock()
+
+
+def get_creation_time_store() -> CreationTimeStore:
+    """
+    Get the process-wide token creation time store
+
+    Returns:
+        Shared CreationTimeStore instance
+    """
+    global _creation_time_store
+    if _creation_time_store is None:
+        with _creation_time_store_lock:
+            if _creation_time_store is None:
+                _creation_time_store = CreationTimeStore()
+    return _creation_time_store
@@ -0,0 +1,75 @@
+"""
+Wallet On-Curve Check
+Tells signer wallets apart from PDAs and other off-curve accounts
+
+An address is on-curve when its 32 bytes decompress to an ed25519 point,
+which is what Solana's PublicKey.isOnCurve checks. Program derived addresses
+are deliberately off-curve (nobody holds a private key for them), so early
+buyers that are really PDA-owned accounts are filtered out.
+
+The check runs natively through solders (installed with the solana package).
+Results are memoized in a bounded, process-wide LRU, so wallets that buy
+repeatedly, in one analysis or across analyses, are decoded only once.
+"""
+
+from functools import lru_cache
+
+import base58
+
+try:
+    from solders.pubkey import Pubkey
+except ImportError:  # pragma: no cover - solders ships with solana, the pure-Python check is used without it
+    Pubkey = None
+
+SOLDERS_AVAILABLE = Pubkey is not None
+
+# Distinct wallets remembered across analyses (roughly 200 bytes each)
+ON_CURVE_CACHE_SIZE = 32_768
+
+# ed25519 field prime and curve constant d = -121665/121666
+_P = 2**255 - 19
+_D = -121665 * pow(121666, _P - 2, _P) % _P
+
+
+def point_decompresses(key: bytes) -> bool:
+    """
+    Pure-Python ed25519 point decompression check (same rule as curve25519-dalek).
+
+    y is read from the low 255 bits (the top bit is the sign of x). The point
+    exists iff x^2 = (y^2 - 1) / (d*y^2 + 1) has a solution, i.e. iff
+    (y^2 - 1)(d*y^2 + 1) is zero or a quadratic residue mod p (Euler's criterion).
+
+    Args:
+        key: 32-byte public key
+
+    Returns:
+        True if the key is a valid compressed ed25519 point
+    """
+    y = int.from_bytes(key, "little") & ((1 << 255) - 1)
+    y2 = y * y % _P
+    w = (y2 - 1) * (_D * y2 + 1) % _P
+    return w == 0 or pow(w, (_P - 1) // 2, _P) == 1
+
+
+@lru_cache(maxsize=ON_CURVE_CACHE_SIZE)
+def is_on_curve(address: str) -> bool:
+    """
+    Check whether a base58 address is an on-curve (signer) public key.
+
+    Args:
+        address: Base58-encoded Solana address
+
+    Returns:
+        True for valid 32-byte ed25519 points, False for PDAs and invalid addresses
+    """
+    if SOLDERS_AVAILABLE:
+        try:
+            return Pubkey.from_string(address).is_on_curve()
+        except ValueError:
+            return False
+
+    try:
+        key = base58.b58decode(address)
+    except ValueError:
+        return False
+    return len(key) == 32 and point_decompresses(key)
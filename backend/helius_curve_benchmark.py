@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+On-Curve Check Benchmark
+Compares the previous base58 length check with the ed25519 on-curve checks
+
+Addresses are a mix of random keys (about half on-curve) with a hot set of
+repeat buyers, like the buy stream of a busy launch.
+Run from the backend directory: python helius_curve_benchmark.py
+"""
+
+import os
+import random
+import time
+
+import base58
+
+from helius_curve import SOLDERS_AVAILABLE, is_on_curve, point_decompresses
+
+STREAM_LENGTH = 20_000
+HOT_WALLETS = 500
+HOT_SHARE = 0.6
+
+
+def length_check(address: str) -> bool:
+    """The previous check: any address that decodes to 32 bytes counts as on-curve"""
+    try:
+        return len(base58.b58decode(address)) == 32
+    except Exception:
+        return False
+
+
+def pure_python_check(address: str) -> bool:
+    key = base58.b58decode(address)
+    return len(key) == 32 and point_decompresses(key)
+
+
+def solders_check(address: str) -> bool:
+    return is_on_curve.__wrapped__(address)
+
+
+def address_stream(seed: int = 0) -> list:
+    rng = random.Random(seed)
+    hot = [base58.b58encode(os.urandom(32)).decode() for _ in range(HOT_WALLETS)]
+    return [
+        rng.choice(hot) if rng.random() < HOT_SHARE else base58.b58encode(os.urandom(32)).decode()
+        for _ in range(STREAM_LENGTH)
+    ]
+
+
+def measure(name: str, addresses: list, check) -> None:
+    """Print mean time per address and the share reported on-curve"""
+    started = time.perf_counter()
+    on_curve = sum(1 for address in addresses if check(address))
+    elapsed = (time.perf_counter() - started) / len(addresses) * 1e6
+    print(f"  {name:<28} {elapsed:8.2f} us/address   on-curve {on_curve / len(addresses):6.1%}")
+
+
+def main():
+    addresses = address_stream()
+    print("=" * 80)
+    print(
+        f"Wallet on-curve check benchmark ({STREAM_LENGTH:,} addresses, {HOT_SHARE:.0%} from {HOT_WALLETS} hot wallets)"
+    )
+    print("=" * 80)
+
+    measure("base58 length (previous)", addresses, length_check)
+    measure("pure-Python decompression", addresses, pure_python_check)
+    if SOLDERS_AVAILABLE:
+        measure("solders, uncached", addresses, solders_check)
+
+    is_on_curve.cache_clear()
+    measure("is_on_curve (cold LRU)", addresses, is_on_curve)
+    measure("is_on_curve (warm LRU)", addresses, is_on_curve)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Decode Benchmark for Helius Transaction Pages
+Compares stdlib json vs orjson (and field stripping) per getTransactionsForAddress page
+
+Pages are synthetic but shaped like full-detail pump.fun pages: every
+transaction carries log messages, inner instructions and token balances.
+Run from the backend directory: python helius_decode_benchmark.py
+"""
+
+import json
+import random
+import time
+import tracemalloc
+import zlib
+
+import orjson
+
+from helius_api import parse_transaction_list, strip_unparsed_fields
+
+TRANSACTIONS_PER_PAGE = 100
+ROUNDS = 20
+
+
+def fake_pubkey(rng: random.Random) -> str:
+    return "".join(rng.choice("123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz") for _ in range(44))
+
+
+def fake_transaction(rng: random.Random, index: int, mint: str) -> dict:
+    accounts = [
+        {"pubkey": fake_pubkey(rng), "signer": i == 0, "writable": i < 6, "source": "transaction"} for i in range(24)
+    ]
+    token_balance = {
+        "accountIndex": 1,
+        "mint": mint,
+        "owner": accounts[0]["pubkey"],
+        "programId": "TokenkegQfeZyiNwAJbNbGKPFXCWuBvf9Ss623VQ5DA",
+        "uiTokenAmount": {"amount": "0", "decimals": 6, "uiAmount": None, "uiAmountString": "0"},
+    }
+    post_balance = json.loads(json.dumps(token_balance))
+    post_balance["uiTokenAmount"].update({"amount": "1000000000", "uiAmount": 1000.0, "uiAmountString": "1000"})
+    inner = [
+        {
+            "index": i,
+            "instructions": [
+                {
+                    "parsed": {
+                        "info": {"source": fake_pubkey(rng), "destination": fake_pubkey(rng), "lamports": 5000},
+                        "type": "transfer",
+                    },
+                    "program": "system",
+                    "programId": "11111111111111111111111111111111",
+                    "stackHeight": 2,
+                }
+                for _ in range(4)
+            ],
+        }
+        for i in range(3)
+    ]
+    return {
+        "signature": fake_pubkey(rng) + fake_pubkey(rng),
+        "slot": 250_000_000 + index,
+        "blockTime": 1_700_000_000 + index,
+        "transaction": {
+            "signatures": [fake_pubkey(rng) + fake_pubkey(rng)],
+            "message": {
+                "accountKeys": accounts,
+                "instructions": [
+                    {"accounts": [a["pubkey"] for a in accounts[:12]], "data": fake_pubkey(rng), "programId": mint}
+                ],
+                "recentBlockhash": fake_pubkey(rng),
+            },
+        },
+        "meta": {
+            "err": None,
+            "fee": 5000,
+            "preBalances": [rng.randrange(10**9, 10**10) for _ in accounts],
+            "postBalances": [rng.randrange(10**9, 10**10) for _ in accounts],
+            "preTokenBalances": [token_balance],
+            "postTokenBalances": [post_balance],
+            "innerInstructions": inner,
+            "logMessages": [f"Program log: Instruction: Buy {fake_pubkey(rng)} consumed {i} units" for i in range(40)],
+            "rewards": [],
+            "computeUnitsConsumed": 80_000,
+        },
+    }
+
+
+def make_page_body(seed: int) -> bytes:
+    rng = random.Random(seed)
+    mint = fake_pubkey(rng)
+    data = [fake_transaction(rng, i, mint) for i in range(TRANSACTIONS_PER_PAGE)]
+    return orjson.dumps({"jsonrpc": "2.0", "id": 1, "result": {"data": data, "paginationToken": "next"}})
+
+
+def measure(name: str, body: bytes, decode) -> None:
+    """Print mean decode+parse time and peak/retained memory for one decode path"""
+    started = time.perf_counter()
+    for _ in range(ROUNDS):
+        parse_transaction_list(decode(body)["data"])
+    elapsed = (time.perf_counter() - started) / ROUNDS * 1000
+
+    tracemalloc.start()
+    result = decode(body)
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+
+    print(f"  {name:<24} {elapsed:8.2f} ms/page   peak {peak / 2**20:6.2f} MiB   retained {retained / 2**20:6.2f} MiB")
+
+
+def main():
+    body = make_page_body(0)
+    print("=" * 80)
+    print(f"Helius page decode benchmark ({TRANSACTIONS_PER_PAGE} tx/page, {len(body) / 2**20:.2f} MiB body)")
+    print("=" * 80)
+
+    measure("json.loads", body, lambda b: json.loads(b)["result"])
+    measure("orjson.loads", body, lambda b: orjson.loads(b)["result"])
+    measure("orjson.loads + strip", body, lambda b: strip_unparsed_fields(orjson.loads(b)["result"]))
+
+    full_cached = zlib.compress(orjson.dumps(orjson.loads(body)["result"]), 6)
+    stripped_cached = zlib.compress(orjson.dumps(strip_unparsed_fields(orjson.loads(body)["result"])), 6)
+    print(
+        f"\n  page cache body: {len(full_cached) / 1024:.0f} KiB full, {len(stripped_cached) / 1024:.0f} KiB stripped"
+    )
+    measure("cache replay (full)", full_cached, lambda b: orjson.loads(zlib.decompress(b)))
+    measure("cache replay (stripped)", stripped_cached, lambda b: orjson.loads(zlib.decompress(b)))
+
+
+if __name__ == "__main__":
+    main()
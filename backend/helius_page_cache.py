@@ -0,0 +1,278 @@
+"""
+Helius Transaction Page Cache
+Persistent, content-addressed cache of raw getTransactionsForAddress pages
+
+Early-buyer history never changes once it is finalized, so a full page whose
+newest transaction is well below the chain tip can be stored forever and
+replayed for free on re-analysis (different min_usd / walletCount, etc.).
+The partial tail page is never stored.
+
+Pages are keyed by a hash of (address, request options) - which covers
+sortOrder, filters, limit and paginationToken - and stored zlib-compressed in
+a SQLite side table. The cache is size-capped with LRU eviction.
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+import orjson
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PAGE_CACHE_FILE = os.path.join(SCRIPT_DIR, "helius_cache.db")
+
+# Default size cap for stored (compressed) pages
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+# A page is immutable once its newest transaction is this far behind the tip.
+# Finality is ~13s on Solana; a generous margin also covers clock skew.
+IMMUTABLE_AFTER_SECONDS = 600
+
+
+def page_cache_key(address: str, options: Dict) -> str:
+    """
+    Build the content address for a page request
+
+    Args:
+        address: Address passed to getTransactionsForAddress
+        options: Request options (sortOrder, filters, limit, paginationToken, ...)
+
+    Returns:
+        Hex SHA-256 digest of the canonical request
+    """
+    canonical = orjson.dumps([address, options], option=orjson.OPT_SORT_KEYS)
+    return hashlib.sha256(canonical).hexdigest()
+
+
+def is_page_immutable(result: Dict, limit: Optional[int], now: Optional[float] = None) -> bool:
+    """
+    Check whether a getTransactionsForAddress page can never change
+
+    A page is immutable when it is full (`limit` transactions and a
+    paginationToken to the next page), every transaction has a blockTime, and
+    the newest one is at least IMMUTABLE_AFTER_SECONDS old. A partial page is
+    the tail of the history: new transactions still land on it, however old
+    its newest one is.
+
+    Args:
+        result: Raw RPC result
+        limit: The request's page size (options["limit"])
+        now: Current time (defaults to time.time())
+    """
+    result = result or {}
+    transactions = result.get("data") or []
+    if not transactions or not limit or len(transactions) != limit or not result.get("paginationToken"):
+        return False
+
+    block_times = [tx.get("blockTime") for tx in transactions]
+    if any(bt is None for bt in block_times):
+        return False
+
+    now = now if now is not None else time.time()
+    return max(block_times) <= now - IMMUTABLE_AFTER_SECONDS
+
+
+class TransactionPageCache:
+    """SQLite-backed LRU cache of raw transaction pages"""
+
+    def __init__(self, db_path: str = PAGE_CACHE_FILE, max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        Args:
+            db_path: SQLite file holding the cache table
+            max_bytes: Size cap for compressed page bodies (0 disables the cache)
+        """
+        self.db_path = db_path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._initialized = False
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    @contextmanager
+    def _connect(self):
+        """Context manager for cache database connections"""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            if not self._initialized:
+                self._init_schema(conn)
+            yield conn
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+    def _init_schema(self, conn: sqlite3.Connection):
+        with self._lock:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS transaction_pages (
+                    cache_key TEXT PRIMARY KEY,
+                    address TEXT NOT NULL,
+                    body BLOB NOT NULL,
+                    size INTEGER NOT NULL,
+                    tx_count INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_access REAL NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_transaction_pages_lru ON transaction_pages(last_access)")
+            self._initialized = True
+
+    def get(self, address: str, options: Dict) -> Optional[Dict]:
+        """
+        Look up a cached page
+
+        Args:
+            address: Address passed to getTransactionsForAddress
+            options: Request options used for the call
+
+        Returns:
+            The raw RPC result (with 'data' and 'paginationToken'), or None on miss
+        """
+        body = self.get_body(address, options)
+        if body is None:
+            return None
+        return orjson.loads(zlib.decompress(body))
+
+    def get_body(self, address: str, options: Dict) -> Optional[bytes]:
+        """
+        Look up a cached page without decoding it
+
+        Args:
+            address: Address passed to getTransactionsForAddress
+            options: Request options used for the call
+
+        Returns:
+            The zlib-compressed JSON page body, or None on miss
+        """
+        if not self.enabled:
+            return None
+
+        key = page_cache_key(address, options)
+        try:
+            with self._connect() as conn:
+                row = conn.execute("SELECT body FROM transaction_pages WHERE cache_key = ?", (key,)).fetchone()
+                if row is None:
+                    self.misses += 1
+                    return None
+                conn.execute("UPDATE transaction_pages SET last_access = ? WHERE cache_key = ?", (time.time(), key))
+        except sqlite3.Error as e:
+            print(f"[PageCache] Read failed: {e}")
+            return None
+
+        self.hits += 1
+        return row[0]
+
+    def put(self, address: str, options: Dict, result: Dict) -> bool:
+        """
+        Store a page if it is immutable
+
+        Args:
+            address: Address passed to getTransactionsForAddress
+            options: Request options used for the call
+            result: Raw RPC result
+
+        Returns:
+            True if the page was stored
+        """
+        if not self.enabled or not is_page_immutable(result, options.get("limit")):
+            return False
+
+        body = zlib.compress(orjson.dumps(result), 6)
+        return self.put_body(address, options, body, len(result.get("data", [])))
+
+    def put_body(self, address: str, options: Dict, body: bytes, tx_count: int) -> bool:
+        """
+        Store an already compressed page (the caller has checked it is immutable)
+
+        Args:
+            address: Address passed to getTransactionsForAddress
+            options: Request options used for the call
+            body: zlib-compressed JSON page body
+            tx_count: Number of transactions on the page
+
+        Returns:
+            True if the page was stored
+        """
+        if not self.enabled:
+            return False
+
+        key = page_cache_key(address, options)
+        now = time.time()
+
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    """
+                    INSERT OR REPLACE INTO transaction_pages
+                        (cache_key, address, body, size, tx_count, created_at, last_access)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                """,
+                    (key, address, body, len(body), tx_count, now, now),
+                )
+                self._evict(conn)
+        except sqlite3.Error as e:
+            print(f"[PageCache] Write failed: {e}")
+            return False
+
+        return True
+
+    def _evict(self, conn: sqlite3.Connection):
+        """Drop least-recently-used pages until the cache is under its size cap"""
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM transaction_pages").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        # Evict down to 90% of the cap so we don't evict on every insert
+        target = int(self.max_bytes * 0.9)
+        freed = 0
+        evict_keys = []
+        for cache_key, size in conn.execute("SELECT cache_key, size FROM transaction_pages ORDER BY last_access ASC"):
+            if total - freed <= target:
+                break
+            evict_keys.append((cache_key,))
+            freed += size
+
+        conn.executemany("DELETE FROM transaction_pages WHERE cache_key = ?", evict_keys)
+        print(f"[PageCache] Evicted {len(evict_keys)} pages ({freed} bytes)")
+
+    def clear(self):
+        """Remove every cached page"""
+        with self._connect() as conn:
+            conn.execute("DELETE FROM transaction_pages")
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get cache statistics"""
+        with self._connect() as conn:
+            pages, size = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM transaction_pages").fetchone()
+        return {"pages": pages, "bytes": size, "max_bytes": self.max_bytes, "hits": self.hits, "misses": self.misses}
+
+
+# Global page cache instance (created lazily)
+_page_cache: Optional[TransactionPageCache] = None
+_page_cache_lock = threading.Lock()
+
+
+def get_page_cache() -> TransactionPageCache:
+    """
+    Get the process-wide transaction page cache
+
+    Returns:
+        Shared TransactionPageCache instance
+    """
+    global _page_cache
+    if _page_cache is None:
+        with _page_cache_lock:
+            if _page_cache is None:
+                _page_cache = TransactionPageCache()
+    return _page_cache
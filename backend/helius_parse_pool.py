@@ -0,0 +1,180 @@
+"""
+Helius Page Parse Pool
+Optional process pool that decodes and parses transaction pages off the GIL
+
+Analyses run on the threads of ANALYSIS_EXECUTOR, so JSON decoding and
+transaction parsing of concurrent analyses serialize on the interpreter lock.
+With the pool enabled, the raw response bytes of each getTransactionsForAddress
+page (or the compressed body of a cached page) are handed to a worker process,
+which decodes the JSON, parses the transactions, reduces them to BuyRecords
+and compresses the page for the page cache. Only the records come back (plus
+the pagination token and transaction count): a few small tuples per page that
+the aggregator and the transaction store consume directly, so unpickling them
+is the only per-page work left on the calling thread.
+
+Workers are started with the "spawn" method so they never inherit the
+transport's event loop thread or open SQLite connections.
+"""
+
+import multiprocessing
+import threading
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, NamedTuple, Optional
+
+import orjson
+
+from helius_page_cache import is_page_immutable
+from helius_tx_store import BuyRecord, buy_records
+
+# Upper bound for the parseWorkers setting
+MAX_PARSE_WORKERS = 32
+
+
+class ParsedPage(NamedTuple):
+    """A getTransactionsForAddress page parsed in a worker process"""
+
+    transactions: List[BuyRecord]  # one per parsed transaction (failed parses dropped)
+    tx_count: int  # raw transactions on the page, for pagination limits
+    pagination_token: Optional[str]
+    cache_body: Optional[bytes]  # zlib-compressed raw result if the page is immutable
+    last_slot: Optional[int] = None  # slot of the page's newest transaction
+    last_block_time: Optional[int] = None  # blockTime of the page's newest transaction
+
+
+def parse_page_body(
+    body: bytes,
+    mint_address: str,
+    from_cache: bool,
+    columnar_parser: bool,
+    compress_for_cache: bool,
+    page_limit: Optional[int] = None,
+) -> Optional[ParsedPage]:
+    """
+    Decode and parse one page (runs in a worker process)
+
+    Args:
+        body: Raw JSON-RPC response body, or a compressed page cache body
+        mint_address: Token mint the page was fetched for (buys are extracted for it)
+        from_cache: True if `body` came from the page cache
+        columnar_parser: Parse with the NumPy columnar parser
+        compress_for_cache: Also return the compressed page if it is immutable
+        page_limit: Page size the page was requested with (only full pages are immutable)
+
+    Returns:
+        ParsedPage, or None for an empty result
+    """
+    from helius_api import parse_transaction_list, strip_unparsed_fields
+
+    if from_cache:
+        result = orjson.loads(zlib.decompress(body))
+    else:
+        response = orjson.loads(body)
+        if "error" in response:
+            raise Exception(f"RPC call failed: RPC Error: {response['error']}")
+        # Fully decoded above; stripping only keeps the unparsed fields out of the cached page
+        result = strip_unparsed_fields(response.get("result", {}))
+
+    if not result:
+        return None
+
+    transactions = result.get("data", [])
+    parsed = parse_transaction_list(transactions, columnar_parser)
+
+    cache_body = None
+    if compress_for_cache and is_page_immutable(result, page_limit):
+        cache_body = zlib.compress(orjson.dumps(result), 6)
+
+    newest = transactions[-1] if transactions and isinstance(transactions[-1], dict) else {}
+    return ParsedPage(
+        buy_records(parsed, mint_address),
+        len(transactions),
+        result.get("paginationToken"),
+        cache_body,
+        newest.get("slot"),
+        newest.get("blockTime"),
+    )
+
+
+class ParsePool:
+    """Process pool shared by every analysis for page decoding and parsing"""
+
+    def __init__(self, workers: int):
+        """
+        Args:
+            workers: Number of worker processes
+        """
+        self.workers = workers
+        self._executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+
+    def parse(
+        self,
+        body: bytes,
+        mint_address: str,
+        from_cache: bool = False,
+        columnar_parser: bool = False,
+        compress_for_cache: bool = False,
+        page_limit: Optional[int] = None,
+    ) -> Optional[ParsedPage]:
+        """
+        Parse a page in a worker process, blocking the calling thread
+
+        The raw body is decoded, parsed and reduced to BuyRecords in the worker.
+
+        Args:
+            body: Raw JSON-RPC response body, or a compressed page cache body
+            mint_address: Token mint the page was fetched for
+            from_cache: True if `body` came from the page cache
+            columnar_parser: Parse with the NumPy columnar parser
+            compress_for_cache: Return the compressed page for the page cache if it is immutable
+            page_limit: Page size the page was requested with (only full pages are immutable)
+
+        Returns:
+            ParsedPage, or None if the RPC result was empty
+        """
+        return self._executor.submit(
+            parse_page_body, body, mint_address, from_cache, columnar_parser, compress_for_cache, page_limit
+        ).result()
+
+    def shutdown(self):
+        """Stop the worker processes"""
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+
+# Global parse pool (created lazily, resized when the setting changes)
+_parse_pool: Optional[ParsePool] = None
+_parse_pool_lock = threading.Lock()
+
+
+def get_parse_pool(workers: int) -> Optional[ParsePool]:
+    """
+    Get the process-wide parse pool for the configured size
+
+    Args:
+        workers: Configured worker count (0 disables the pool)
+
+    Returns:
+        Shared ParsePool instance, or None when disabled
+    """
+    global _parse_pool
+    if workers <= 0:
+        return None
+
+    workers = min(workers, MAX_PARSE_WORKERS)
+    with _parse_pool_lock:
+        if _parse_pool is None or _parse_pool.workers != workers:
+            previous = _parse_pool
+            _parse_pool = ParsePool(workers)
+            if previous is not None:
+                # Let in-flight pages finish on the old pool without blocking this caller
+                previous._executor.shutdown(wait=False)
+        return _parse_pool
+
+
+def close_parse_pool():
+    """Shut down the global parse pool (app shutdown)"""
+    global _parse_pool
+    with _parse_pool_lock:
+        if _parse_pool is not None:
+            _parse_pool.shutdown()
+            _parse_pool = None
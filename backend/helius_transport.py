@@ -0,0 +1,1177 @@
+"""
+Shared Helius HTTP Transport
+Provides one process-wide asyncio connection pool for all Helius traffic
+
+Every HeliusAPI, TokenAnalyzer and WebhookManager instance (and the async
+routers) goes through the same httpx.AsyncClient, so TLS sessions and HTTP/2
+connections are reused across analyses instead of being rebuilt per job.
+
+The client lives on a dedicated event loop thread ("helius-io"):
+- Async callers on any event loop `await transport.request(...)`
+- Sync callers (executor threads) use `transport.run(coro)` to block on a result
+
+The analysis pipeline itself is still synchronous: each analysis runs on an
+ANALYSIS_EXECUTOR thread and blocks on `transport.run` per call, so the number
+of concurrent analyses is capped by that pool's size. What the transport
+shares across them is the connection pool (TLS sessions, HTTP/2 streams),
+the per-key rate limiters and the circuit breakers.
+
+Requests that carry an API key go through that key's HeliusRateLimiter, which
+is shared by every client using the key (requests/sec + credits/min budgets,
+Retry-After handling and jittered exponential backoff; only idempotent
+requests are retried). Each limiter also
+holds an AIMD concurrency window that caps the key's requests in flight: it
+grows while latency and error rate stay healthy and halves on 429s, 5xx
+responses and timeouts, so concurrency follows what Helius allows right now.
+
+Each Helius endpoint family (RPC, Enhanced API, webhooks) has a CircuitBreaker.
+After repeated 5xx responses or timeouts it opens, and requests to that
+endpoint fail immediately with CircuitOpenError instead of waiting out the
+timeout; after a cool-off a single probe request decides whether it closes.
+
+With several API keys configured, requests go through a HeliusKeyPool instead:
+every attempt is sent with the least-loaded key that is not cooling down after
+a 429, so throughput scales with the number of keys.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import builtins
+import hashlib
+import random
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional, TypeVar, Union
+
+import httpx
+
+from debug_config import is_debug_enabled
+
+try:
+    import h2  # noqa: F401  (presence enables HTTP/2 multiplexing in httpx)
+
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+T = TypeVar("T")
+
+HELIUS_RPC_URL = "https://mainnet.helius-rpc.com/"
+HELIUS_API_URL = "https://api.helius.xyz/v0"
+
+DEFAULT_TIMEOUT = 30.0
+DEFAULT_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=120.0)
+
+# Responses worth retrying (rate limited or transient upstream failure)
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+# Methods retried by default; other requests (e.g. webhook create/update) are only retried
+# when they go to the JSON-RPC endpoint, where every call this app makes is a read
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "DELETE"}
+BASE_BACKOFF_SECONDS = 0.5
+MAX_BACKOFF_SECONDS = 30.0
+# How long a key is avoided by the key pool after a 429 without Retry-After
+THROTTLE_COOLDOWN_SECONDS = 5.0
+
+# AIMD concurrency window per API key (requests in flight)
+INITIAL_CONCURRENCY = 10
+MIN_CONCURRENCY = 1
+MAX_CONCURRENCY = 64
+CONCURRENCY_BACKOFF_RATIO = 0.5
+# The window only grows while recent requests meet both targets
+LATENCY_TARGET_SECONDS = 3.0  # p95 response time
+ERROR_RATE_TARGET = 0.05
+CONCURRENCY_SAMPLE_SIZE = 50  # recent requests the p95 and error rate are computed over
+
+# Circuit breakers per endpoint family
+CIRCUIT_ENDPOINTS = ("rpc", "enhanced", "webhooks")
+CIRCUIT_FAILURE_THRESHOLD = 5  # consecutive 5xx / transport failures that open the circuit
+CIRCUIT_OPEN_SECONDS = 30.0  # fail-fast period before a half-open probe is let through
+
+
+# ============================================================================
+# Rate Limiting
+# ============================================================================
+
+
+def safe_print(*args, **kwargs):
+    """Only print if debug mode is enabled in debug_config.py (OPSEC, same gate as helius_api)"""
+    if is_debug_enabled():
+        builtins.print(*args, **kwargs)
+
+
+def mask_api_key(api_key: str) -> str:
+    """
+    Mask an API key for logs and metrics labels (display only - state is keyed by the full key)
+
+    A short hash of the whole key keeps labels of keys sharing a prefix apart.
+    """
+    if not api_key:
+        return "****"
+    digest = hashlib.sha256(api_key.encode()).hexdigest()[:6]
+    if len(api_key) < 8:
+        return f"****{digest}"
+    return f"{api_key[:4]}****{digest}"
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After header (delta-seconds or HTTP-date)
+
+    Returns:
+        Seconds to wait, or None if the header is missing/invalid
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenBucket:
+    """
+    Reservation-based token bucket.
+
+    Callers reserve tokens up front and sleep for the returned delay, so
+    waiters are served in arrival order without polling. Reservations may
+    push the bucket into debt. A rate of 0 disables the bucket.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float):
+        if self.rate > 0:
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reconfigure(self, rate: float, capacity: float):
+        self._refill(time.monotonic())
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = min(self.tokens, capacity)
+
+    def reserve(self, amount: float, now: float) -> float:
+        """Reserve tokens and return how long the caller must wait before using them"""
+        if self.rate <= 0:
+            return 0.0
+        self._refill(now)
+        self.tokens -= amount
+        if self.tokens >= 0:
+            return 0.0
+        return -self.tokens / self.rate
+
+    def refund(self, amount: float):
+        """Return tokens reserved for a request that was never sent"""
+        if self.rate > 0:
+            self.tokens = min(self.capacity, self.tokens + amount)
+
+    def peek(self, amount: float, now: float) -> float:
+        """Delay a reservation of `amount` would get, without reserving anything"""
+        if self.rate <= 0:
+            return 0.0
+        tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        return max(0.0, (amount - tokens) / self.rate)
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    AIMD (additive increase, multiplicative decrease) cap on requests in flight.
+
+    Every successful response grows the window by 1/window (about +1 per
+    window's worth of responses) as long as at least half the window is in use and
+    the p95 latency and error rate of recent requests are within target. A
+    429, 5xx or timeout halves it, at most once per round trip: failures of
+    requests sent before the last cut were caused by the old window and do not
+    cut again. Only used from the transport loop, so no locking is needed.
+    """
+
+    def __init__(
+        self,
+        initial: int = INITIAL_CONCURRENCY,
+        min_limit: int = MIN_CONCURRENCY,
+        max_limit: int = MAX_CONCURRENCY,
+    ):
+        """
+        Args:
+            initial: Starting window
+            min_limit: Smallest window after repeated cuts
+            max_limit: Largest window reached by growth
+        """
+        self.limit = float(initial)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.in_use = 0
+        self._waiters: deque = deque()
+        self._latencies: deque = deque(maxlen=CONCURRENCY_SAMPLE_SIZE)
+        self._errors: deque = deque(maxlen=CONCURRENCY_SAMPLE_SIZE)
+        self._last_decrease = 0.0
+
+        # Decisions
+        self.increases = 0
+        self.decreases = 0
+
+    @property
+    def window(self) -> int:
+        """Requests currently allowed in flight"""
+        return int(self.limit)
+
+    async def acquire(self) -> float:
+        """
+        Wait for a free slot in the window
+
+        Returns:
+            time.monotonic() when the slot was granted (pass it to release())
+        """
+        if not self._waiters and self.in_use < self.window:
+            self.in_use += 1
+            return time.monotonic()
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # Slot was granted just before the cancellation, hand it on
+                self.in_use -= 1
+                self._wake()
+            raise
+        return time.monotonic()
+
+    def _wake(self):
+        while self._waiters and self.in_use < self.window:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self.in_use += 1
+                waiter.set_result(None)
+
+    def p95_latency(self) -> float:
+        """95th percentile response time of recent successful requests"""
+        if not self._latencies:
+            return 0.0
+        ordered = sorted(self._latencies)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+
+    def error_rate(self) -> float:
+        """Share of recent requests that failed with 429, 5xx or a timeout"""
+        return sum(self._errors) / len(self._errors) if self._errors else 0.0
+
+    def release(self, started: float, congested: bool):
+        """
+        Free a slot and adjust the window from the request's outcome
+
+        Args:
+            started: Value returned by acquire()
+            congested: True for 429, 5xx and timeouts / transport errors
+        """
+        now = time.monotonic()
+        # Growth only counts while the window is at least half used (not app-limited)
+        saturated = self.in_use * 2 >= self.window
+        self.in_use -= 1
+        self._errors.append(congested)
+
+        if congested:
+            if started >= self._last_decrease:
+                previous = self.window
+                self.limit = max(float(self.min_limit), self.limit * CONCURRENCY_BACKOFF_RATIO)
+                self._last_decrease = now
+                self.decreases += 1
+                safe_print(f"[Helius] Concurrency window cut {previous} -> {self.window}")
+        else:
+            self._latencies.append(now - started)
+            if (
+                saturated
+                and self.limit < self.max_limit
+                and self.p95_latency() <= LATENCY_TARGET_SECONDS
+                and self.error_rate() <= ERROR_RATE_TARGET
+            ):
+                previous = self.window
+                self.limit = min(float(self.max_limit), self.limit + 1.0 / self.limit)
+                if self.window > previous:
+                    self.increases += 1
+
+        self._wake()
+
+    def get_stats(self) -> Dict[str, float]:
+        """Get window and decision statistics"""
+        return {
+            "concurrency_limit": self.window,
+            "concurrency_in_use": self.in_use,
+            "concurrency_waiting": len(self._waiters),
+            "concurrency_increases": self.increases,
+            "concurrency_decreases": self.decreases,
+            "latency_p95_seconds": round(self.p95_latency(), 4),
+            "error_rate": round(self.error_rate(), 4),
+        }
+
+
+class HeliusRateLimiter:
+    """
+    Per-API-key request and credit governor.
+
+    All HeliusAPI / WebhookManager instances using the same key share one
+    limiter, so concurrent analyses stay under the plan ceiling together.
+    Only used from the transport loop, so no locking is needed.
+    """
+
+    def __init__(self, requests_per_second: float = 10.0, credits_per_minute: float = 0, max_retries: int = 3):
+        """
+        Args:
+            requests_per_second: Request budget (0 = unlimited)
+            credits_per_minute: Credit budget (0 = unlimited)
+            max_retries: Retries for 429/5xx/transport errors
+        """
+        self.request_bucket = TokenBucket(requests_per_second, max(1.0, requests_per_second))
+        self.credit_bucket = TokenBucket(credits_per_minute / 60.0, credits_per_minute)
+        self.max_retries = max_retries
+        self.blocked_until = 0.0  # Set from Retry-After, applies to every waiter
+        self.cooldown_until = 0.0  # Set on every 429, steers the key pool to other keys
+        self.concurrency = AdaptiveConcurrencyLimiter()
+
+        # Stats
+        self.in_flight = 0
+        self.waiting = 0
+        self.requests = 0
+        self.credits = 0
+        self.delayed_requests = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self.throttled = 0
+        self.retries = 0
+
+    def configure(self, requests_per_second: float, credits_per_minute: float, max_retries: int):
+        """Apply new budgets (takes effect for the next reservation)"""
+        self.request_bucket.reconfigure(requests_per_second, max(1.0, requests_per_second))
+        self.credit_bucket.reconfigure(credits_per_minute / 60.0, credits_per_minute)
+        self.max_retries = max_retries
+
+    async def acquire(self, credits: int = 1) -> float:
+        """
+        Wait until a request costing `credits` may be sent
+
+        The budget is reserved up front and given back if the caller is
+        cancelled while waiting; call record_sent() once the request goes out.
+
+        Returns:
+            Seconds spent waiting in the queue
+        """
+        now = time.monotonic()
+        delay = max(
+            self.request_bucket.reserve(1, now),
+            self.credit_bucket.reserve(credits, now),
+            self.blocked_until - now,
+            0.0,
+        )
+
+        if delay > 0:
+            self.delayed_requests += 1
+            self.waiting += 1
+            try:
+                await asyncio.sleep(delay)
+            except asyncio.CancelledError:
+                self.refund(credits)
+                raise
+            finally:
+                self.waiting -= 1
+            self.total_wait_seconds += delay
+            self.max_wait_seconds = max(self.max_wait_seconds, delay)
+
+        return delay
+
+    def refund(self, credits: int):
+        """Give back the budget acquire() reserved for a request that was never sent"""
+        self.request_bucket.refund(1)
+        self.credit_bucket.refund(credits)
+
+    def record_sent(self, credits: int):
+        """Count a request that actually went out"""
+        self.requests += 1
+        self.credits += credits
+
+    def estimated_delay(self, credits: int, now: float) -> float:
+        """Queue delay a request costing `credits` would get right now (nothing is reserved)"""
+        return max(
+            self.request_bucket.peek(1, now),
+            self.credit_bucket.peek(credits, now),
+            self.blocked_until - now,
+            0.0,
+        )
+
+    def cooldown_remaining(self, now: float) -> float:
+        """Seconds until the key is back in rotation after its last 429"""
+        return max(0.0, self.cooldown_until - now)
+
+    def record_throttle(self, retry_after: Optional[float]):
+        """Record a 429 and pause every caller for Retry-After seconds"""
+        self.throttled += 1
+        now = time.monotonic()
+        if retry_after:
+            self.blocked_until = max(self.blocked_until, now + retry_after)
+        self.cooldown_until = max(self.cooldown_until, now + (retry_after or THROTTLE_COOLDOWN_SECONDS))
+
+    def backoff_delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """Full-jitter exponential backoff, never shorter than Retry-After"""
+        self.retries += 1
+        delay = random.uniform(0, min(MAX_BACKOFF_SECONDS, BASE_BACKOFF_SECONDS * (2**attempt)))
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return delay
+
+    def get_stats(self) -> Dict[str, float]:
+        """Get limiter statistics"""
+        return {
+            "requests": self.requests,
+            "credits": self.credits,
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "delayed_requests": self.delayed_requests,
+            "total_wait_seconds": round(self.total_wait_seconds, 3),
+            "avg_wait_seconds": round(self.total_wait_seconds / self.requests, 4) if self.requests else 0.0,
+            "max_wait_seconds": round(self.max_wait_seconds, 3),
+            "throttled": self.throttled,
+            "retries": self.retries,
+            "cooldown_seconds": round(self.cooldown_remaining(time.monotonic()), 3),
+            "requests_per_second": self.request_bucket.rate,
+            "credits_per_minute": self.credit_bucket.rate * 60.0,
+            **self.concurrency.get_stats(),
+        }
+
+
+# Rate limiters keyed by API key (process-wide)
+_rate_limiters: Dict[str, HeliusRateLimiter] = {}
+_rate_limit_config: Dict[str, float] = {"requests_per_second": 10.0, "credits_per_minute": 0, "max_retries": 3}
+_rate_limit_lock = threading.Lock()
+
+
+def get_rate_limiter(api_key: str) -> HeliusRateLimiter:
+    """
+    Get the shared rate limiter for an API key
+
+    Args:
+        api_key: Helius API key
+
+    Returns:
+        HeliusRateLimiter shared by every client using this key
+    """
+    limiter = _rate_limiters.get(api_key)
+    if limiter is None:
+        with _rate_limit_lock:
+            limiter = _rate_limiters.get(api_key)
+            if limiter is None:
+                limiter = HeliusRateLimiter(**_rate_limit_config)
+                _rate_limiters[api_key] = limiter
+    return limiter
+
+
+def configure_rate_limits(
+    requests_per_second: Optional[float] = None,
+    credits_per_minute: Optional[float] = None,
+    max_retries: Optional[int] = None,
+):
+    """
+    Update rate limit budgets for all current and future limiters
+
+    Args:
+        requests_per_second: Request budget per key (0 = unlimited)
+        credits_per_minute: Credit budget per key (0 = unlimited)
+        max_retries: Retries for throttled / failed requests
+    """
+    with _rate_limit_lock:
+        if requests_per_second is not None:
+            _rate_limit_config["requests_per_second"] = requests_per_second
+        if credits_per_minute is not None:
+            _rate_limit_config["credits_per_minute"] = credits_per_minute
+        if max_retries is not None:
+            _rate_limit_config["max_retries"] = max_retries
+        config = dict(_rate_limit_config)
+        limiters = list(_rate_limiters.values())
+
+    def apply():
+        for limiter in limiters:
+            limiter.configure(**config)
+
+    # Live limiters are only touched from the transport loop - reconfigure them there
+    transport = _transport
+    if transport is not None:
+        transport.call_soon(apply)
+    else:
+        apply()
+
+
+def get_rate_limiter_stats() -> Dict[str, Dict[str, float]]:
+    """Get statistics for every rate limiter, keyed by masked API key"""
+    return {mask_api_key(key): limiter.get_stats() for key, limiter in list(_rate_limiters.items())}
+
+
+# ============================================================================
+# API Key Pool
+# ============================================================================
+
+
+class HeliusKeyPool:
+    """
+    Dispatches requests across several Helius API keys.
+
+    Each key keeps its own HeliusRateLimiter (budgets, credit counter, 429
+    cooldown), so N keys give N times the request and credit budget. Every
+    attempt picks the least-loaded key: keys cooling down after a 429 are
+    skipped while others are available, then the shortest estimated queue
+    delay wins, then the fewest in-flight requests, then round-robin order.
+    Only used from the transport loop, so no locking is needed.
+    """
+
+    def __init__(self, api_keys: List[str]):
+        """
+        Args:
+            api_keys: Helius API keys (the first one is the primary key)
+        """
+        self.api_keys = list(dict.fromkeys(key for key in api_keys if key))
+        if not self.api_keys:
+            raise ValueError("HeliusKeyPool needs at least one API key")
+        self._next = 0
+
+    @property
+    def primary_key(self) -> str:
+        """Key used for calls that must stay on one key (webhooks)"""
+        return self.api_keys[0]
+
+    def __len__(self) -> int:
+        return len(self.api_keys)
+
+    def select(self, credits: int = 1) -> str:
+        """
+        Pick the key for the next request attempt
+
+        Args:
+            credits: Credit cost of the request
+
+        Returns:
+            API key to send the request with
+        """
+        now = time.monotonic()
+        count = len(self.api_keys)
+
+        def load(index: int):
+            limiter = get_rate_limiter(self.api_keys[index])
+            return (
+                limiter.cooldown_remaining(now),
+                limiter.estimated_delay(credits, now),
+                limiter.in_flight,
+                (index - self._next) % count,
+            )
+
+        chosen = min(range(count), key=load)
+        self._next = (chosen + 1) % count
+        return self.api_keys[chosen]
+
+    def get_health(self) -> List[Dict[str, Any]]:
+        """Per-key health view (masked keys, load, credits and 429 cooldown)"""
+        now = time.monotonic()
+        health = []
+        for index, key in enumerate(self.api_keys):
+            limiter = get_rate_limiter(key)
+            cooldown = limiter.cooldown_remaining(now)
+            health.append(
+                {
+                    "index": index,
+                    "key": mask_api_key(key),
+                    "status": "cooldown" if cooldown > 0 else "ok",
+                    "cooldown_seconds": round(cooldown, 3),
+                    "in_flight": limiter.in_flight,
+                    "requests": limiter.requests,
+                    "credits": limiter.credits,
+                    "throttled": limiter.throttled,
+                }
+            )
+        return health
+
+
+# Process-wide key pool (set from the configured keys at startup)
+_key_pool: Optional[HeliusKeyPool] = None
+
+
+def configure_key_pool(api_keys: List[str]) -> HeliusKeyPool:
+    """
+    Build the process-wide key pool from the configured API keys
+
+    Args:
+        api_keys: Helius API keys, primary key first
+
+    Returns:
+        The new HeliusKeyPool
+    """
+    global _key_pool
+    _key_pool = HeliusKeyPool(api_keys)
+    return _key_pool
+
+
+def get_key_pool_health() -> List[Dict[str, Any]]:
+    """Get the per-key health view of the process-wide key pool (empty if not configured)"""
+    return _key_pool.get_health() if _key_pool is not None else []
+
+
+# ============================================================================
+# Circuit Breakers
+# ============================================================================
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of sending a request while its endpoint's circuit is open"""
+
+    def __init__(self, endpoint: str, retry_in: float):
+        self.endpoint = endpoint
+        self.retry_in = retry_in
+        super().__init__(f"Helius {endpoint} circuit open (unavailable, retry in {retry_in:.0f}s)")
+
+
+class CircuitBreaker:
+    """
+    Closed / open / half-open breaker for one Helius endpoint family.
+
+    CIRCUIT_FAILURE_THRESHOLD consecutive failures (5xx or transport errors;
+    429s are rate limiting, not an outage) open the circuit for
+    CIRCUIT_OPEN_SECONDS. Then one probe request is let through: success
+    closes the circuit, failure opens it again. Requests are only sent from
+    the transport loop; other threads only read the state.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        endpoint: str,
+        failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD,
+        open_seconds: float = CIRCUIT_OPEN_SECONDS,
+    ):
+        """
+        Args:
+            endpoint: Endpoint family name (for errors and metrics)
+            failure_threshold: Consecutive failures that open the circuit
+            open_seconds: How long the circuit stays open before probing
+        """
+        self.endpoint = endpoint
+        self.failure_threshold = failure_threshold
+        self.open_seconds = open_seconds
+        self._state = self.CLOSED
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+
+        # Stats
+        self.consecutive_failures = 0
+        self.trips = 0
+        self.rejected = 0
+
+    @property
+    def state(self) -> str:
+        """Current state (an open circuit past its cool-off reports half_open)"""
+        if self._state == self.OPEN and self.retry_in() == 0:
+            return self.HALF_OPEN
+        return self._state
+
+    def retry_in(self) -> float:
+        """Seconds until an open circuit lets a probe through"""
+        if self._state != self.OPEN:
+            return 0.0
+        return max(0.0, self._opened_at + self.open_seconds - time.monotonic())
+
+    def is_open(self) -> bool:
+        """True while requests would be rejected without being sent"""
+        state = self.state
+        return state == self.OPEN or (state == self.HALF_OPEN and self._probe_in_flight)
+
+    def before_request(self) -> bool:
+        """
+        Admit a request, or raise CircuitOpenError (lets one probe through when half-open)
+
+        Returns:
+            True if the admitted request is the half-open probe (pass it back to record())
+        """
+        state = self.state
+        if state == self.CLOSED:
+            return False
+        if state == self.HALF_OPEN and not self._probe_in_flight:
+            self._state = self.HALF_OPEN
+            self._probe_in_flight = True
+            return True
+        self.rejected += 1
+        raise CircuitOpenError(self.endpoint, self.retry_in())
+
+    def record(self, failed: Optional[bool], probe: bool = False):
+        """
+        Record the outcome of an admitted request
+
+        Args:
+            failed: True for 5xx / transport errors, False for any other response,
+                    None if no response came back (cancelled) - only frees the probe
+            probe: What before_request() returned for this request
+        """
+        # Requests admitted before the circuit opened can still complete while it is half-open;
+        # only the probe's outcome closes or re-opens it
+        was_probe = probe and self._state == self.HALF_OPEN
+        if failed is None:
+            if was_probe:
+                self._probe_in_flight = False
+            return
+
+        if not failed:
+            self.consecutive_failures = 0
+            if was_probe:
+                safe_print(f"[Helius] {self.endpoint} circuit closed (probe succeeded)")
+                self._state = self.CLOSED
+                self._probe_in_flight = False
+            return
+
+        self.consecutive_failures += 1
+        if was_probe or (self._state == self.CLOSED and self.consecutive_failures >= self.failure_threshold):
+            self._state = self.OPEN
+            self._opened_at = time.monotonic()
+            self._probe_in_flight = False
+            self.trips += 1
+            safe_print(
+                f"[Helius] {self.endpoint} circuit opened after {self.consecutive_failures} failures "
+                f"(failing fast for {self.open_seconds:.0f}s)"
+            )
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get breaker state and statistics"""
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "retry_in_seconds": round(self.retry_in(), 1),
+            "trips": self.trips,
+            "rejected": self.rejected,
+        }
+
+
+# Circuit breakers keyed by endpoint family (process-wide)
+_circuit_breakers: Dict[str, CircuitBreaker] = {endpoint: CircuitBreaker(endpoint) for endpoint in CIRCUIT_ENDPOINTS}
+
+
+def endpoint_for_url(url: str) -> Optional[str]:
+    """Endpoint family of a Helius URL ("rpc", "enhanced", "webhooks"), None for other hosts"""
+    if url.startswith(HELIUS_RPC_URL):
+        return "rpc"
+    if url.startswith(f"{HELIUS_API_URL}/webhooks"):
+        return "webhooks"
+    if url.startswith(HELIUS_API_URL):
+        return "enhanced"
+    return None
+
+
+def get_circuit_breaker(endpoint: str) -> CircuitBreaker:
+    """
+    Get the circuit breaker of an endpoint family
+
+    Args:
+        endpoint: "rpc", "enhanced" or "webhooks"
+
+    Returns:
+        CircuitBreaker shared by every client
+    """
+    return _circuit_breakers[endpoint]
+
+
+def check_circuit(endpoint: str):
+    """
+    Fail fast if an endpoint family is unavailable (does not admit a request)
+
+    Raises:
+        CircuitOpenError: If the endpoint's circuit is open
+    """
+    breaker = get_circuit_breaker(endpoint)
+    if breaker.is_open():
+        raise CircuitOpenError(endpoint, breaker.retry_in())
+
+
+def get_circuit_breaker_stats() -> Dict[str, Dict[str, Any]]:
+    """Get state and statistics of every circuit breaker, keyed by endpoint family"""
+    return {endpoint: breaker.get_stats() for endpoint, breaker in _circuit_breakers.items()}
+
+
+# ============================================================================
+# Transport
+# ============================================================================
+
+
+class HeliusTransport:
+    """
+    Process-wide async HTTP client for Helius endpoints.
+
+    The underlying httpx.AsyncClient is bound to a private event loop running in
+    a daemon thread, which makes it safe to share between the FastAPI event loop
+    and the ANALYSIS_EXECUTOR / WEBHOOK_EXECUTOR worker threads.
+    """
+
+    def __init__(
+        self,
+        http2: bool = HTTP2_AVAILABLE,
+        limits: httpx.Limits = DEFAULT_LIMITS,
+        timeout: float = DEFAULT_TIMEOUT,
+        mock_transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        """
+        Args:
+            http2: Enable HTTP/2 multiplexing (requires the h2 package)
+            limits: Connection pool limits
+            timeout: Default request timeout in seconds
+            mock_transport: Optional httpx transport override (used by tests)
+        """
+        self.http2 = http2
+        self.limits = limits
+        self.timeout = timeout
+        self._mock_transport = mock_transport
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._client: Optional[httpx.AsyncClient] = None
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def _ensure_started(self) -> asyncio.AbstractEventLoop:
+        """Start the transport loop thread and client on first use"""
+        if self._loop is not None:
+            return self._loop
+
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                ready = threading.Event()
+
+                def run_loop():
+                    asyncio.set_event_loop(loop)
+                    self._client = httpx.AsyncClient(
+                        http2=self.http2,
+                        limits=self.limits,
+                        timeout=self.timeout,
+                        headers={"Content-Type": "application/json"},
+                        transport=self._mock_transport,
+                    )
+                    ready.set()
+                    loop.run_forever()
+
+                thread = threading.Thread(target=run_loop, name="helius-io", daemon=True)
+                thread.start()
+                ready.wait()
+                self._thread = thread
+                self._loop = loop
+
+        return self._loop
+
+    @property
+    def is_running(self) -> bool:
+        return self._loop is not None and self._loop.is_running()
+
+    def close(self):
+        """Close the shared client and stop the transport loop"""
+        with self._lock:
+            loop, thread, client = self._loop, self._thread, self._client
+            self._loop = None
+            self._thread = None
+            self._client = None
+
+        if loop is None:
+            return
+
+        if client is not None:
+            asyncio.run_coroutine_threadsafe(client.aclose(), loop).result(timeout=10)
+        loop.call_soon_threadsafe(loop.stop)
+        if thread is not None:
+            thread.join(timeout=10)
+        loop.close()
+
+    # ------------------------------------------------------------------
+    # Execution helpers
+    # ------------------------------------------------------------------
+
+    def _on_transport_loop(self) -> bool:
+        try:
+            return asyncio.get_running_loop() is self._loop
+        except RuntimeError:
+            return False
+
+    def run(self, coro: Awaitable[T], timeout: Optional[float] = None) -> T:
+        """
+        Run a coroutine on the transport loop and block until it completes.
+
+        Intended for synchronous callers (worker threads). Must not be called
+        from the transport loop itself.
+        """
+        loop = self._ensure_started()
+        if self._on_transport_loop():
+            raise RuntimeError("HeliusTransport.run() cannot be called from the transport loop; await it instead")
+        return asyncio.run_coroutine_threadsafe(coro, loop).result(timeout)
+
+    def call_soon(self, callback: Callable[[], Any]):
+        """Schedule a callback on the transport loop from any thread (runs it directly if the loop is not running)"""
+        loop = self._loop
+        if loop is not None and loop.is_running():
+            try:
+                loop.call_soon_threadsafe(callback)
+                return
+            except RuntimeError:
+                pass  # closed in the meantime
+        callback()
+
+    async def submit(self, coro: Awaitable[T]) -> T:
+        """Await a coroutine on the transport loop from any event loop"""
+        loop = self._ensure_started()
+        if self._on_transport_loop():
+            return await coro
+        return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, loop))
+
+    # ------------------------------------------------------------------
+    # HTTP
+    # ------------------------------------------------------------------
+
+    async def _send(
+        self,
+        method: str,
+        url: str,
+        json: Any = None,
+        params: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: Optional[float] = None,
+    ) -> httpx.Response:
+        return await self._client.request(
+            method,
+            url,
+            json=json,
+            params=params,
+            headers=headers,
+            timeout=timeout if timeout is not None else self.timeout,
+        )
+
+    async def _send_limited(
+        self,
+        limiter: Optional[HeliusRateLimiter],
+        breaker: Optional[CircuitBreaker],
+        credits: int,
+        method: str,
+        url: str,
+        json: Any,
+        params: Optional[Dict[str, Any]],
+        headers: Optional[Dict[str, str]],
+        timeout: Optional[float],
+    ) -> httpx.Response:
+        """
+        Pass the circuit breaker, wait for the limiter and a concurrency slot, then send once
+
+        The request counts as in flight meanwhile. Its outcome (429, 5xx and
+        transport errors count as congestion) feeds the key's AIMD window, and
+        5xx / transport errors count as failures for the endpoint's breaker.
+
+        Raises:
+            CircuitOpenError: If the endpoint's circuit is open (nothing is sent)
+        """
+        probe = breaker.before_request() if breaker is not None else False
+
+        failed = None
+        try:
+            if limiter is None:
+                response = await self._send(method, url, json=json, params=params, headers=headers, timeout=timeout)
+            else:
+                response = await self._send_counted(limiter, credits, method, url, json, params, headers, timeout)
+            failed = response.status_code >= 500
+            return response
+        except httpx.TransportError:
+            failed = True
+            raise
+        finally:
+            if breaker is not None:
+                breaker.record(failed, probe)
+
+    async def _send_counted(
+        self,
+        limiter: HeliusRateLimiter,
+        credits: int,
+        method: str,
+        url: str,
+        json: Any,
+        params: Optional[Dict[str, Any]],
+        headers: Optional[Dict[str, str]],
+        timeout: Optional[float],
+    ) -> httpx.Response:
+        """Send under the key's rate limiter and AIMD window"""
+        limiter.in_flight += 1
+        try:
+            await limiter.acquire(credits)
+            try:
+                started = await limiter.concurrency.acquire()
+            except asyncio.CancelledError:
+                limiter.refund(credits)
+                raise
+            limiter.record_sent(credits)
+            congested = False
+            try:
+                response = await self._send(method, url, json=json, params=params, headers=headers, timeout=timeout)
+                congested = response.status_code in RETRYABLE_STATUS_CODES
+                return response
+            except httpx.TransportError:
+                congested = True
+                raise
+            finally:
+                limiter.concurrency.release(started, congested)
+        finally:
+            limiter.in_flight -= 1
+
+    async def _send_with_retries(
+        self,
+        method: str,
+        url: str,
+        json: Any = None,
+        params: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: Optional[float] = None,
+        api_key: Union[str, HeliusKeyPool, None] = None,
+        credits: int = 1,
+        retry: Optional[bool] = None,
+    ) -> httpx.Response:
+        """
+        Send through the key's rate limiter, retrying 429/5xx and transport errors
+
+        Only idempotent requests are retried: by default GETs, DELETEs and
+        JSON-RPC calls (all reads). A POST or PUT that may have been applied
+        upstream, such as creating a webhook, is sent once unless retry=True.
+
+        With a HeliusKeyPool, each attempt picks a key from the pool and sends
+        it as the api-key query parameter, so a retry after a 429 moves to
+        another key instead of waiting out the throttled one.
+
+        Raises:
+            CircuitOpenError: If the endpoint's circuit is (or becomes) open
+        """
+        endpoint = endpoint_for_url(url)
+        breaker = get_circuit_breaker(endpoint) if endpoint else None
+        pool = api_key if isinstance(api_key, HeliusKeyPool) else None
+        if pool is not None:
+            limiter = get_rate_limiter(pool.primary_key)
+        else:
+            limiter = get_rate_limiter(api_key) if api_key else None
+        if retry is None:
+            retry = method.upper() in IDEMPOTENT_METHODS or endpoint == "rpc"
+        attempts = (limiter.max_retries if limiter and retry else 0) + 1
+
+        for attempt in range(attempts):
+            if pool is not None:
+                key = pool.select(credits)
+                limiter = get_rate_limiter(key)
+                params = {**(params or {}), "api-key": key}
+            is_last_attempt = attempt + 1 >= attempts
+
+            try:
+                response = await self._send_limited(
+                    limiter, breaker, credits, method, url, json, params, headers, timeout
+                )
+            except httpx.TransportError:
+                if is_last_attempt:
+                    raise
+                await asyncio.sleep(limiter.backoff_delay(attempt))
+                continue
+
+            if response.status_code not in RETRYABLE_STATUS_CODES:
+                return response
+
+            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            if response.status_code == 429 and limiter:
+                limiter.record_throttle(retry_after)
+            if is_last_attempt:
+                return response
+            # A pooled retry goes to another key; the throttled key's limiter enforces its own Retry-After
+            await asyncio.sleep(limiter.backoff_delay(attempt, retry_after if pool is None else None))
+
+        return response
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        json: Any = None,
+        params: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: Optional[float] = None,
+        api_key: Union[str, HeliusKeyPool, None] = None,
+        credits: int = 1,
+        retry: Optional[bool] = None,
+    ) -> httpx.Response:
+        """
+        Send an HTTP request through the shared pool.
+
+        Args:
+            api_key: Helius API key the request is billed to (enables rate limiting + retries),
+                     or a HeliusKeyPool to pick the key per attempt
+            credits: Credit cost of the request, charged against the key's budget
+            retry: Retry 429/5xx and transport errors (default: only idempotent requests)
+
+        Returns:
+            httpx.Response with the body already read
+        """
+        return await self.submit(
+            self._send_with_retries(
+                method, url, json, params, headers, timeout, api_key=api_key, credits=credits, retry=retry
+            )
+        )
+
+    def request_sync(
+        self,
+        method: str,
+        url: str,
+        json: Any = None,
+        params: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: Optional[float] = None,
+        api_key: Union[str, HeliusKeyPool, None] = None,
+        credits: int = 1,
+        retry: Optional[bool] = None,
+    ) -> httpx.Response:
+        """Blocking variant of request() for worker threads"""
+        return self.run(
+            self._send_with_retries(
+                method, url, json, params, headers, timeout, api_key=api_key, credits=credits, retry=retry
+            )
+        )
+
+
+# Global transport instance (created lazily)
+_transport: Optional[HeliusTransport] = None
+_transport_lock = threading.Lock()
+
+
+def get_transport() -> HeliusTransport:
+    """
+    Get the process-wide Helius transport
+
+    Returns:
+        Shared HeliusTransport instance
+    """
+    global _transport
+    if _transport is None:
+        with _transport_lock:
+            if _transport is None:
+                _transport = HeliusTransport()
+    return _transport
+
+
+def close_transport():
+    """Close the process-wide transport (called on application shutdown)"""
+    global _transport
+    with _transport_lock:
+        transport, _transport = _transport, None
+    if transport is not None:
+        transport.close()
@@ -0,0 +1,252 @@
+"""
+Parsed Transaction Store
+Compact per-token store of the parsed transactions behind an analysis
+
+analyze_token_early_bidders keeps the transactions it scored here so that
+changing min_usd, the time window or the wallet count can be answered by
+re-running the scoring locally instead of re-fetching from Helius.
+
+When the fetch stopped early because the earliest buyers were settled, the
+set only covers history up to its last block time; that point is stored with
+it so re-scoring can refuse parameters that would need later transactions.
+
+Transactions are reduced to BuyRecords - signature, block time, buyer and
+lamports paid, exactly what _extract_buy_info derives from a transaction -
+and stored zlib-compressed next to the page cache. The fetch pipeline and the
+parse pool workers hand transactions over in the same layout, so scoring
+never needs the parsed transfer lists.
+"""
+
+import sqlite3
+import threading
+import time
+import zlib
+from contextlib import contextmanager
+from typing import Dict, List, NamedTuple, Optional, Tuple, Union
+
+import orjson
+
+from helius_page_cache import PAGE_CACHE_FILE
+
+# Native transfers at or below this many lamports are treated as fees by
+# _extract_buy_info and can never identify a buyer
+MIN_BUY_LAMPORTS = 100000
+
+
+class BuyRecord(NamedTuple):
+    """What buyer scoring needs from one transaction of the analyzed mint"""
+
+    signature: Optional[str]
+    timestamp: Optional[int]  # block time
+    buyer: Optional[str] = None  # largest SOL sender if the transaction bought the mint
+    lamports: int = 0  # SOL the buyer paid
+
+
+def find_buy(tx: Dict, mint_address: str) -> Tuple[Optional[str], int]:
+    """
+    Find the buyer of a parsed transaction
+
+    Same rule as _extract_buy_info: a transaction is a buy when someone receives
+    the mint, and the buyer is the largest SOL sender above the fee threshold.
+
+    Args:
+        tx: Parsed transaction
+        mint_address: Token mint address
+
+    Returns:
+        Tuple of (buyer wallet, lamports paid), or (None, 0) if it is not a buy
+    """
+    try:
+        # Someone received the mint?
+        for transfer in tx.get("tokenTransfers", []):
+            if transfer.get("mint") == mint_address and transfer.get("toUserAccount"):
+                break
+        else:
+            return None, 0
+
+        # Largest SOL sender, found once for the transaction
+        largest_sol_payment = MIN_BUY_LAMPORTS
+        buyer_wallet = None
+        for native in tx.get("nativeTransfers", []):
+            sender = native.get("fromUserAccount")
+            if sender and native.get("amount", 0) > largest_sol_payment:
+                largest_sol_payment = native["amount"]
+                buyer_wallet = sender
+    except Exception:
+        # Malformed transaction - _extract_buy_info skips these too
+        return None, 0
+
+    return (buyer_wallet, largest_sol_payment) if buyer_wallet else (None, 0)
+
+
+def buy_records(transactions: List[Union[Dict, BuyRecord]], mint_address: str) -> List[BuyRecord]:
+    """
+    Reduce parsed transactions to BuyRecords
+
+    Args:
+        transactions: Parsed transactions (oldest first); BuyRecords are passed through
+        mint_address: Token mint the transactions were fetched for
+
+    Returns:
+        One BuyRecord per transaction, in the same order
+    """
+    records = []
+    for tx in transactions:
+        if isinstance(tx, BuyRecord):
+            records.append(tx)
+        else:
+            records.append(BuyRecord(tx.get("signature"), tx.get("timestamp"), *find_buy(tx, mint_address)))
+    return records
+
+
+class ParsedTransactionStore:
+    """SQLite-backed store of the BuyRecords behind an analysis, one row per mint"""
+
+    def __init__(self, db_path: str = PAGE_CACHE_FILE):
+        """
+        Args:
+            db_path: SQLite file holding the store table
+        """
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._initialized = False
+
+    @contextmanager
+    def _connect(self):
+        """Context manager for store database connections"""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            if not self._initialized:
+                self._init_schema(conn)
+            yield conn
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+    def _init_schema(self, conn: sqlite3.Connection):
+        with self._lock:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS parsed_transactions (
+                    mint_address TEXT PRIMARY KEY,
+                    body BLOB NOT NULL,
+                    tx_count INTEGER NOT NULL,
+                    updated_at REAL NOT NULL,
+                    covered_until INTEGER
+                )
+            """)
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(parsed_transactions)")}
+            if "covered_until" not in columns:
+                # Sets stored before coverage was tracked are treated as complete
+                conn.execute("ALTER TABLE parsed_transactions ADD COLUMN covered_until INTEGER")
+            self._initialized = True
+
+    def save(
+        self, mint_address: str, transactions: List[Union[Dict, BuyRecord]], covered_until: Optional[int] = None
+    ) -> bool:
+        """
+        Store the transactions behind an analysis, replacing any previous set
+
+        Args:
+            mint_address: Token mint address
+            transactions: BuyRecords or parsed transactions (oldest first)
+            covered_until: Block time the set is complete up to (exclusive) when the
+                           fetch stopped early, None if nothing was skipped
+
+        Returns:
+            True if the transactions were stored
+        """
+        records = buy_records(transactions, mint_address)
+        # Stored as one array per record (orjson does not encode NamedTuples)
+        body = zlib.compress(orjson.dumps([tuple(record) for record in records]), 6)
+
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    """
+                    INSERT OR REPLACE INTO parsed_transactions (mint_address, body, tx_count, updated_at, covered_until)
+                    VALUES (?, ?, ?, ?, ?)
+                """,
+                    (mint_address, body, len(records), time.time(), covered_until),
+                )
+        except sqlite3.Error as e:
+            print(f"[TxStore] Write failed: {e}")
+            return False
+
+        return True
+
+    def load(self, mint_address: str) -> Optional[List[BuyRecord]]:
+        """
+        Load the stored transactions for a token
+
+        Args:
+            mint_address: Token mint address
+
+        Returns:
+            BuyRecords (oldest first), or None if nothing is stored
+        """
+        try:
+            with self._connect() as conn:
+                row = conn.execute(
+                    "SELECT body FROM parsed_transactions WHERE mint_address = ?", (mint_address,)
+                ).fetchone()
+        except sqlite3.Error as e:
+            print(f"[TxStore] Read failed: {e}")
+            return None
+
+        if row is None:
+            return None
+        rows = orjson.loads(zlib.decompress(row[0]))
+        if rows and isinstance(rows[0], dict):
+            # Stored before records, as compacted transaction dicts
+            return buy_records(rows, mint_address)
+        return [BuyRecord(*row) for row in rows]
+
+    def covered_until(self, mint_address: str) -> Optional[int]:
+        """
+        Block time the stored set is complete up to
+
+        Args:
+            mint_address: Token mint address
+
+        Returns:
+            Exclusive block time bound if the fetch stopped early, None if the set
+            is complete (or nothing is stored)
+        """
+        try:
+            with self._connect() as conn:
+                row = conn.execute(
+                    "SELECT covered_until FROM parsed_transactions WHERE mint_address = ?", (mint_address,)
+                ).fetchone()
+        except sqlite3.Error as e:
+            print(f"[TxStore] Read failed: {e}")
+            return None
+
+        return row[0] if row else None
+
+    def delete(self, mint_address: str):
+        """Remove the stored transactions for a token"""
+        with self._connect() as conn:
+            conn.execute("DELETE FROM parsed_transactions WHERE mint_address = ?", (mint_address,))
+
+
+# Global store instance (created lazily)
+_tx_store: Optional[ParsedTransactionStore] = None
+_tx_store_lock = threading.Lock()
+
+
+def get_tx_store() -> ParsedTransactionStore:
+    """
+    Get the process-wide parsed transaction store
+
+    Returns:
+        Shared ParsedTransactionStore instance
+    """
+    global _tx_store
+    if _tx_store is None:
+        with _tx_store_lock:
+            if _tx_store is None:
+                _tx_store = ParsedTransactionStore()
+    return _tx_store
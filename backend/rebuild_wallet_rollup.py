@@ -0,0 +1,24 @@
+#!/usr/bin/env python3
+"""
+Wallet Rollup Rebuild
+Recomputes the wallet_rollup table from early_buyer_wallets
+
+The rollup is kept current by every write that changes a wallet's tokens;
+rebuild it after editing analyzed_tokens.db by hand or restoring a backup.
+Run from the backend directory: python rebuild_wallet_rollup.py
+"""
+
+import time
+
+import analyzed_tokens_db as db
+
+
+def main():
+    print(f"[Rollup] Rebuilding wallet_rollup in {db.DATABASE_FILE}...")
+    started = time.perf_counter()
+    wallets = db.rebuild_wallet_rollup()
+    print(f"[Rollup] Done: {wallets} wallets in {time.perf_counter() - started:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -13,12 +13,40 @@ from typing import Any, Dict, Generator
 import pytest
 from fastapi.testclient import TestClient
 
+import db_pool
+import helius_checkpoints
+import helius_creation_times
+import helius_transport
 from app import settings, state
 
 # Import the app
 from app.main import create_app
 
 
+@pytest.fixture(autouse=True)
+def creation_times(tmp_path, monkeypatch):
+    """Keep token creation times recorded by fetches out of the real Helius cache database"""
+    store = helius_creation_times.CreationTimeStore(db_path=str(tmp_path / "creation_times.db"))
+    monkeypatch.setattr(helius_creation_times, "_creation_time_store", store)
+    return store
+
+
+@pytest.fixture(autouse=True)
+def checkpoints(tmp_path, monkeypatch):
+    """Keep deep analysis checkpoints out of the real Helius cache database"""
+    store = helius_checkpoints.DeepAnalysisCheckpointStore(db_path=str(tmp_path / "checkpoints.db"))
+    monkeypatch.setattr(helius_checkpoints, "_checkpoint_store", store)
+    return store
+
+
+@pytest.fixture(autouse=True)
+def circuit_breakers(monkeypatch):
+    """Closed Helius circuit breakers for each test, so failure tests don't trip later ones"""
+    breakers = {endpoint: helius_transport.CircuitBreaker(endpoint) for endpoint in helius_transport.CIRCUIT_ENDPOINTS}
+    monkeypatch.setattr(helius_transport, "_circuit_breakers", breakers)
+    return breakers
+
+
 @pytest.fixture(scope="function")
 def test_db_path() -> Generator[str, None, None]:
     """Create a temporary test database for each test"""
@@ -27,7 +55,8 @@ def test_db_path() -> Generator[str, None, None]:
 
     yield db_path
 
-    # Cleanup
+    # Cleanup (close pooled connections first so the file can be removed)
+    db_pool.close_pool(db_path)
     if os.path.exists(db_path):
         try:
             os.unlink(db_path)
@@ -0,0 +1,227 @@
+"""
+Tests for analysis router
+
+Tests zero-credit re-scoring from stored transactions, extending analyses and deep mode
+"""
+
+import threading
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+import analyzed_tokens_db as db
+import helius_tx_store
+from app.routers import analysis
+from app.routers.analysis import extend_token_analysis, run_token_analysis_sync
+from app.state import get_analysis_job, set_analysis_job
+from helius_api import TokenAnalyzer
+from helius_tx_store import ParsedTransactionStore
+
+MINT = "4k3Dyjzvzp8eMZWUXbBCjEvwSkkk59S5iCNLY3QrkX6R"
+EARLY_WALLET = "DYw8jCTfwHNRJhhmFcbXvVDTqWMEVFBX6ZKUmG5CNSKK"
+LATE_WALLET = "GmaDrppBC7P5ARKV8g3djiwP89vz1jLK23V2GBjuAEGB"
+
+
+def make_buy(wallet: str, timestamp: int, lamports: int) -> dict:
+    return {
+        "signature": f"sig{timestamp}",
+        "timestamp": timestamp,
+        "tokenTransfers": [{"mint": MINT, "toUserAccount": f"ata-{wallet}", "tokenAmount": 1000}],
+        "nativeTransfers": [{"fromUserAccount": wallet, "toUserAccount": "curve", "amount": lamports}],
+    }
+
+
+@pytest.fixture
+def tx_store(tmp_path, monkeypatch):
+    store = ParsedTransactionStore(db_path=str(tmp_path / "cache.db"))
+    monkeypatch.setattr(helius_tx_store, "_tx_store", store)
+    monkeypatch.setattr(db, "ANALYSIS_RESULTS_DIR", str(tmp_path / "analysis_results"))
+    monkeypatch.setattr(db, "AXIOM_EXPORTS_DIR", str(tmp_path / "axiom_exports"))
+    return store
+
+
+@pytest.fixture
+def analyzed_token(test_db: str, tx_store: ParsedTransactionStore) -> int:
+    # Early wallet spends 0.5 SOL ($100), late wallet 2 SOL ($400) one hour later
+    tx_store.save(
+        MINT, [make_buy(EARLY_WALLET, 1_700_000_000, 500_000_000), make_buy(LATE_WALLET, 1_700_003_600, 2_000_000_000)]
+    )
+    return db.save_analyzed_token(
+        token_address=MINT,
+        token_name="Test Token",
+        token_symbol="TEST",
+        acronym="TT",
+        early_bidders=[{"wallet_address": EARLY_WALLET, "total_usd": 100.0, "wallet_balance_usd": 1234.0}],
+        axiom_json=[],
+        credits_used=300,
+        max_wallets=10,
+        fetch_cursor={
+            "pagination_token": "p1",
+            "last_slot": 5,
+            "last_block_time": 1_700_003_600,
+            "transactions_fetched": 2,
+        },
+    )
+
+
+@pytest.mark.integration
+class TestRescore:
+    """Test POST /analysis/{token_id}/rescore"""
+
+    def test_rescore_applies_new_thresholds(self, test_client: TestClient, analyzed_token: int):
+        """Raising min_usd drops the small early buyer without spending credits"""
+        response = test_client.post(f"/analysis/{analyzed_token}/rescore", json={"min_usd": 200})
+        assert response.status_code == 200
+
+        data = response.json()
+        assert data["credits_used"] == 0
+        assert data["total_transactions_analyzed"] == 2
+        assert [b["wallet_address"] for b in data["early_bidders"]] == [LATE_WALLET]
+
+        history = db.get_token_analysis_history(analyzed_token)
+        assert len(history) == 2
+        latest_run = max(history, key=lambda run: run["id"])
+        assert latest_run["credits_used"] == 0
+
+    def test_rescore_time_window_and_known_balances(self, test_client: TestClient, analyzed_token: int):
+        """A 1-hour window keeps only the first buyer and reuses its stored balance"""
+        response = test_client.post(f"/analysis/{analyzed_token}/rescore", json={"min_usd": 0, "time_window_hours": 1})
+        assert response.status_code == 200
+
+        bidders = response.json()["early_bidders"]
+        assert len(bidders) == 2  # the late buy lands exactly on the window end
+        assert bidders[0]["wallet_address"] == EARLY_WALLET
+        assert bidders[0]["wallet_balance_usd"] == 1234.0
+        assert bidders[1]["wallet_balance_usd"] is None
+
+    def test_rescore_without_stored_transactions(self, test_client: TestClient, analyzed_token: int, tx_store):
+        """Tokens analyzed before the store existed need a full analysis"""
+        tx_store.delete(MINT)
+        response = test_client.post(f"/analysis/{analyzed_token}/rescore", json={})
+        assert response.status_code == 409
+
+    def test_rescore_beyond_early_stop_needs_extend(self, test_client: TestClient, analyzed_token: int, tx_store):
+        """A fetch that stopped early cannot answer windows reaching past its last transaction"""
+        transactions = tx_store.load(MINT)
+        tx_store.save(MINT, transactions, covered_until=1_700_003_601)
+
+        response = test_client.post(f"/analysis/{analyzed_token}/rescore", json={})
+        assert response.status_code == 409
+        assert "extend" in response.json()["detail"]
+
+        response = test_client.post(f"/analysis/{analyzed_token}/rescore", json={"min_usd": 0, "time_window_hours": 1})
+        assert response.status_code == 200
+
+    def test_rescore_runs_off_the_event_loop(self, test_client: TestClient, analyzed_token: int):
+        threads = []
+        original = analysis.rescore_token_sync
+
+        def recording_rescore(*args):
+            threads.append(threading.current_thread().name)
+            return original(*args)
+
+        with patch.object(analysis, "rescore_token_sync", side_effect=recording_rescore):
+            response = test_client.post(f"/analysis/{analyzed_token}/rescore", json={"min_usd": 200})
+
+        assert response.status_code == 200
+        assert threads[0].startswith("analysis")
+
+    def test_rescore_unknown_token(self, test_client: TestClient, tx_store):
+        response = test_client.post("/analysis/9999/rescore", json={})
+        assert response.status_code == 404
+
+
+@pytest.mark.integration
+class TestExtend:
+    """Test fetch cursors and extend mode"""
+
+    def test_rescore_runs_keep_the_fetch_cursor(self, test_client: TestClient, analyzed_token: int):
+        test_client.post(f"/analysis/{analyzed_token}/rescore", json={"min_usd": 200})
+
+        cursor = db.get_latest_fetch_cursor(MINT)
+        assert cursor["token_id"] == analyzed_token
+        assert cursor["pagination_token"] == "p1"
+        assert cursor["transactions_fetched"] == 2
+
+    def test_extend_to_fetched_depth_rescores_for_free(self, test_client: TestClient, analyzed_token: int):
+        result = extend_token_analysis(
+            TokenAnalyzer("test-key"), MINT, 0, 999999, max_transactions=2, max_credits=1000, max_wallets=10
+        )
+
+        assert result["api_credits_used"] == 0
+        assert result["token_info"]["onChainMetadata"]["metadata"]["name"] == "Test Token"
+        assert [b["wallet_address"] for b in result["early_bidders"]] == [EARLY_WALLET, LATE_WALLET]
+
+    def test_extend_unknown_token(self, test_db: str, tx_store):
+        assert extend_token_analysis(TokenAnalyzer("test-key"), MINT, 0, 999999, 500, 1000, 10) is None
+
+
+@pytest.mark.integration
+class TestDeepMode:
+    """Test deep analysis jobs"""
+
+    def test_deep_job_reports_progress(self, test_client: TestClient, test_db: str, tx_store):
+        def fake_deep(**kwargs):
+            kwargs["on_progress"]({"pages": 1, "transactions_fetched": 100, "credits_used": 100})
+            return {
+                "token_info": {"onChainMetadata": {"metadata": {"name": "Deep Token", "symbol": "DEEP"}}},
+                "early_bidders": [{"wallet_address": EARLY_WALLET, "first_buy_time": "2023-11-14T22:13:20"}],
+                "first_transaction_time": "2023-11-14T22:13:20",
+                "api_credits_used": 100,
+                "covered_until": 1_700_000_100,
+            }
+
+        set_analysis_job("deepjob", {"job_id": "deepjob", "token_address": MINT, "status": "queued"})
+        with patch.object(TokenAnalyzer, "deep_analyze_token", side_effect=fake_deep) as deep:
+            run_token_analysis_sync("deepjob", MINT, 50, 999999, 20000, 5000, 10, mode="deep")
+
+        assert deep.call_args.kwargs["max_transactions"] == 20000
+        job = get_analysis_job("deepjob")
+        assert job["status"] == "completed"
+        assert job["progress"] == {"pages": 1, "transactions_fetched": 100, "credits_used": 100}
+        assert db.get_latest_fetch_cursor(MINT) is None
+
+        # The early stop's truncated totals are recorded on the run
+        history = test_client.get(f"/api/tokens/{job['token_id']}/history").json()
+        assert history["runs"][0]["covered_until"] == 1_700_000_100
+
+
+@pytest.mark.integration
+class TestAnalysisList:
+    """Test the completed token list"""
+
+    def test_tokens_carry_latest_run_wallets(self, test_client: TestClient, analyzed_token: int):
+        # Re-analysis ranks the late wallet first; the earlier run's wallets are not mixed in
+        rerun = [{"wallet_address": LATE_WALLET, "total_usd": 400.0}, {"wallet_address": "third"}]
+        db.save_analyzed_token(MINT, "Test Token", "TEST", "TT", early_bidders=rerun, axiom_json=[])
+        other_id = db.save_analyzed_token(
+            "OtherMint", "Other", "OTH", "OT", early_bidders=[{"wallet_address": EARLY_WALLET}], axiom_json=[]
+        )
+        empty_id = db.save_analyzed_token("EmptyMint", "Empty", "EMP", "EM", early_bidders=[], axiom_json=[])
+
+        wallets = {token["id"]: token["wallet_addresses"] for token in db.get_analyzed_tokens(limit=10)}
+        assert wallets == {analyzed_token: [LATE_WALLET, "third"], other_id: [EARLY_WALLET], empty_id: []}
+
+        response = test_client.get("/analysis")
+        assert response.status_code == 200
+        assert {job["job_id"] for job in response.json()["jobs"]} == {str(analyzed_token), str(other_id), str(empty_id)}
+
+
+@pytest.mark.integration
+class TestCircuitBreaker:
+    """Test analysis jobs while Helius RPC is down"""
+
+    def test_job_fails_fast_while_rpc_circuit_open(self, test_db: str, circuit_breakers):
+        breaker = circuit_breakers["rpc"]
+        for _ in range(breaker.failure_threshold):
+            breaker.record(True)
+
+        set_analysis_job("downjob", {"job_id": "downjob", "token_address": MINT, "status": "queued"})
+        with patch.object(TokenAnalyzer, "analyze_token") as analyze:
+            run_token_analysis_sync("downjob", MINT, 50, 999999, 500, 1000, 10)
+
+        analyze.assert_not_called()
+        job = get_analysis_job("downjob")
+        assert job["status"] == "failed"
+        assert "rpc circuit open" in job["error"]
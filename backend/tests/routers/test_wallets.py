@@ -4,7 +4,7 @@ Tests for wallets router
 Tests multi-token wallet queries and balance refresh
 """
 
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, patch
 
 import pytest
 from fastapi.testclient import TestClient
@@ -84,6 +84,32 @@ class TestMultiTokenWallets:
         assert wallet is not None
         assert wallet["token_count"] >= 2
 
+    def test_multi_token_wallets_follow_trash(self, test_client: TestClient, test_db: str):
+        """Test that trashing and restoring a token updates the wallet rollup"""
+        shared = [{"wallet_address": "DYw8jCTfwHNRJhhmFcbXvVDTqWMEVFBX6ZKUmG5CNSKK", "wallet_balance_usd": 10.0}]
+        first_id = db.save_analyzed_token("Token1Address", "Token 1", "TK1", "TK1", shared, [])
+        second_id = db.save_analyzed_token("Token2Address", "Token 2", "TK2", "TK2", shared, [])
+
+        def shared_wallets():
+            from app.routers import wallets
+
+            wallets.cache.cache.clear()
+            return test_client.get("/multi-token-wallets?min_tokens=2").json()["wallets"]
+
+        [wallet] = shared_wallets()
+        assert wallet["token_ids"] == [first_id, second_id]
+        assert wallet["token_names"] == ["Token 1", "Token 2"]
+        assert wallet["token_addresses"] == ["Token1Address", "Token2Address"]
+
+        assert test_client.delete(f"/api/tokens/{first_id}").status_code == 200
+        assert shared_wallets() == []
+
+        assert test_client.post(f"/api/tokens/{first_id}/restore").status_code == 200
+        assert len(shared_wallets()) == 1
+
+        assert test_client.delete(f"/api/tokens/{second_id}/permanent").status_code == 200
+        assert shared_wallets() == []
+
     def test_multi_token_wallets_caching(self, test_client: TestClient, test_db: str):
         """Test that multi-token wallets endpoint uses caching"""
         # First request
@@ -102,14 +128,11 @@ class TestMultiTokenWallets:
 class TestBalanceRefresh:
     """Test wallet balance refresh functionality"""
 
-    @patch("requests.get")
-    def test_refresh_wallet_balances(self, mock_get, test_client: TestClient):
+    @patch("helius_api.HeliusAPI._rpc_call_async", new_callable=AsyncMock)
+    def test_refresh_wallet_balances(self, mock_call, test_client: TestClient):
         """Test refreshing wallet balances"""
-        # Mock Helius API response
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {"nativeBalance": 5000000}
-        mock_get.return_value = mock_response
+        # Mock Helius getMultipleAccounts response
+        mock_call.return_value = {"value": [{"lamports": 5000000}]}
 
         payload = {"wallet_addresses": ["DYw8jCTfwHNRJhhmFcbXvVDTqWMEVFBX6ZKUmG5CNSKK"]}
 
@@ -128,13 +151,10 @@ class TestBalanceRefresh:
         response = test_client.post("/wallets/refresh-balances", json=payload)
         assert response.status_code == 422  # Validation error (min_items=1)
 
-    @patch("requests.get")
-    def test_refresh_multiple_balances(self, mock_get, test_client: TestClient):
+    @patch("helius_api.HeliusAPI._rpc_call_async", new_callable=AsyncMock)
+    def test_refresh_multiple_balances(self, mock_call, test_client: TestClient):
         """Test refreshing multiple wallet balances"""
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {"nativeBalance": 1000000}
-        mock_get.return_value = mock_response
+        mock_call.return_value = {"value": [{"lamports": 1000000}, None]}
 
         payload = {
             "wallet_addresses": [
@@ -149,3 +169,8 @@ class TestBalanceRefresh:
         data = response.json()
         assert data["total_wallets"] == 2
         assert len(data["results"]) == 2
+        # Both wallets fetched in a single batched call
+        assert mock_call.call_count == 1
+        assert data["api_credits_used"] == 1
+        # Missing accounts report a zero balance
+        assert data["results"][1]["balance_usd"] == 0
@@ -0,0 +1,201 @@
+"""
+Tests for the analyzed tokens database helpers
+
+Tests saving analyses (wallet batches, re-analysis runs), the wallet rollup and schema migrations
+"""
+
+import sqlite3
+
+import pytest
+
+import analyzed_tokens_db as db
+import db_migrations
+from db_migrations import Migration, apply_migrations, latest_version, schema_version
+
+MINT = "4k3Dyjzvzp8eMZWUXbBCjEvwSkkk59S5iCNLY3QrkX6R"
+
+
+def bidders(count: int, prefix: str = "wallet") -> list:
+    return [
+        {"wallet_address": f"{prefix}{i}", "total_usd": 100.0 + i, "transaction_count": 2, "first_buy_time": None}
+        for i in range(count)
+    ]
+
+
+@pytest.mark.unit
+class TestSaveAnalyzedToken:
+    """Test storing an analysis and its early buyers"""
+
+    def test_saves_ranked_wallets_in_one_run(self, test_db: str, capsys):
+        token_id = db.save_analyzed_token(MINT, "Test Token", "TEST", "TT", bidders(300), [], max_wallets=250)
+
+        details = db.get_token_details(token_id)
+        assert details["wallets_found"] == 300
+        wallets = details["wallets"]
+        assert len(wallets) == 250
+        assert [w["wallet_address"] for w in wallets[:2]] == ["wallet0", "wallet1"]
+        assert wallets[1]["axiom_name"] == "(2/250)$101|TT"
+        assert "Saved token TT with 250 wallets" in capsys.readouterr().out
+
+    def test_counts_skipped_duplicates(self, test_db: str, capsys):
+        duplicated = bidders(3) + bidders(2)
+        db.save_analyzed_token(MINT, "Test Token", "TEST", "TT", duplicated, [])
+
+        assert "3 new wallets, 2 already existed" in capsys.readouterr().out
+
+    def test_reanalysis_updates_token_and_adds_run(self, test_db: str):
+        token_id = db.save_analyzed_token(MINT, "Test Token", "TEST", "TT", bidders(2), [], credits_used=100)
+        again = db.save_analyzed_token(MINT, "Renamed", "TEST", "TT", bidders(3, "new"), [], credits_used=50)
+
+        assert again == token_id
+        runs = db.get_token_analysis_history(token_id)
+        assert sorted(len(run["wallets"]) for run in runs) == [2, 3]
+        assert [run["covered_until"] for run in runs] == [None, None]
+        token = db.get_analyzed_tokens(limit=1)[0]
+        assert token["token_name"] == "Renamed"
+        assert token["credits_used"] == 150
+        assert token["wallet_addresses"] == ["new0", "new1", "new2"]
+
+
+@pytest.mark.unit
+class TestWalletRollup:
+    """Test the incrementally maintained wallet_rollup table"""
+
+    def rollup(self) -> dict:
+        with db.get_db_reader() as conn:
+            rows = conn.execute("SELECT wallet_address, token_count, token_ids, wallet_balance_usd FROM wallet_rollup")
+            return {row[0]: tuple(row)[1:] for row in rows}
+
+    def test_follows_saves_trash_and_deletes(self, test_db: str):
+        first = db.save_analyzed_token(MINT, "First", "ONE", "O", bidders(2), [])
+        second = db.save_analyzed_token("OtherMint", "Second", "TWO", "T", bidders(1), [])
+
+        [wallet] = db.get_multi_token_wallets(min_tokens=2)
+        assert wallet["wallet_address"] == "wallet0"
+        assert wallet["token_ids"] == [first, second]
+        assert wallet["token_names"] == ["First (ONE)", "Second (TWO)"]
+        assert wallet["token_addresses"] == [MINT, "OtherMint"]
+
+        assert db.soft_delete_token(second)
+        assert db.get_multi_token_wallets(min_tokens=2) == []
+        assert self.rollup()["wallet0"][:2] == (1, str(first))
+
+        assert db.restore_token(second)
+        assert len(db.get_multi_token_wallets(min_tokens=2)) == 1
+
+        assert db.permanent_delete_token(first)
+        assert self.rollup() == {"wallet0": (1, str(second), None)}
+
+    def test_balance_updates_and_rebuild(self, test_db: str):
+        db.save_analyzed_token(MINT, "First", "ONE", "O", bidders(2), [])
+        db.save_analyzed_token("OtherMint", "Second", "TWO", "T", bidders(3), [])
+        assert db.update_wallet_balance("wallet1", 42.5)
+
+        maintained = self.rollup()
+        assert maintained["wallet1"] == (2, maintained["wallet1"][1], 42.5)
+        assert db.rebuild_wallet_rollup() == 3
+        assert self.rollup() == maintained
+
+    def test_trashed_token_balance_is_not_the_wallet_balance(self, test_db: str):
+        older = db.save_analyzed_token(MINT, "First", "ONE", "O", [dict(bidders(1)[0], wallet_balance_usd=10.0)], [])
+        newer = db.save_analyzed_token(
+            "OtherMint", "Second", "TWO", "T", [dict(bidders(1)[0], wallet_balance_usd=99.0)], []
+        )
+        with db.get_db_connection() as conn:
+            for token_id, timestamp in ((older, "2024-01-01 00:00:00"), (newer, "2024-02-01 00:00:00")):
+                conn.execute(
+                    "UPDATE analysis_runs SET analysis_timestamp = ? WHERE token_id = ?", (timestamp, token_id)
+                )
+        db.rebuild_wallet_rollup()
+        assert self.rollup()["wallet0"] == (2, f"{older},{newer}", 99.0)
+
+        # Only active tokens count, for the balance as for the token list
+        assert db.soft_delete_token(newer)
+        assert self.rollup()["wallet0"] == (1, str(older), 10.0)
+        assert db.restore_token(newer)
+        assert self.rollup()["wallet0"][2] == 99.0
+
+
+@pytest.mark.unit
+class TestMigrations:
+    """Test the user_version migration registry"""
+
+    def test_new_database_is_fully_migrated(self, test_db: str):
+        with db.get_db_reader() as conn:
+            assert schema_version(conn) == latest_version()
+            indexes = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+        assert "idx_early_buyer_wallets_run_position" in indexes
+
+    def test_up_to_date_startup_reads_one_pragma(self, test_db: str):
+        statements = []
+        with db.get_db_connection() as conn:
+            conn.set_trace_callback(statements.append)
+            try:
+                db.init_database()
+            finally:
+                conn.set_trace_callback(None)
+
+        assert statements == ["PRAGMA user_version"]
+
+    def test_upgrades_pre_versioning_database(self, tmp_path):
+        conn = sqlite3.connect(str(tmp_path / "old.db"))
+        conn.execute("""
+            CREATE TABLE analyzed_tokens (
+                id INTEGER PRIMARY KEY AUTOINCREMENT, token_address TEXT UNIQUE NOT NULL, token_name TEXT,
+                token_symbol TEXT, acronym TEXT, analysis_timestamp TIMESTAMP, first_buy_timestamp TIMESTAMP,
+                wallets_found INTEGER DEFAULT 0, axiom_json TEXT, webhook_id TEXT, is_deleted BOOLEAN DEFAULT 0,
+                deleted_at TIMESTAMP, analysis_file_path TEXT, axiom_file_path TEXT
+            )
+        """)
+        conn.execute("""
+            CREATE TABLE early_buyer_wallets (
+                id INTEGER PRIMARY KEY AUTOINCREMENT, token_id INTEGER NOT NULL, wallet_address TEXT NOT NULL,
+                position INTEGER NOT NULL, first_buy_usd REAL, first_buy_timestamp TIMESTAMP, axiom_name TEXT,
+                UNIQUE(token_id, wallet_address)
+            )
+        """)
+        conn.execute(
+            "INSERT INTO analyzed_tokens (token_address, analysis_timestamp, wallets_found) VALUES (?, ?, 2)",
+            (MINT, "2024-01-01 00:00:00"),
+        )
+        conn.executemany(
+            "INSERT INTO early_buyer_wallets (token_id, wallet_address, position) VALUES (1, ?, ?)",
+            [("wallet0", 1), ("wallet1", 2)],
+        )
+        conn.commit()
+
+        assert apply_migrations(conn) == latest_version()
+        assert schema_version(conn) == latest_version()
+
+        runs = conn.execute("SELECT id, token_id, analysis_timestamp, wallets_found FROM analysis_runs").fetchall()
+        assert runs == [(1, 1, "2024-01-01 00:00:00", 2)]
+        assert conn.execute("SELECT DISTINCT analysis_run_id FROM early_buyer_wallets").fetchall() == [(1,)]
+        # Per-run uniqueness: the same wallet may now appear in a second run of the token
+        conn.execute("INSERT INTO analysis_runs (token_id) VALUES (1)")
+        conn.execute(
+            "INSERT INTO early_buyer_wallets (token_id, analysis_run_id, wallet_address, position) VALUES (1, 2, 'wallet0', 1)"
+        )
+        assert conn.execute("SELECT credits_used FROM analyzed_tokens").fetchone() == (0,)
+        rollup = conn.execute("SELECT wallet_address, token_count FROM wallet_rollup ORDER BY wallet_address")
+        assert rollup.fetchall() == [("wallet0", 1), ("wallet1", 1)]
+
+        assert apply_migrations(conn) == 0
+        conn.close()
+
+    def test_failed_migration_rolls_back(self, tmp_path, monkeypatch):
+        def broken(conn):
+            conn.execute("CREATE TABLE half_done (id INTEGER)")
+            raise RuntimeError("boom")
+
+        version = latest_version()
+        monkeypatch.setattr(
+            db_migrations, "MIGRATIONS", db_migrations.MIGRATIONS + [Migration(version + 1, "Broken", broken)]
+        )
+        conn = sqlite3.connect(str(tmp_path / "new.db"))
+
+        with pytest.raises(RuntimeError):
+            apply_migrations(conn)
+
+        assert schema_version(conn) == version
+        assert conn.execute("SELECT name FROM sqlite_master WHERE name = 'half_done'").fetchone() is None
+        conn.close()
@@ -0,0 +1,137 @@
+"""
+Tests for the SQLite connection pool
+
+Tests WAL setup, reader/writer separation and the async facade
+"""
+
+import asyncio
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from db_pool import SQLitePool
+
+
+@pytest.fixture
+def pool(tmp_path):
+    pool = SQLitePool(str(tmp_path / "pool.db"), readers=2)
+    with pool.writer() as conn:
+        conn.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT UNIQUE)")
+    yield pool
+    pool.close()
+
+
+@pytest.mark.unit
+class TestSQLitePool:
+    """Test pooled writer and reader connections"""
+
+    def test_connections_use_wal_and_are_reused(self, pool):
+        with pool.writer() as writer:
+            assert writer.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+            assert writer.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+        with pool.writer() as again:
+            assert again is writer
+
+        with pool.reader() as reader:
+            assert reader.execute("PRAGMA query_only").fetchone()[0] == 1
+            with pytest.raises(sqlite3.OperationalError):
+                reader.execute("INSERT INTO items (name) VALUES ('x')")
+
+    def test_writer_rolls_back_on_error(self, pool):
+        with pytest.raises(ValueError):
+            with pool.writer() as conn:
+                conn.execute("INSERT INTO items (name) VALUES ('lost')")
+                raise ValueError("boom")
+
+        with pool.reader() as conn:
+            assert conn.execute("SELECT COUNT(*) FROM items").fetchone()[0] == 0
+
+    def test_nested_writer_shares_transaction(self, pool):
+        with pool.writer() as outer:
+            outer.execute("INSERT INTO items (name) VALUES ('a')")
+            with pool.writer() as inner:
+                assert inner is outer
+                inner.execute("INSERT INTO items (name) VALUES ('b')")
+            assert outer.in_transaction
+
+        with pool.reader() as conn:
+            assert conn.execute("SELECT COUNT(*) FROM items").fetchone()[0] == 2
+
+    def test_readers_do_not_wait_for_open_write(self, pool):
+        """A reader sees the last committed state while a write transaction is open"""
+        with pool.writer() as conn:
+            conn.execute("INSERT INTO items (name) VALUES ('committed')")
+
+        counts = []
+        with pool.writer() as conn:
+            conn.execute("INSERT INTO items (name) VALUES ('pending')")
+
+            def read():
+                with pool.reader() as reader:
+                    counts.append(reader.execute("SELECT COUNT(*) FROM items").fetchone()[0])
+
+            thread = threading.Thread(target=read)
+            thread.start()
+            thread.join(timeout=5)
+
+        assert counts == [1]
+
+    def test_async_writer_and_reader(self, pool):
+        async def main():
+            async with pool.writer_async() as conn:
+                await conn.execute("INSERT INTO items (name) VALUES (?)", ("async",))
+            with pytest.raises(sqlite3.IntegrityError):
+                async with pool.writer_async() as conn:
+                    await conn.execute("INSERT INTO items (name) VALUES (?)", ("async",))
+            async with pool.reader_async() as conn:
+                cursor = await conn.execute("SELECT name FROM items")
+                return [dict(row) for row in await cursor.fetchall()]
+
+        assert asyncio.run(main()) == [{"name": "async"}]
+        # The writer was released after the failed transaction
+        with pool.writer() as conn:
+            conn.execute("INSERT INTO items (name) VALUES ('after')")
+
+    def test_more_async_users_than_executor_threads(self, pool):
+        """Waiting for a connection must not hold the executor threads its holder needs to finish"""
+
+        async def write(n):
+            async with pool.writer_async() as conn:
+                await conn.execute("INSERT INTO items (name) VALUES (?)", (f"item{n}",))
+                await asyncio.sleep(0.001)
+
+        async def read():
+            async with pool.reader_async() as conn:
+                cursor = await conn.execute("SELECT COUNT(*) FROM items")
+                await asyncio.sleep(0.001)
+                return (await cursor.fetchone())[0]
+
+        async def main():
+            executor = ThreadPoolExecutor(max_workers=2)
+            asyncio.get_running_loop().set_default_executor(executor)
+            users = [write(n) for n in range(20)] + [read() for _ in range(20)]
+            await asyncio.wait_for(asyncio.gather(*users), timeout=20)
+            async with pool.reader_async() as conn:
+                cursor = await conn.execute("SELECT COUNT(*) FROM items")
+                return (await cursor.fetchone())[0]
+
+        assert asyncio.run(main()) == 20
+
+    def test_cancelled_async_waiter_passes_the_connection_on(self, pool):
+        async def main():
+            async with pool.writer_async():
+                waiter = asyncio.create_task(pool.writer_async().__aenter__())
+                second = asyncio.create_task(write_later())
+                await asyncio.sleep(0.01)
+                waiter.cancel()
+            await asyncio.wait_for(second, timeout=5)
+
+        async def write_later():
+            async with pool.writer_async() as conn:
+                await conn.execute("INSERT INTO items (name) VALUES ('later')")
+
+        asyncio.run(main())
+        with pool.reader() as conn:
+            assert conn.execute("SELECT COUNT(*) FROM items").fetchone()[0] == 1
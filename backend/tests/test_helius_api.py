@@ -0,0 +1,728 @@
+"""
+Tests for the Helius API client
+
+Tests request batching and credit accounting (network calls are mocked)
+"""
+
+import asyncio
+import random
+import time
+import zlib
+from datetime import datetime
+from unittest.mock import AsyncMock, patch
+
+import orjson
+import pytest
+from solders.keypair import Keypair
+
+from helius_api import (
+    CREATION_LOOKUP_MAX_CALLS,
+    DEEP_MAX_TRANSACTIONS,
+    MAX_ACCOUNTS_PER_BATCH,
+    MAX_CONCURRENT_TRANSACTION_BATCHES,
+    TRANSACTION_BATCH_SIZE,
+    EarlyBidderAggregator,
+    HeliusAPI,
+    lamports_to_usd,
+    parse_transaction_list,
+    strip_unparsed_fields,
+)
+from helius_checkpoints import DeepAnalysisCheckpointStore
+from helius_creation_times import CreationTimeStore
+from helius_page_cache import TransactionPageCache
+from helius_parse_pool import close_parse_pool
+from helius_tx_store import BuyRecord, ParsedTransactionStore, buy_records
+
+
+@pytest.fixture
+def helius():
+    return HeliusAPI("test-key")
+
+
+@pytest.mark.unit
+class TestWalletBalances:
+    """Test batched wallet balance lookups"""
+
+    def test_balances_are_chunked(self, helius):
+        """Wallets are sent to getMultipleAccounts in chunks of 100"""
+        wallets = [f"wallet{i}" for i in range(MAX_ACCOUNTS_PER_BATCH + 50)]
+
+        async def fake_rpc(method, params):
+            assert method == "getMultipleAccounts"
+            return {"value": [{"lamports": int(w[6:])} for w in params[0]]}
+
+        with patch.object(HeliusAPI, "_rpc_call_async", side_effect=fake_rpc) as mock_rpc:
+            balances, credits = helius.get_wallet_balances(wallets)
+
+        assert mock_rpc.call_count == 2
+        assert credits == 2
+        assert balances["wallet0"] == 0
+        assert balances[f"wallet{MAX_ACCOUNTS_PER_BATCH + 49}"] == MAX_ACCOUNTS_PER_BATCH + 49
+
+    def test_failed_chunk_maps_to_none(self, helius):
+        """A failed chunk yields None balances and costs nothing"""
+        with patch.object(HeliusAPI, "_rpc_call_async", new_callable=AsyncMock, side_effect=Exception("boom")):
+            balances, credits = helius.get_wallet_balances(["a", "b"])
+
+        assert balances == {"a": None, "b": None}
+        assert credits == 0
+
+    def test_lamports_to_usd(self):
+        assert lamports_to_usd(1_000_000_000) == 200
+
+
+@pytest.mark.unit
+class TestScoring:
+    """Test local early bidder scoring"""
+
+    MINT = "4k3Dyjzvzp8eMZWUXbBCjEvwSkkk59S5iCNLY3QrkX6R"
+    BUYER = "DYw8jCTfwHNRJhhmFcbXvVDTqWMEVFBX6ZKUmG5CNSKK"
+
+    def make_tx(self, timestamp: int) -> dict:
+        return {
+            "signature": f"sig{timestamp}",
+            "timestamp": timestamp,
+            "type": "UNKNOWN",
+            "tokenTransfers": [
+                {"mint": self.MINT, "toUserAccount": "ata", "fromUserAccount": None, "tokenAmount": 5.0},
+                {"mint": "other", "toUserAccount": "x", "fromUserAccount": None, "tokenAmount": 1.0},
+            ],
+            "nativeTransfers": [
+                {"fromUserAccount": self.BUYER, "toUserAccount": None, "amount": 1_000_000_000},
+                {"fromUserAccount": "feepayer", "toUserAccount": None, "amount": 5000},
+                {"fromUserAccount": None, "toUserAccount": "curve", "amount": 1_000_000_000},
+            ],
+        }
+
+    def test_buy_records_score_identically(self, helius):
+        """BuyRecords yield the same early bidders as the full transactions"""
+        transactions = [self.make_tx(1_700_000_000 + i) for i in range(3)]
+
+        full = helius.score_early_bidders(transactions, self.MINT, min_usd=50)
+        records = helius.score_early_bidders(buy_records(transactions, self.MINT), self.MINT, min_usd=50)
+
+        assert full == records
+        assert full["early_bidders"][0]["transaction_count"] == 3
+
+    def test_buy_records_match_per_transaction_extraction(self, helius):
+        """buy_records finds the same buyers and amounts as _extract_buy_info"""
+        rng = random.Random(1)
+        transactions = []
+        for i in range(300):
+            tx = self.make_tx(1_700_000_000 + i)
+            tx["nativeTransfers"] = [
+                {
+                    "fromUserAccount": rng.choice([self.BUYER, "other", None]),
+                    "toUserAccount": "curve",
+                    "amount": rng.choice([5000, 100000, 100001, rng.randrange(10**9)]),
+                }
+                for _ in range(rng.randrange(0, 4))
+            ]
+            if rng.random() < 0.3:
+                tx["tokenTransfers"][0]["toUserAccount"] = None
+            if rng.random() < 0.05:
+                tx["nativeTransfers"].append({"fromUserAccount": rng.choice(["bad", None]), "amount": None})
+            transactions.append(tx)
+        transactions.append({"timestamp": 1, "tokenTransfers": ["not-a-transfer"]})
+
+        expected = [(tx, helius._extract_buy_info(tx, self.MINT)) for tx in transactions]
+        expected = [(wallet, usd, tx["timestamp"]) for tx, (wallet, usd) in expected if wallet]
+        records = buy_records(transactions, self.MINT)
+
+        assert len(records) == len(transactions)
+        assert [(r.buyer, lamports_to_usd(r.lamports), r.timestamp) for r in records if r.buyer] == expected
+        assert len(expected) > 50
+
+    def test_store_round_trips_buy_records(self, tmp_path):
+        """Stored sets load as BuyRecords, including sets saved as compacted transaction dicts"""
+        store = ParsedTransactionStore(db_path=str(tmp_path / "cache.db"))
+        transactions = [self.make_tx(1_700_000_000 + i) for i in range(3)]
+        expected = buy_records(transactions, self.MINT)
+
+        store.save(self.MINT, transactions)
+        assert store.load(self.MINT) == expected
+
+        with store._connect() as conn:
+            conn.execute("UPDATE parsed_transactions SET body = ?", (zlib.compress(orjson.dumps(transactions)),))
+        assert store.load(self.MINT) == expected
+
+    def test_aggregator_state_round_trips(self, helius):
+        """A restored snapshot scores the rest of the history like an uninterrupted run"""
+        transactions = [self.make_tx(1_700_000_000 + i) for i in range(4)]
+        whole = EarlyBidderAggregator(helius, self.MINT, min_usd=50)
+        whole.add_transactions(transactions)
+
+        first_half = EarlyBidderAggregator(helius, self.MINT, min_usd=50)
+        first_half.add_transactions(transactions[:2])
+        resumed = EarlyBidderAggregator(helius, self.MINT, min_usd=50)
+        resumed.restore(orjson.loads(orjson.dumps(first_half.state())))
+        resumed.add_transactions(transactions[2:])
+
+        assert resumed.result() == whole.result()
+        assert resumed.transactions_seen == 4
+        assert whole.result()["early_bidders"][0]["first_buy_time"] == datetime.utcfromtimestamp(1_700_000_000)
+
+
+def wallet(index: int) -> str:
+    """Deterministic on-curve (signer) wallet address"""
+    return str(Keypair.from_seed((index + 1).to_bytes(32, "big")).pubkey())
+
+
+def make_raw_buy(mint: str, buyer: str, block_time: int) -> dict:
+    """Raw getTransactionsForAddress entry where `buyer` pays 1 SOL for the token"""
+    return {
+        "signature": f"sig{block_time}",
+        "blockTime": block_time,
+        "transaction": {"message": {"accountKeys": [buyer, f"ata{block_time}", "curve"]}},
+        "meta": {
+            "preBalances": [2_000_000_000, 0, 0],
+            "postBalances": [1_000_000_000, 0, 1_000_000_000],
+            "preTokenBalances": [{"accountIndex": 1, "mint": mint, "uiTokenAmount": {"uiAmount": 0}}],
+            "postTokenBalances": [{"accountIndex": 1, "mint": mint, "uiTokenAmount": {"uiAmount": 5}}],
+        },
+    }
+
+
+def make_raw_pages(mint: str, page_count: int) -> dict:
+    """Pages of 100 buys by distinct wallets, keyed by the paginationToken that requests them"""
+    pages = {}
+    for p in range(page_count):
+        buys = []
+        for i in range(100):
+            index = p * 100 + i
+            buyer = wallet(index)
+            buys.append(make_raw_buy(mint, buyer, 1_600_000_000 + index))
+        next_token = f"p{p + 1}" if p + 1 < page_count else None
+        pages[None if p == 0 else f"p{p}"] = {"data": buys, "paginationToken": next_token}
+    return pages
+
+
+@pytest.mark.unit
+def test_stripping_unparsed_fields_keeps_parse_result():
+    result = make_raw_pages("mint", 1)[None]
+    for tx in result["data"]:
+        tx["meta"]["logMessages"] = ["Program log: Instruction: Buy"]
+        tx["meta"]["innerInstructions"] = [{"index": 0, "instructions": []}]
+    expected = parse_transaction_list(result["data"])
+
+    strip_unparsed_fields(result)
+
+    assert "logMessages" not in result["data"][0]["meta"]
+    assert "innerInstructions" not in result["data"][0]["meta"]
+    assert parse_transaction_list(result["data"]) == expected
+
+
+@pytest.fixture
+def streaming_helius(tmp_path):
+    return HeliusAPI(
+        "test-key",
+        page_cache=TransactionPageCache(db_path=str(tmp_path / "cache.db"), max_bytes=0),
+        tx_store=ParsedTransactionStore(db_path=str(tmp_path / "cache.db")),
+        creation_times=CreationTimeStore(db_path=str(tmp_path / "cache.db")),
+        checkpoints=DeepAnalysisCheckpointStore(db_path=str(tmp_path / "cache.db")),
+    )
+
+
+@pytest.mark.unit
+class TestEarlyTermination:
+    """Test that pagination stops once the earliest buyers are settled"""
+
+    MINT = "4k3Dyjzvzp8eMZWUXbBCjEvwSkkk59S5iCNLY3QrkX6R"
+
+    def make_pages(self, page_count: int) -> dict:
+        return make_raw_pages(self.MINT, page_count)
+
+    def test_stops_after_first_page_when_settled(self, streaming_helius):
+        pages = self.make_pages(2)
+
+        def fake_rpc(method, params):
+            return pages[params[1].get("paginationToken")]
+
+        with (
+            patch.object(HeliusAPI, "_rpc_call", side_effect=fake_rpc) as mock_rpc,
+            patch.object(HeliusAPI, "get_wallet_balances", return_value=({}, 0)),
+            patch.object(HeliusAPI, "get_token_metadata", return_value=(None, 0)),
+            patch.object(HeliusAPI, "get_token_creation_time", return_value=(None, 0)),
+        ):
+            result = streaming_helius.analyze_token_early_bidders(self.MINT, min_usd=50, max_wallets_to_store=10)
+
+        assert mock_rpc.call_count == 1
+        assert result["api_credits_used"] == 100
+        assert len(result["early_bidders"]) == 10
+        assert result["early_bidders"][0]["first_buy_time"] == datetime.utcfromtimestamp(1_600_000_000)
+
+    def test_keeps_paginating_until_enough_buyers(self, streaming_helius):
+        pages = self.make_pages(2)
+
+        def fake_rpc(method, params):
+            return pages[params[1].get("paginationToken")]
+
+        with (
+            patch.object(HeliusAPI, "_rpc_call", side_effect=fake_rpc) as mock_rpc,
+            patch.object(HeliusAPI, "get_wallet_balances", return_value=({}, 0)),
+            patch.object(HeliusAPI, "get_token_metadata", return_value=(None, 0)),
+            patch.object(HeliusAPI, "get_token_creation_time", return_value=(None, 0)),
+        ):
+            result = streaming_helius.analyze_token_early_bidders(
+                self.MINT, min_usd=50, max_transactions=300, max_wallets_to_store=150
+            )
+
+        assert mock_rpc.call_count == 2
+        assert len(result["early_bidders"]) == 150
+
+    def test_early_stop_limits_rescore_to_fetched_history(self, streaming_helius):
+        pages = self.make_pages(2)
+        with (
+            patch.object(HeliusAPI, "_rpc_call", side_effect=lambda m, p: pages[p[1].get("paginationToken")]),
+            patch.object(HeliusAPI, "get_wallet_balances", return_value=({}, 0)),
+            patch.object(HeliusAPI, "get_token_metadata", return_value=(None, 0)),
+            patch.object(HeliusAPI, "get_token_creation_time", return_value=(None, 0)),
+        ):
+            result = streaming_helius.analyze_token_early_bidders(self.MINT, min_usd=50, max_wallets_to_store=10)
+
+        # Later buys could still add to the totals, so the stored set only covers the first page
+        assert result["covered_until"] == 1_600_000_099
+        assert result["fetch_stats"]["covered_until"] == 1_600_000_099
+        assert streaming_helius.tx_store.covered_until(self.MINT) == 1_600_000_099
+
+        refused = streaming_helius.rescore_early_bidders(self.MINT, min_usd=50, max_wallets_to_store=20)
+        assert refused["needs_extend"]
+        assert refused["early_bidders"] == []
+
+        # A window ending inside the fetched history is answered exactly
+        short = streaming_helius.rescore_early_bidders(self.MINT, min_usd=50, time_window_hours=0)
+        assert len(short["early_bidders"]) == 1
+
+    def test_complete_fetch_has_no_coverage_limit(self, streaming_helius):
+        pages = self.make_pages(1)
+        with (
+            patch.object(HeliusAPI, "_rpc_call", side_effect=lambda m, p: pages[p[1].get("paginationToken")]),
+            patch.object(HeliusAPI, "get_wallet_balances", return_value=({}, 0)),
+            patch.object(HeliusAPI, "get_token_metadata", return_value=(None, 0)),
+            patch.object(HeliusAPI, "get_token_creation_time", return_value=(None, 0)),
+        ):
+            result = streaming_helius.analyze_token_early_bidders(self.MINT, min_usd=50, max_wallets_to_store=150)
+
+        assert result["covered_until"] is None
+        assert streaming_helius.tx_store.covered_until(self.MINT) is None
+        rescored = streaming_helius.rescore_early_bidders(self.MINT, min_usd=50, max_wallets_to_store=150)
+        assert len(rescored["early_bidders"]) == 100
+
+
+@pytest.mark.unit
+class TestPrefetch:
+    """Test fetching the next page while the current one is parsed"""
+
+    MINT = "4k3Dyjzvzp8eMZWUXbBCjEvwSkkk59S5iCNLY3QrkX6R"
+
+    def make_pages(self, page_count: int) -> dict:
+        return make_raw_pages(self.MINT, page_count)
+
+    def fetch(self, helius, pages, **kwargs):
+        def fake_rpc(method, params):
+            time.sleep(0.01)
+            return pages[params[1].get("paginationToken")]
+
+        with patch.object(HeliusAPI, "_rpc_call", side_effect=fake_rpc) as mock_rpc:
+            transactions, credits = helius._get_earliest_transactions_new(self.MINT, **kwargs)
+        return transactions, credits, mock_rpc.call_count
+
+    def test_prefetch_matches_sequential(self, streaming_helius):
+        pages = self.make_pages(3)
+        sequential = self.fetch(streaming_helius, pages, limit=500, max_credits=1000)
+        prefetched = self.fetch(streaming_helius, pages, limit=500, max_credits=1000, prefetch_depth=2)
+
+        assert prefetched == sequential
+        assert len(prefetched[0]) == 300
+        assert streaming_helius.last_fetch_stats["prefetch_saved_seconds"] >= 0
+
+    def test_prefetch_respects_credit_budget(self, streaming_helius):
+        transactions, credits, calls = self.fetch(
+            streaming_helius, self.make_pages(3), limit=500, max_credits=200, prefetch_depth=4
+        )
+        assert calls == 2
+        assert credits == 200
+        assert len(transactions) == 200
+
+    def test_early_stop_accounts_for_prefetched_page(self, streaming_helius):
+        aggregator = EarlyBidderAggregator(streaming_helius, self.MINT, min_usd=50, max_wallets_to_store=10)
+        transactions, credits, calls = self.fetch(
+            streaming_helius, self.make_pages(3), limit=500, max_credits=1000, aggregator=aggregator, prefetch_depth=1
+        )
+
+        assert aggregator.settled
+        assert len(transactions) == 100
+        # At most one page was in flight when the fetch stopped, and it is still billed
+        assert calls in (1, 2)
+        assert credits == calls * 100
+
+
+@pytest.mark.unit
+class TestCreationTime:
+    """Test resolving and storing token creation times"""
+
+    MINT = "4k3Dyjzvzp8eMZWUXbBCjEvwSkkk59S5iCNLY3QrkX6R"
+
+    def signature_pages(self, total: int):
+        """getSignaturesForAddress stand-in over `total` signatures, newest first"""
+        history = [{"signature": f"sig{i}", "blockTime": 1_600_000_000 + i} for i in range(total)][::-1]
+
+        def fake_rpc(method, params):
+            assert method == "getSignaturesForAddress"
+            before = params[1].get("before")
+            start = 0 if before is None else next(i for i, s in enumerate(history) if s["signature"] == before) + 1
+            return history[start : start + params[1]["limit"]]
+
+        return fake_rpc
+
+    def test_walks_back_to_first_signature_once(self, streaming_helius):
+        with patch.object(HeliusAPI, "_rpc_call", side_effect=self.signature_pages(2500)) as mock_rpc:
+            assert streaming_helius.get_token_creation_time(self.MINT) == (1_600_000_000, 3)
+            assert streaming_helius.get_token_creation_time(self.MINT) == (1_600_000_000, 0)
+
+        assert mock_rpc.call_count == 3
+
+    def test_long_history_is_not_walked(self, streaming_helius):
+        with patch.object(HeliusAPI, "_rpc_call", side_effect=self.signature_pages(20_000)):
+            assert streaming_helius.get_token_creation_time(self.MINT) == (None, CREATION_LOOKUP_MAX_CALLS)
+
+        assert streaming_helius.creation_times.get(self.MINT) is None
+
+    def test_unfiltered_fetch_records_creation_time(self, streaming_helius):
+        pages = make_raw_pages(self.MINT, 1)
+        requests = []
+
+        def fake_rpc(method, params):
+            requests.append(params[1])
+            return pages[params[1].get("paginationToken")]
+
+        with patch.object(HeliusAPI, "_rpc_call", side_effect=fake_rpc):
+            streaming_helius._get_earliest_transactions_new(self.MINT)
+            creation_time, credits = streaming_helius.get_token_creation_time(self.MINT)
+            streaming_helius._get_earliest_transactions_new(self.MINT, token_creation_time=creation_time)
+
+        assert (creation_time, credits) == (1_600_000_000, 0)
+        assert "filters" not in requests[0]
+        assert requests[1]["filters"] == {"blockTime": {"gte": 1_600_000_000}}
+
+
+@pytest.fixture(scope="module")
+def parse_workers():
+    yield 2
+    close_parse_pool()
+
+
+@pytest.mark.unit
+class TestParsePool:
+    """Test decoding and parsing pages in worker processes"""
+
+    MINT = "4k3Dyjzvzp8eMZWUXbBCjEvwSkkk59S5iCNLY3QrkX6R"
+
+    def fetch_raw(self, helius, pages):
+        def fake_rpc_raw(method, params):
+            result = pages[params[1].get("paginationToken")]
+            return orjson.dumps({"jsonrpc": "2.0", "id": 1, "result": result})
+
+        with patch.object(HeliusAPI, "_rpc_call_raw", side_effect=fake_rpc_raw) as mock_rpc:
+            transactions, credits = helius._get_earliest_transactions_new(self.MINT, limit=500, max_credits=1000)
+        return transactions, credits, mock_rpc.call_count
+
+    def test_pool_matches_in_process_parsing(self, streaming_helius, tmp_path, parse_workers):
+        pages = make_raw_pages(self.MINT, 3)
+        with patch.object(HeliusAPI, "_rpc_call", side_effect=lambda m, p: pages[p[1].get("paginationToken")]):
+            expected = streaming_helius._get_earliest_transactions_new(self.MINT, limit=500, max_credits=1000)
+        # Workers hand back BuyRecords, not parsed transaction dicts
+        assert all(isinstance(tx, BuyRecord) and tx.buyer for tx in expected[0])
+
+        pooled = HeliusAPI(
+            "test-key",
+            page_cache=TransactionPageCache(db_path=str(tmp_path / "pool.db"), max_bytes=0),
+            parse_workers=parse_workers,
+        )
+        transactions, credits, calls = self.fetch_raw(pooled, pages)
+
+        assert (transactions, credits) == expected
+        assert calls == 3
+
+    def test_pool_writes_and_reads_page_cache(self, tmp_path, parse_workers):
+        pooled = HeliusAPI(
+            "test-key", page_cache=TransactionPageCache(db_path=str(tmp_path / "pool.db")), parse_workers=parse_workers
+        )
+        pages = make_raw_pages(self.MINT, 3)
+
+        first = self.fetch_raw(pooled, pages)
+        second = self.fetch_raw(pooled, pages)
+
+        # The last page has no paginationToken, so it is fetched again
+        assert pooled.page_cache.get_stats()["pages"] == 2
+        assert second == (first[0], 100, 1)
+        assert pooled.last_fetch_stats["cached_pages"] == 2
+
+    def test_rpc_error_is_raised_from_worker(self, tmp_path, parse_workers):
+        pooled = HeliusAPI(
+            "test-key",
+            page_cache=TransactionPageCache(db_path=str(tmp_path / "pool.db"), max_bytes=0),
+            parse_workers=parse_workers,
+        )
+        error = orjson.dumps({"jsonrpc": "2.0", "id": 1, "error": {"code": -32600, "message": "bad"}})
+
+        with (
+            patch.object(HeliusAPI, "_rpc_call_raw", return_value=error),
+            patch.object(HeliusAPI, "_get_earliest_transactions_old", return_value=([], 0)) as fallback,
+        ):
+            pooled._get_earliest_transactions_new(self.MINT)
+
+        fallback.assert_called_once()
+
+
+@pytest.mark.unit
+class TestLegacyFallback:
+    """Test the getSignaturesForAddress + getTransaction fallback"""
+
+    MINT = "4k3Dyjzvzp8eMZWUXbBCjEvwSkkk59S5iCNLY3QrkX6R"
+
+    def test_fetches_earliest_transactions_in_concurrent_batches(self, helius):
+        history = [{"signature": f"sig{i}", "blockTime": 1_600_000_000 + i} for i in range(2500)][::-1]
+        in_flight = 0
+        max_in_flight = 0
+        batch_sizes = []
+
+        def fake_signatures(method, params):
+            before = params[1].get("before")
+            start = 0 if before is None else next(i for i, s in enumerate(history) if s["signature"] == before) + 1
+            return history[start : start + params[1]["limit"]]
+
+        async def fake_batch(method, params_list):
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            batch_sizes.append(len(params_list))
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            # sig3 is missing (e.g. pruned); everything else is a 1 SOL buy
+            return [
+                None if params[0] == "sig3" else make_raw_buy(self.MINT, "buyer", int(params[0][3:]) + 1_600_000_000)
+                for params in params_list
+            ]
+
+        with (
+            patch.object(HeliusAPI, "_rpc_call", side_effect=fake_signatures),
+            patch.object(HeliusAPI, "_rpc_batch_call_async", side_effect=fake_batch),
+        ):
+            transactions, credits = helius._get_earliest_transactions_old(self.MINT, limit=300)
+
+        assert [tx["signature"] for tx in transactions[:3]] == ["sig0", "sig1", "sig2"]
+        assert transactions[3]["signature"] == "sig4"
+        assert len(transactions) == 299
+        assert credits == 3 + 300
+        assert batch_sizes == [TRANSACTION_BATCH_SIZE] * (300 // TRANSACTION_BATCH_SIZE)
+        assert max_in_flight == MAX_CONCURRENT_TRANSACTION_BATCHES
+
+    def test_failed_batch_costs_nothing(self, helius):
+        with patch.object(HeliusAPI, "_rpc_batch_call_async", new_callable=AsyncMock, side_effect=Exception("boom")):
+            transactions, credits = helius.get_transactions(["a", "b"])
+
+        assert transactions == [None, None]
+        assert credits == 0
+
+
+@pytest.mark.unit
+class TestExtend:
+    """Test deepening an analysis from its stored fetch cursor"""
+
+    MINT = "4k3Dyjzvzp8eMZWUXbBCjEvwSkkk59S5iCNLY3QrkX6R"
+
+    def analyze(self, helius, pages, max_transactions):
+        with (
+            patch.object(HeliusAPI, "_rpc_call", side_effect=lambda m, p: pages[p[1].get("paginationToken")]),
+            patch.object(HeliusAPI, "get_wallet_balances", return_value=({}, 0)),
+            patch.object(HeliusAPI, "get_token_metadata", return_value=(None, 0)),
+            patch.object(HeliusAPI, "get_token_creation_time", return_value=(None, 0)),
+        ):
+            return helius.analyze_token_early_bidders(
+                self.MINT, min_usd=50, max_transactions=max_transactions, max_wallets_to_store=150
+            )
+
+    def test_extend_fetches_only_the_delta(self, streaming_helius):
+        pages = make_raw_pages(self.MINT, 3)
+        first = self.analyze(streaming_helius, pages, max_transactions=100)
+        cursor = first["fetch_cursor"]
+        assert cursor == {
+            "pagination_token": "p1",
+            "last_slot": None,
+            "last_block_time": 1_600_000_099,
+            "boundary_signatures": ["sig1600000099"],
+            "transactions_fetched": 100,
+        }
+
+        known_wallet = first["early_bidders"][0]["wallet_address"]
+        with (
+            patch.object(HeliusAPI, "_rpc_call", side_effect=lambda m, p: pages[p[1].get("paginationToken")]) as rpc,
+            patch.object(HeliusAPI, "get_wallet_balances", return_value=({}, 1)) as balances,
+            patch.object(HeliusAPI, "get_token_metadata", return_value=(None, 0)),
+            patch.object(HeliusAPI, "get_token_creation_time", return_value=(None, 0)),
+        ):
+            result = streaming_helius.extend_early_bidders(
+                self.MINT,
+                cursor,
+                max_new_transactions=100,
+                min_usd=50,
+                max_wallets_to_store=150,
+                known_balances={known_wallet: 42.0},
+            )
+
+        assert rpc.call_count == 1
+        assert rpc.call_args[0][1][1]["paginationToken"] == "p1"
+        assert result["api_credits_used"] == 101
+        assert result["new_transactions"] == 100
+        assert result["total_transactions_analyzed"] == 200
+        assert len(result["early_bidders"]) == 150
+        assert result["early_bidders"][0]["wallet_balance_usd"] == 42.0
+        assert known_wallet not in balances.call_args[0][0]
+        assert result["fetch_cursor"]["pagination_token"] == "p2"
+        assert result["fetch_cursor"]["transactions_fetched"] == 200
+
+    def test_extend_after_end_of_history_uses_block_time_and_dedupes(self, streaming_helius):
+        pages = make_raw_pages(self.MINT, 1)
+        first = self.analyze(streaming_helius, pages, max_transactions=500)
+        # As read back from analysis_runs, which does not persist the boundary signatures
+        cursor = dict(first["fetch_cursor"], pagination_token=None)
+        del cursor["boundary_signatures"]
+        newer = {
+            "data": [
+                pages[None]["data"][-1],
+                make_raw_buy(self.MINT, "DYw8jCTfwHNRJhhmFcbXvVDTqWMEVFBX6ZKUmG5CNSKK", 1_600_000_100),
+            ],
+            "paginationToken": None,
+        }
+
+        with (
+            patch.object(HeliusAPI, "_rpc_call", return_value=newer) as rpc,
+            patch.object(HeliusAPI, "get_wallet_balances", return_value=({}, 0)),
+            patch.object(HeliusAPI, "get_token_metadata", return_value=(None, 0)),
+            patch.object(HeliusAPI, "get_token_creation_time", return_value=(None, 0)),
+        ):
+            result = streaming_helius.extend_early_bidders(self.MINT, cursor, max_new_transactions=500, min_usd=50)
+
+        assert rpc.call_args[0][1][1]["filters"] == {"blockTime": {"gte": 1_600_000_099}}
+        assert result["new_transactions"] == 1
+        assert result["total_transactions_analyzed"] == 101
+        # The refetched boundary transaction is not counted twice
+        assert result["fetch_cursor"]["transactions_fetched"] == 101
+
+    def test_extend_without_stored_transactions(self, streaming_helius):
+        assert streaming_helius.extend_early_bidders(self.MINT, {"transactions_fetched": 100}, 100) is None
+
+
+@pytest.mark.unit
+class TestDeepAnalysis:
+    """Test streaming deep analyses with checkpoints"""
+
+    MINT = "4k3Dyjzvzp8eMZWUXbBCjEvwSkkk59S5iCNLY3QrkX6R"
+
+    def deep(self, helius, rpc, **kwargs):
+        kwargs = {"min_usd": 50, "max_wallets_to_store": 1000, **kwargs}
+        with (
+            patch.object(HeliusAPI, "_rpc_call", side_effect=rpc) as mock_rpc,
+            patch.object(HeliusAPI, "get_wallet_balances", return_value=({}, 0)),
+            patch.object(HeliusAPI, "get_token_metadata", return_value=(None, 0)),
+            patch.object(HeliusAPI, "get_token_creation_time", return_value=(1_600_000_000, 0)),
+        ):
+            return helius.deep_analyze_early_bidders(self.MINT, **kwargs), mock_rpc
+
+    def test_streams_past_the_fetch_cap(self, streaming_helius):
+        pages = make_raw_pages(self.MINT, 8)
+        progress = []
+
+        result, rpc = self.deep(
+            streaming_helius,
+            lambda m, p: pages[p[1].get("paginationToken")],
+            max_transactions=DEEP_MAX_TRANSACTIONS,
+            max_credits=1000,
+            on_progress=progress.append,
+        )
+
+        assert rpc.call_count == 8
+        assert result["total_transactions_analyzed"] == 800
+        assert len(result["early_bidders"]) == 800
+        assert result["api_credits_used"] == 800
+        assert not result["credit_limit_reached"]
+        assert [p["transactions_fetched"] for p in progress] == list(range(100, 900, 100))
+        assert progress[-1]["credits_used"] == 800
+        assert result["covered_until"] is None
+        assert "fetch_cursor" not in result
+        assert streaming_helius.checkpoints.load(self.MINT, {"min_usd": 50}) is None
+
+    def test_early_stop_reports_truncated_totals(self, streaming_helius):
+        pages = make_raw_pages(self.MINT, 3)
+
+        settled, rpc = self.deep(
+            streaming_helius, lambda m, p: pages[p[1].get("paginationToken")], max_wallets_to_store=10
+        )
+        assert rpc.call_count == 1
+        assert settled["covered_until"] == 1_600_000_099
+
+        # Once the window has closed, later buys could not have counted
+        closed, _ = self.deep(
+            streaming_helius,
+            lambda m, p: pages[p[1].get("paginationToken")],
+            max_wallets_to_store=1000,
+            time_window_hours=0,
+        )
+        assert closed["covered_until"] is None
+
+    def test_stops_cleanly_at_credit_budget(self, streaming_helius):
+        pages = make_raw_pages(self.MINT, 8)
+
+        result, rpc = self.deep(
+            streaming_helius,
+            lambda m, p: pages[p[1].get("paginationToken")],
+            max_transactions=5000,
+            max_credits=300,
+        )
+
+        assert rpc.call_count == 3
+        assert result["total_transactions_analyzed"] == 300
+        assert result["credit_limit_reached"]
+
+    def test_interrupted_run_resumes_from_checkpoint(self, streaming_helius):
+        pages = make_raw_pages(self.MINT, 5)
+        uninterrupted, _ = self.deep(
+            streaming_helius, lambda m, p: pages[p[1].get("paginationToken")], max_transactions=5000
+        )
+
+        def failing_rpc(method, params):
+            if params[1].get("paginationToken") == "p3":
+                raise Exception("connection reset")
+            return pages[params[1].get("paginationToken")]
+
+        with pytest.raises(RuntimeError, match="after 300 transactions"):
+            self.deep(streaming_helius, failing_rpc, max_transactions=5000, max_credits=1000)
+
+        result, rpc = self.deep(
+            streaming_helius, lambda m, p: pages[p[1].get("paginationToken")], max_transactions=5000, max_credits=1000
+        )
+
+        assert [c[0][1][1].get("paginationToken") for c in rpc.call_args_list] == ["p3", "p4"]
+        assert result["resumed"]
+        assert result["api_credits_used"] == 200
+        assert result["total_transactions_analyzed"] == 500
+        assert result["early_bidders"] == uninterrupted["early_bidders"]
+
+    def test_checkpoint_with_other_thresholds_is_discarded(self, streaming_helius):
+        pages = make_raw_pages(self.MINT, 2)
+
+        def failing_rpc(method, params):
+            if params[1].get("paginationToken"):
+                raise Exception("connection reset")
+            return pages[None]
+
+        with pytest.raises(RuntimeError):
+            self.deep(streaming_helius, failing_rpc, max_transactions=5000)
+
+        result, rpc = self.deep(
+            streaming_helius, lambda m, p: pages[p[1].get("paginationToken")], min_usd=100, max_transactions=5000
+        )
+
+        assert rpc.call_count == 2
+        assert not result["resumed"]
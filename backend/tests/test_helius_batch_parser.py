@@ -0,0 +1,124 @@
+"""
+Tests for the columnar transaction parser
+
+Tests that the NumPy batch parser matches the dict path exactly
+"""
+
+import random
+
+import pytest
+
+from helius_api import HeliusAPI
+from helius_batch_parser import NUMPY_AVAILABLE, _parse_columnar, parse_transaction_page
+
+pytestmark = pytest.mark.skipif(not NUMPY_AVAILABLE, reason="numpy not installed")
+
+MINTS = ["MintA111111111111111111111111111111111111111", "MintB111111111111111111111111111111111111111"]
+
+
+def random_token_balance(rng: random.Random, account_index: int) -> dict:
+    decimals = rng.choice([0, 6, 9])
+    raw = rng.randrange(0, 10**12)
+    ui_amount = None if raw == 0 or rng.random() < 0.2 else raw / 10**decimals
+    return {
+        "accountIndex": account_index,
+        "mint": rng.choice(MINTS),
+        "uiTokenAmount": {"uiAmount": ui_amount, "amount": str(raw), "decimals": decimals},
+    }
+
+
+def random_transaction(rng: random.Random, index: int) -> dict:
+    account_count = rng.randrange(1, 30)
+    accounts = [
+        {"pubkey": f"acct{index}_{i}", "signer": i == 0} if rng.random() < 0.5 else f"acct{index}_{i}"
+        for i in range(account_count)
+    ]
+    pre_balances = [rng.randrange(0, 10**10) for _ in range(account_count)]
+    post_balances = [b if rng.random() < 0.6 else rng.randrange(0, 10**10) for b in pre_balances]
+
+    # Indexes may point past accountKeys; pre/post sets overlap only partially
+    token_indexes = rng.sample(range(account_count + 3), min(account_count + 3, rng.randrange(0, 6)))
+    pre_tokens = [random_token_balance(rng, i) for i in token_indexes if rng.random() < 0.7]
+    post_tokens = [random_token_balance(rng, i) for i in token_indexes if rng.random() < 0.8]
+    # Some balances don't change
+    for post in post_tokens:
+        for pre in pre_tokens:
+            if pre["accountIndex"] == post["accountIndex"] and rng.random() < 0.3:
+                post["uiTokenAmount"] = dict(pre["uiTokenAmount"])
+
+    return {
+        "signature": f"sig{index}",
+        "blockTime": 1_700_000_000 + index,
+        "transaction": {"message": {"accountKeys": accounts, "instructions": [{"parsed": {"info": {"mint": "x"}}}]}},
+        "meta": {
+            "preBalances": pre_balances,
+            "postBalances": post_balances[: rng.choice([account_count, account_count - 1])],
+            "preTokenBalances": pre_tokens,
+            "postTokenBalances": post_tokens,
+        },
+    }
+
+
+def dict_path(helius: HeliusAPI, transactions: list) -> list:
+    results = []
+    for tx_data in transactions:
+        try:
+            results.append(helius._parse_rpc_transaction(tx_data, tx_data.get("signature")))
+        except Exception:
+            results.append(None)
+    return results
+
+
+@pytest.fixture
+def helius():
+    return HeliusAPI("test-key")
+
+
+@pytest.mark.unit
+class TestBatchParser:
+    """Test columnar parsing against the dict path"""
+
+    @pytest.mark.parametrize("seed", range(5))
+    def test_matches_dict_path(self, helius, seed):
+        rng = random.Random(seed)
+        transactions = [random_transaction(rng, i) for i in range(200)]
+
+        # Call the columnar path directly so a silent page fallback can't hide a mismatch
+        assert _parse_columnar(transactions) == dict_path(helius, transactions)
+
+    def test_malformed_transactions_match_dict_path(self, helius):
+        rng = random.Random(42)
+        good = random_transaction(rng, 0)
+        duplicate_index = random_transaction(rng, 1)
+        duplicate_index["meta"]["postTokenBalances"] = [random_token_balance(rng, 0), random_token_balance(rng, 0)]
+        transactions = [
+            good,
+            duplicate_index,
+            {"signature": "no-meta", "blockTime": 1, "meta": None},
+            {"signature": "bad-balance", "meta": {"preTokenBalances": [{}], "postTokenBalances": []}},
+            {"signature": "float-lamports", "meta": {"preBalances": [1.5], "postBalances": [2]}},
+            {"signature": "empty"},
+            "not-a-transaction",
+        ]
+
+        assert parse_transaction_page(transactions, helius._parse_rpc_transaction) == dict_path(helius, transactions)
+
+    def test_unparseable_amount_falls_back_for_page(self, helius):
+        rng = random.Random(7)
+        transactions = [random_transaction(rng, i) for i in range(5)]
+        transactions[2]["meta"]["preTokenBalances"] = [
+            {"accountIndex": 0, "mint": MINTS[0], "uiTokenAmount": {"uiAmount": None, "amount": "n/a", "decimals": 0}}
+        ]
+        transactions[2]["meta"]["postTokenBalances"] = []
+
+        assert parse_transaction_page(transactions, helius._parse_rpc_transaction) == dict_path(helius, transactions)
+
+    def test_helius_page_parse_is_identical(self):
+        rng = random.Random(3)
+        transactions = [random_transaction(rng, i) for i in range(100)]
+
+        columnar = HeliusAPI("test-key", columnar_parser=True)._parse_transaction_page(transactions)
+        default = HeliusAPI("test-key")._parse_transaction_page(transactions)
+
+        assert columnar == default
+        assert len(columnar) == 100
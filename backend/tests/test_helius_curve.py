@@ -0,0 +1,45 @@
+"""
+Tests for the wallet on-curve check
+
+Tests that PDAs are rejected and the pure-Python check matches solders
+"""
+
+import os
+
+import base58
+import pytest
+from solders.keypair import Keypair
+from solders.pubkey import Pubkey
+
+from helius_curve import is_on_curve, point_decompresses
+
+SYSTEM_PROGRAM = Pubkey.from_string("11111111111111111111111111111111")
+
+
+@pytest.mark.unit
+class TestOnCurve:
+    """Test ed25519 point validation of wallet addresses"""
+
+    def test_signer_wallet_is_on_curve(self):
+        assert is_on_curve(str(Keypair.from_seed(bytes(range(32))).pubkey()))
+
+    def test_program_derived_address_is_off_curve(self):
+        pda, _ = Pubkey.find_program_address([b"bonding-curve"], SYSTEM_PROGRAM)
+        assert not is_on_curve(str(pda))
+
+    @pytest.mark.parametrize("address", ["", "not-base58-0OIl", base58.b58encode(bytes(31)).decode()])
+    def test_invalid_addresses_are_rejected(self, address):
+        assert not is_on_curve(address)
+
+    def test_pure_python_check_matches_solders(self):
+        keys = [os.urandom(32) for _ in range(200)] + [bytes([0xFF] * 31 + [0x7F]), bytes(32)]
+        assert [point_decompresses(key) for key in keys] == [Pubkey(key).is_on_curve() for key in keys]
+
+    def test_results_are_cached(self):
+        address = str(Keypair.from_seed(bytes([9] * 32)).pubkey())
+        is_on_curve.cache_clear()
+
+        is_on_curve(address)
+        is_on_curve(address)
+
+        assert is_on_curve.cache_info().hits == 1
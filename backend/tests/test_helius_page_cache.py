@@ -0,0 +1,115 @@
+"""
+Tests for the Helius transaction page cache
+
+Tests immutability rules, LRU eviction and zero-credit re-analysis
+"""
+
+import time
+from unittest.mock import patch
+
+import pytest
+
+from helius_api import HeliusAPI
+from helius_page_cache import IMMUTABLE_AFTER_SECONDS, TransactionPageCache, is_page_immutable
+
+MINT = "4k3Dyjzvzp8eMZWUXbBCjEvwSkkk59S5iCNLY3QrkX6R"
+
+
+def make_page(count: int, block_time: int, token: str = None) -> dict:
+    return {
+        "data": [{"signature": f"sig{block_time}_{i}", "blockTime": block_time + i} for i in range(count)],
+        "paginationToken": token,
+    }
+
+
+@pytest.fixture
+def page_cache(tmp_path):
+    return TransactionPageCache(db_path=str(tmp_path / "cache.db"))
+
+
+@pytest.mark.unit
+class TestPageCache:
+    """Test page storage rules"""
+
+    def test_old_full_pages_are_immutable(self):
+        old = int(time.time()) - IMMUTABLE_AFTER_SECONDS - 100
+        assert is_page_immutable(make_page(3, old, token="next"), limit=3)
+
+    def test_tail_pages_are_not_immutable(self, page_cache):
+        # New transactions still land on the last page of a quiet token's history
+        old = int(time.time()) - IMMUTABLE_AFTER_SECONDS - 100
+        assert not is_page_immutable(make_page(2, old, token="next"), limit=3)
+        assert not is_page_immutable(make_page(3, old), limit=3)
+        assert not page_cache.put(MINT, {"limit": 100}, make_page(20, old))
+
+    def test_recent_or_empty_pages_are_not_cached(self, page_cache):
+        recent = make_page(3, int(time.time()))
+        assert not page_cache.put(MINT, {"limit": 3}, recent)
+        assert not page_cache.put(MINT, {"limit": 3}, {"data": []})
+        assert page_cache.get(MINT, {"limit": 3}) is None
+
+    def test_roundtrip_keyed_by_options(self, page_cache):
+        page = make_page(3, 1_600_000_000, token="next")
+        options = {"limit": 3, "sortOrder": "asc", "filters": {"blockTime": {"gte": 1}}}
+        assert page_cache.put(MINT, options, page)
+
+        # Key order does not matter, but every option does
+        assert page_cache.get(MINT, dict(reversed(list(options.items())))) == page
+        assert page_cache.get(MINT, {**options, "paginationToken": "next"}) is None
+        assert page_cache.get(MINT, {**options, "sortOrder": "desc"}) is None
+
+    def test_lru_eviction(self, tmp_path):
+        cache = TransactionPageCache(db_path=str(tmp_path / "cache.db"), max_bytes=1)
+        cache.put(MINT, {"limit": 50, "page": 1}, make_page(50, 1_600_000_000, token="p2"))
+        cache.put(MINT, {"limit": 50, "page": 2}, make_page(50, 1_600_000_000, token="p3"))
+        assert cache.get_stats()["pages"] == 0
+
+    def test_disabled_cache(self, tmp_path):
+        cache = TransactionPageCache(db_path=str(tmp_path / "cache.db"), max_bytes=0)
+        assert not cache.put(MINT, {"limit": 3}, make_page(3, 1_600_000_000, token="next"))
+
+
+@pytest.mark.unit
+class TestCachedReanalysis:
+    """Test that re-fetching cached history costs no credits"""
+
+    def test_full_pages_are_free_on_second_fetch(self, page_cache):
+        pages = {
+            None: make_page(100, 1_600_000_000, token="p2"),
+            "p2": make_page(100, 1_600_001_000, token="p3"),
+            "p3": make_page(20, 1_600_002_000),
+        }
+
+        def fake_rpc(method, params):
+            return pages[params[1].get("paginationToken")]
+
+        helius = HeliusAPI("test-key", page_cache=page_cache)
+        with patch.object(HeliusAPI, "_rpc_call", side_effect=fake_rpc) as mock_rpc:
+            first, first_credits = helius._get_earliest_transactions_new(MINT, limit=500, max_credits=1000)
+            second, second_credits = helius._get_earliest_transactions_new(MINT, limit=500, max_credits=1000)
+
+        # Only the partial tail page is fetched again
+        assert mock_rpc.call_count == 4
+        assert first_credits == 300
+        assert second_credits == 100
+        assert second == first
+        assert len(second) == 220
+
+    def test_history_growing_after_first_fetch(self, page_cache):
+        pages = {None: make_page(100, 1_600_000_000, token="p2"), "p2": make_page(20, 1_600_001_000)}
+
+        def fake_rpc(method, params):
+            return pages[params[1].get("paginationToken")]
+
+        helius = HeliusAPI("test-key", page_cache=page_cache)
+        with patch.object(HeliusAPI, "_rpc_call", side_effect=fake_rpc):
+            first, _ = helius._get_earliest_transactions_new(MINT, limit=500, max_credits=1000)
+
+            # 40 more transactions land on the (formerly partial) second page and beyond
+            pages["p2"] = make_page(100, 1_600_001_000, token="p3")
+            pages["p3"] = make_page(40, 1_600_002_000)
+            second, second_credits = helius._get_earliest_transactions_new(MINT, limit=500, max_credits=1000)
+
+        assert len(first) == 120
+        assert len(second) == 240
+        assert second_credits == 200
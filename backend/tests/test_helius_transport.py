@@ -0,0 +1,524 @@
+"""
+Tests for the shared Helius transport
+
+Tests connection pool sharing and sync/async call paths
+"""
+
+import asyncio
+import json
+import threading
+import time
+
+import httpx
+import pytest
+
+import helius_transport
+from helius_api import HeliusAPI, WebhookManager
+from helius_transport import HeliusTransport
+
+
+def _rpc_handler(request: httpx.Request) -> httpx.Response:
+    payload = json.loads(request.content)
+    return httpx.Response(200, json={"jsonrpc": "2.0", "id": payload["id"], "result": {"value": 2_000_000_000}})
+
+
+@pytest.fixture(autouse=True)
+def isolated_rate_limits(monkeypatch):
+    """Fresh, unthrottled limiters with near-zero backoff for each test"""
+    monkeypatch.setattr(helius_transport, "_rate_limiters", {})
+    monkeypatch.setattr(
+        helius_transport, "_rate_limit_config", {"requests_per_second": 0, "credits_per_minute": 0, "max_retries": 3}
+    )
+    monkeypatch.setattr(helius_transport, "BASE_BACKOFF_SECONDS", 0.001)
+
+
+@pytest.fixture
+def transport():
+    """Transport backed by an in-process mock handler"""
+    transport = HeliusTransport(http2=False, mock_transport=httpx.MockTransport(_rpc_handler))
+    yield transport
+    transport.close()
+
+
+@pytest.mark.unit
+class TestHeliusTransport:
+    """Test shared transport behaviour"""
+
+    def test_get_transport_is_process_wide(self, monkeypatch):
+        """Every client gets the same transport instance"""
+        monkeypatch.setattr(helius_transport, "_transport", None)
+        api = HeliusAPI("test-key")
+        webhooks = WebhookManager("test-key")
+        assert api.transport is webhooks.transport
+        assert api.transport is helius_transport.get_transport()
+        helius_transport.close_transport()
+
+    def test_sync_call_from_worker_threads(self, transport):
+        """Blocking callers on several threads share one loop"""
+        api = HeliusAPI("test-key", transport=transport)
+        results = []
+
+        def worker():
+            results.append(api._rpc_call("getBalance", ["wallet"]))
+
+        threads = [threading.Thread(target=worker) for _ in range(5)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert results == [{"value": 2_000_000_000}] * 5
+
+    def test_async_call_from_foreign_loop(self, transport):
+        """Async callers on another event loop hop onto the transport loop"""
+        api = HeliusAPI("test-key", transport=transport)
+
+        async def main():
+            return await asyncio.gather(*[api._rpc_call_async("getBalance", ["w"]) for _ in range(10)])
+
+        results = asyncio.run(main())
+        assert len(results) == 10
+        assert all(r["value"] == 2_000_000_000 for r in results)
+
+    def test_rpc_error_is_raised(self):
+        """HTTP errors surface as RPC call failures"""
+        transport = HeliusTransport(http2=False, mock_transport=httpx.MockTransport(lambda r: httpx.Response(500)))
+        try:
+            api = HeliusAPI("test-key", transport=transport)
+            with pytest.raises(Exception, match="RPC call failed"):
+                api._rpc_call("getBalance", ["wallet"])
+        finally:
+            transport.close()
+
+
+@pytest.mark.unit
+class TestRateLimiter:
+    """Test the shared per-key rate limiter and retry policy"""
+
+    def test_limiter_is_shared_per_key(self):
+        """Clients using the same key share one limiter"""
+        assert helius_transport.get_rate_limiter("key-a") is helius_transport.get_rate_limiter("key-a")
+        assert helius_transport.get_rate_limiter("key-a") is not helius_transport.get_rate_limiter("key-b")
+
+    def test_token_bucket_reserves_in_order(self):
+        """Reservations beyond capacity wait proportionally to the deficit"""
+        bucket = helius_transport.TokenBucket(rate=10.0, capacity=2.0)
+        now = bucket.updated
+        assert bucket.reserve(1, now) == 0.0
+        assert bucket.reserve(1, now) == 0.0
+        assert bucket.reserve(1, now) == pytest.approx(0.1)
+        assert bucket.reserve(1, now) == pytest.approx(0.2)
+
+    def test_credit_budget_delays_requests(self):
+        """Queue wait time is recorded when the credit budget is exhausted"""
+        limiter = helius_transport.HeliusRateLimiter(requests_per_second=0, credits_per_minute=600)
+
+        async def main():
+            await limiter.acquire(credits=600)
+            return await limiter.acquire(credits=5)
+
+        waited = asyncio.run(main())
+        assert waited == pytest.approx(0.5, abs=0.05)
+        stats = limiter.get_stats()
+        assert stats["delayed_requests"] == 1
+        # Requests and credits are only counted once a request is actually sent
+        assert stats["credits"] == 0
+        limiter.record_sent(5)
+        assert limiter.get_stats()["credits"] == 5
+
+    def test_cancelled_wait_returns_its_budget(self):
+        limiter = helius_transport.HeliusRateLimiter(requests_per_second=0, credits_per_minute=600)
+
+        async def main():
+            await limiter.acquire(credits=600)
+            waiter = asyncio.create_task(limiter.acquire(credits=300))
+            await asyncio.sleep(0.01)
+            waiter.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await waiter
+
+        asyncio.run(main())
+        # Without the refund the next credit would queue behind the cancelled 300
+        assert limiter.estimated_delay(1, time.monotonic()) < 1.0
+        assert limiter.get_stats()["requests"] == 0
+
+    def test_reconfigure_runs_on_the_transport_loop(self, transport, monkeypatch):
+        monkeypatch.setattr(helius_transport, "_transport", transport)
+        transport.run(asyncio.sleep(0))
+        limiter = helius_transport.get_rate_limiter("reconfigure-test-key")
+        threads = []
+        original = limiter.configure
+        monkeypatch.setattr(
+            limiter, "configure", lambda **kw: (threads.append(threading.current_thread().name), original(**kw))
+        )
+
+        helius_transport.configure_rate_limits(max_retries=7)
+        transport.run(asyncio.sleep(0))
+
+        assert threads == ["helius-io"]
+        assert limiter.max_retries == 7
+
+    def test_parse_retry_after(self):
+        assert helius_transport.parse_retry_after("2") == 2.0
+        assert helius_transport.parse_retry_after(None) is None
+        assert helius_transport.parse_retry_after("garbage") is None
+
+    def test_retries_after_429(self):
+        """A 429 with Retry-After is retried and counted as throttled"""
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            if len(calls) == 1:
+                return httpx.Response(429, headers={"Retry-After": "0"})
+            return _rpc_handler(request)
+
+        transport = HeliusTransport(http2=False, mock_transport=httpx.MockTransport(handler))
+        try:
+            api = HeliusAPI("retry-test-key", transport=transport)
+            assert api._rpc_call("getBalance", ["wallet"]) == {"value": 2_000_000_000}
+        finally:
+            transport.close()
+
+        assert len(calls) == 2
+        stats = helius_transport.get_rate_limiter("retry-test-key").get_stats()
+        assert stats["throttled"] == 1
+        assert stats["retries"] == 1
+
+    def test_gives_up_after_max_retries(self):
+        """Persistent 5xx responses stop after maxRetries"""
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(503)
+
+        limiter = helius_transport.get_rate_limiter("giveup-test-key")
+        limiter.max_retries = 2
+
+        transport = HeliusTransport(http2=False, mock_transport=httpx.MockTransport(handler))
+        try:
+            api = HeliusAPI("giveup-test-key", transport=transport)
+            with pytest.raises(Exception, match="RPC call failed"):
+                api._rpc_call("getBalance", ["wallet"])
+        finally:
+            transport.close()
+
+        assert len(calls) == 3
+
+    def test_webhook_create_is_not_retried(self):
+        """A 5xx on a non-idempotent POST may still have created the webhook, so it is sent once"""
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(503)
+
+        transport = HeliusTransport(http2=False, mock_transport=httpx.MockTransport(handler))
+        try:
+            manager = WebhookManager("webhook-test-key", transport=transport)
+            with pytest.raises(Exception, match="Failed to create webhook"):
+                manager.create_webhook("https://example.com/hook", ["wallet"])
+
+            # Without an explicit choice only idempotent requests are retried
+            url = f"{helius_transport.HELIUS_API_URL}/token-metadata"
+            assert transport.request_sync("POST", url, api_key="webhook-test-key").status_code == 503
+            assert transport.request_sync("GET", url, api_key="webhook-test-key").status_code == 503
+        finally:
+            transport.close()
+
+        assert len(calls) == 1 + 1 + 4
+
+    def test_webhook_reads_and_deletes_are_retried(self):
+        """Only create and update go out once; GET and DELETE recover from a transient 503"""
+        calls = []
+
+        def handler(request):
+            calls.append(request.method)
+            if request.method in ("POST", "PUT") or calls.count(request.method) == 1:
+                return httpx.Response(503)
+            return httpx.Response(200, json=[])
+
+        transport = HeliusTransport(http2=False, mock_transport=httpx.MockTransport(handler))
+        try:
+            manager = WebhookManager("webhook-test-key", transport=transport)
+            with pytest.raises(Exception, match="Failed to update webhook"):
+                manager.update_webhook("hook-id", wallet_addresses=["wallet"])
+            assert manager.list_webhooks() == []
+            assert manager.delete_webhook("hook-id")
+        finally:
+            transport.close()
+
+        assert calls == ["PUT", "GET", "GET", "DELETE", "DELETE"]
+
+
+@pytest.mark.unit
+class TestKeyPool:
+    """Test dispatch across several API keys"""
+
+    def test_select_round_robins_idle_keys(self):
+        """Equally loaded keys take turns"""
+        pool = helius_transport.HeliusKeyPool(["key-a", "key-b", "key-a", ""])
+        assert pool.api_keys == ["key-a", "key-b"]
+        assert [pool.select() for _ in range(4)] == ["key-a", "key-b", "key-a", "key-b"]
+
+    def test_select_skips_cooling_keys(self):
+        """A key throttled without Retry-After is avoided for the cooldown period"""
+        pool = helius_transport.HeliusKeyPool(["key-a", "key-b"])
+        helius_transport.get_rate_limiter("key-a").record_throttle(None)
+        assert [pool.select() for _ in range(3)] == ["key-b", "key-b", "key-b"]
+
+        health = pool.get_health()
+        assert [entry["status"] for entry in health] == ["cooldown", "ok"]
+        assert health[0]["cooldown_seconds"] > 0
+        assert health[0]["throttled"] == 1
+
+    def test_keys_sharing_a_prefix_stay_apart(self):
+        """Masked labels are for display; stats of keys with the same first characters do not merge"""
+        pool = helius_transport.HeliusKeyPool(["abcd-key-one", "abcd-key-two"])
+        helius_transport.get_rate_limiter("abcd-key-one").record_throttle(None)
+        helius_transport.get_rate_limiter("abcd-key-two")
+
+        stats = helius_transport.get_rate_limiter_stats()
+        assert len(stats) == 2
+        assert sorted(entry["throttled"] for entry in stats.values()) == [0, 1]
+        labels = [entry["key"] for entry in pool.get_health()]
+        assert labels[0] != labels[1]
+        assert all(label.startswith("abcd****") and "key" not in label for label in labels)
+
+    def test_select_prefers_least_loaded_key(self):
+        """Keys with requests in flight or an exhausted budget are picked last"""
+        pool = helius_transport.HeliusKeyPool(["key-a", "key-b"])
+        helius_transport.get_rate_limiter("key-a").in_flight = 3
+        assert pool.select() == "key-b"
+
+        helius_transport.get_rate_limiter("key-b").credit_bucket = helius_transport.TokenBucket(rate=1.0, capacity=10)
+        helius_transport.get_rate_limiter("key-b").credit_bucket.tokens = 0
+        assert pool.select(credits=10) == "key-a"
+
+    def test_pool_spreads_requests_and_retries_on_another_key(self):
+        """Each attempt carries the selected key; a 429 moves the retry to the other key"""
+        keys = []
+
+        def handler(request):
+            keys.append(request.url.params["api-key"])
+            if len(keys) == 1:
+                return httpx.Response(429, headers={"Retry-After": "30"})
+            return _rpc_handler(request)
+
+        pool = helius_transport.HeliusKeyPool(["pool-key-a", "pool-key-b"])
+        transport = HeliusTransport(http2=False, mock_transport=httpx.MockTransport(handler))
+        try:
+            api = HeliusAPI(pool, transport=transport)
+            assert api.api_key == "pool-key-a"
+            assert "api-key" not in api.rpc_url
+            for _ in range(3):
+                assert api._rpc_call("getBalance", ["wallet"]) == {"value": 2_000_000_000}
+        finally:
+            transport.close()
+
+        # The 30s Retry-After on key a is not waited out: the retry and the next calls use key b
+        assert keys == ["pool-key-a", "pool-key-b", "pool-key-b", "pool-key-b"]
+        assert helius_transport.get_rate_limiter("pool-key-a").get_stats()["throttled"] == 1
+        assert helius_transport.get_rate_limiter("pool-key-b").get_stats()["in_flight"] == 0
+
+
+@pytest.mark.unit
+class TestAdaptiveConcurrency:
+    """Test the AIMD concurrency window"""
+
+    def test_window_caps_requests_in_flight(self):
+        """Requests beyond the window wait for a released slot"""
+        limiter = helius_transport.AdaptiveConcurrencyLimiter(initial=2)
+
+        async def main():
+            first = await limiter.acquire()
+            await limiter.acquire()
+            third = asyncio.ensure_future(limiter.acquire())
+            await asyncio.sleep(0)
+            assert not third.done()
+            assert limiter.get_stats()["concurrency_waiting"] == 1
+
+            limiter.release(first, congested=False)
+            await asyncio.wait_for(third, timeout=1)
+            return limiter.in_use
+
+        assert asyncio.run(main()) == 2
+
+    def test_grows_additively_while_saturated(self):
+        """Healthy responses from a busy window grow it by about one per window"""
+        limiter = helius_transport.AdaptiveConcurrencyLimiter(initial=4)
+
+        async def main():
+            for _ in range(2):
+                started = [await limiter.acquire() for _ in range(limiter.window)]
+                for value in started:
+                    limiter.release(value, congested=False)
+
+        asyncio.run(main())
+        assert limiter.window == 5
+        assert limiter.increases == 1
+
+    def test_does_not_grow_when_idle(self):
+        """Sequential requests never fill the window, so it stays put"""
+        limiter = helius_transport.AdaptiveConcurrencyLimiter(initial=4)
+
+        async def main():
+            for _ in range(20):
+                limiter.release(await limiter.acquire(), congested=False)
+
+        asyncio.run(main())
+        assert limiter.window == 4
+
+    def test_halves_once_per_round_trip(self):
+        """A burst of failures from the same window cuts it only once"""
+        limiter = helius_transport.AdaptiveConcurrencyLimiter(initial=8)
+
+        async def main():
+            started = [await limiter.acquire() for _ in range(8)]
+            for value in started:
+                limiter.release(value, congested=True)
+            limiter.release(await limiter.acquire(), congested=True)
+
+        asyncio.run(main())
+        assert limiter.window == 2
+        assert limiter.decreases == 2
+
+    def test_window_cuts_are_only_logged_in_debug_mode(self, monkeypatch, capsys):
+        limiter = helius_transport.AdaptiveConcurrencyLimiter(initial=8)
+
+        async def cut():
+            limiter.release(await limiter.acquire(), congested=True)
+
+        monkeypatch.setattr(helius_transport, "is_debug_enabled", lambda: False)
+        asyncio.run(cut())
+        assert capsys.readouterr().out == ""
+
+        monkeypatch.setattr(helius_transport, "is_debug_enabled", lambda: True)
+        asyncio.run(cut())
+        assert "Concurrency window cut 4 -> 2" in capsys.readouterr().out
+
+    def test_429_shrinks_window_through_transport(self):
+        """Throttled responses feed the key's window"""
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            if len(calls) == 1:
+                return httpx.Response(429, headers={"Retry-After": "0"})
+            return _rpc_handler(request)
+
+        transport = HeliusTransport(http2=False, mock_transport=httpx.MockTransport(handler))
+        try:
+            api = HeliusAPI("aimd-test-key", transport=transport)
+            assert api._rpc_call("getBalance", ["wallet"]) == {"value": 2_000_000_000}
+        finally:
+            transport.close()
+
+        stats = helius_transport.get_rate_limiter("aimd-test-key").get_stats()
+        assert stats["concurrency_limit"] == helius_transport.INITIAL_CONCURRENCY // 2
+        assert stats["concurrency_decreases"] == 1
+        assert stats["concurrency_in_use"] == 0
+
+
+@pytest.mark.unit
+class TestCircuitBreaker:
+    """Test per-endpoint circuit breakers"""
+
+    def test_endpoint_families(self):
+        assert helius_transport.endpoint_for_url(helius_transport.HELIUS_RPC_URL + "?api-key=k") == "rpc"
+        assert helius_transport.endpoint_for_url(f"{helius_transport.HELIUS_API_URL}/token-metadata") == "enhanced"
+        assert helius_transport.endpoint_for_url(f"{helius_transport.HELIUS_API_URL}/webhooks/abc") == "webhooks"
+        assert helius_transport.endpoint_for_url("https://example.com/") is None
+
+    def test_opens_after_consecutive_failures(self):
+        """Failures open the circuit; a success in between resets the count"""
+        breaker = helius_transport.CircuitBreaker("rpc", failure_threshold=3, open_seconds=60)
+        for failed in (True, True, False, True, True):
+            breaker.before_request()
+            breaker.record(failed)
+        assert breaker.state == "closed"
+
+        breaker.before_request()
+        breaker.record(True)
+        assert breaker.state == "open"
+        with pytest.raises(helius_transport.CircuitOpenError, match="rpc circuit open"):
+            breaker.before_request()
+        assert breaker.get_stats()["rejected"] == 1
+
+    def test_half_open_probe(self):
+        """After the cool-off one probe is admitted; its outcome closes or reopens the circuit"""
+        breaker = helius_transport.CircuitBreaker("rpc", failure_threshold=1, open_seconds=0)
+        breaker.record(True)
+        assert breaker.state == "half_open"
+
+        probe = breaker.before_request()
+        assert probe
+        assert breaker.is_open()
+        with pytest.raises(helius_transport.CircuitOpenError):
+            breaker.before_request()
+        breaker.record(True, probe)
+        assert breaker.trips == 2
+
+        probe = breaker.before_request()
+        breaker.record(False, probe)
+        assert breaker.state == "closed"
+        assert not breaker.before_request()
+
+    def test_transitions_are_only_logged_in_debug_mode(self, monkeypatch, capsys):
+        monkeypatch.setattr(helius_transport, "is_debug_enabled", lambda: False)
+        breaker = helius_transport.CircuitBreaker("rpc", failure_threshold=1, open_seconds=0)
+        breaker.record(True)
+        breaker.record(False, breaker.before_request())
+        assert breaker.trips == 1
+        assert capsys.readouterr().out == ""
+
+    def test_only_the_probe_decides_half_open(self):
+        """Stragglers admitted before the circuit opened cannot close or re-open it"""
+        breaker = helius_transport.CircuitBreaker("rpc", failure_threshold=1, open_seconds=0)
+        straggler = breaker.before_request()
+        breaker.record(True)
+        probe = breaker.before_request()
+
+        breaker.record(False, straggler)
+        assert breaker.state == "half_open"
+        breaker.record(True, straggler)
+        assert breaker.trips == 1
+        assert breaker.is_open()
+
+        breaker.record(False, probe)
+        assert breaker.state == "closed"
+
+    def test_open_circuit_fails_fast_without_sending(self):
+        """Once RPC keeps failing, calls stop reaching Helius"""
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(503)
+
+        transport = HeliusTransport(http2=False, mock_transport=httpx.MockTransport(handler))
+        try:
+            api = HeliusAPI("circuit-test-key", transport=transport)
+            for _ in range(3):
+                with pytest.raises(Exception, match="RPC call failed"):
+                    api._rpc_call("getBalance", ["wallet"])
+        finally:
+            transport.close()
+
+        # 5 failed attempts open the circuit; every later attempt is rejected locally
+        assert len(calls) == helius_transport.CIRCUIT_FAILURE_THRESHOLD
+        stats = helius_transport.get_circuit_breaker_stats()
+        assert stats["rpc"]["state"] == "open"
+        assert stats["enhanced"]["state"] == "closed"
+
+
+@pytest.mark.unit
+def test_load_api_keys_merges_environment(monkeypatch):
+    """HELIUS_API_KEY stays primary, HELIUS_API_KEYS adds pool members"""
+    from app import settings
+
+    monkeypatch.setenv("HELIUS_API_KEY", "primary")
+    monkeypatch.setenv("HELIUS_API_KEYS", "second, primary,third,")
+    assert settings.load_api_keys() == ["primary", "second", "third"]
+    assert settings.load_api_key() == "primary"